@@ -0,0 +1,104 @@
+"""
+Watching many incidents: sync HttpJudicorClient vs AsyncHttpJudicorClient.
+
+Starts `judicor-plane` in prod mode against a throw-away HOME, creates
+``--incidents`` incidents and then fetches the status of every one of
+them ``--rounds`` times: sequentially with the sync client, and with
+``asyncio.gather`` over the async client's shared keep-alive pool.
+
+    python benchmarks/async_client.py --incidents 50 --rounds 5 \
+        --workers 4 --pool-size 20
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+import requests
+
+from control_plane_workers import (
+    API_KEY,
+    _free_port,
+    _start_server,
+    _wait_ready,
+)
+
+
+def _sync_round(client, ids) -> float:
+    start = time.perf_counter()
+    for incident_id in ids:
+        client.current_incident = incident_id
+        assert client.status_incident().success
+    return time.perf_counter() - start
+
+
+async def _async_rounds(client, ids, rounds) -> list:
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        results = await asyncio.gather(
+            *(client.status_incident(incident_id=i) for i in ids)
+        )
+        assert all(result.success for result in results)
+        samples.append(time.perf_counter() - start)
+    await client.aclose()
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--incidents", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--pool-size", type=int, default=20)
+    args = parser.parse_args()
+
+    os.environ["JUDICOR_HTTP_POOL_SIZE"] = str(args.pool_size)
+    from judicor.client.implementations.async_http import (
+        AsyncHttpJudicorClient,
+    )
+    from judicor.client.implementations.http import HttpJudicorClient
+
+    port = _free_port()
+    url = f"http://127.0.0.1:{port}"
+    with tempfile.TemporaryDirectory() as home:
+        proc = _start_server(args.workers, port, home)
+        try:
+            _wait_ready(url)
+            ids = [
+                requests.post(
+                    f"{url}/incidents",
+                    json={"title": f"watch {i}"},
+                    headers={"X-API-Key": API_KEY},
+                ).json()["id"]
+                for i in range(args.incidents)
+            ]
+
+            sync_client = HttpJudicorClient(base_url=url, api_key=API_KEY)
+            sync = [_sync_round(sync_client, ids) for _ in range(args.rounds)]
+            async_client = AsyncHttpJudicorClient(
+                base_url=url, api_key=API_KEY
+            )
+            concurrent = asyncio.run(
+                _async_rounds(async_client, ids, args.rounds)
+            )
+        finally:
+            proc.terminate()
+            proc.wait(timeout=30)
+
+    sync_ms = statistics.median(sync) * 1000
+    async_ms = statistics.median(concurrent) * 1000
+    print(
+        f"{args.incidents} status calls per round, {args.workers} workers, "
+        f"pool {args.pool_size} (median of {args.rounds})"
+    )
+    print(f"sync, sequential   : {sync_ms:8.1f} ms")
+    print(f"async, gather      : {async_ms:8.1f} ms")
+    print(f"speedup            : {sync_ms / async_ms:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Triage throughput: one analyzer call per incident vs batched calls.
+
+Against a throw-away HOME, creates an alert storm of incidents and runs
+`ReasoningPipeline.triage` over them (context building, store writes
+and all) with a simulated provider whose requests cost a fixed round
+trip plus a per-item generation time, first with
+`JUDICOR_TRIAGE_BATCH_SIZE=1` (one request per incident, as `trigger`
+used to), then with each requested batch size.
+
+    python benchmarks/batch_triage.py --incidents 50 --rtt 0.4 \
+        --per-item 0.02 --batch-sizes 5 10 25
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--incidents", type=int, default=50)
+    parser.add_argument(
+        "--rtt", type=float, default=0.4, help="Seconds per request."
+    )
+    parser.add_argument(
+        "--per-item", type=float, default=0.02, help="Seconds per item."
+    )
+    parser.add_argument(
+        "--batch-sizes", type=int, nargs="+", default=[5, 10, 25]
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as home:
+        # Store paths are resolved at import time
+        os.environ["HOME"] = home
+        os.environ["JUDICOR_AI_CACHE"] = "0"
+        _run(args)
+
+
+def _run(args) -> None:
+    from judicor.ai.interface import AIReasoner
+    from judicor.ai.pipeline import ReasoningPipeline, build_reasoners
+    from judicor.domain.models import IncidentState
+    from judicor.domain.results import AskResult
+    from judicor.session import incident_store
+
+    class SimulatedProvider(AIReasoner):
+        def __init__(self) -> None:
+            self.requests = 0
+
+        def ask(self, incident, question):
+            return self.ask_batch([(incident, question)])[0]
+
+        def ask_batch(self, items):
+            self.requests += 1
+            time.sleep(args.rtt + args.per_item * len(items))
+            return [
+                AskResult(success=True, answer=f"analysis {incident.id}")
+                for incident, _ in items
+            ]
+
+    print(f"{'batch':>6} {'requests':>9} {'seconds':>8} {'incidents/s':>12}")
+    baseline = None
+    for size in [1] + args.batch_sizes:
+        os.environ["JUDICOR_TRIAGE_BATCH_SIZE"] = str(size)
+        incidents = [
+            incident_store.create_incident(
+                title=f"Alert storm {n}: checkout-api 5xx",
+                initial_state=IncidentState.ACTIVE,
+            )
+            for n in range(args.incidents)
+        ]
+        provider = SimulatedProvider()
+        pipeline = ReasoningPipeline(
+            build_reasoners(provider), summary_mode="sync"
+        )
+
+        start = time.perf_counter()
+        pipeline.triage(incidents)
+        elapsed = time.perf_counter() - start
+
+        rate = len(incidents) / elapsed
+        baseline = baseline or rate
+        print(
+            f"{size:>6} {provider.requests:>9} {elapsed:>8.2f} "
+            f"{rate:>12.1f}  ({rate / baseline:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Throughput of the control plane against uvicorn worker count.
+
+Starts `judicor-plane` in prod mode once per worker count against a
+throw-away HOME, drives it with a thread pool of keep-alive clients and
+prints requests/second for a read-heavy and a write-heavy route.
+
+    python benchmarks/control_plane_workers.py --workers 1 2 4 \
+        --requests 2000 --concurrency 32
+"""
+
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+API_KEY = "bench-key"
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_ready(url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if requests.get(f"{url}/health", timeout=1).ok:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError("control plane did not become ready")
+
+
+def _start_server(workers: int, port: int, home: str) -> subprocess.Popen:
+    env = dict(
+        os.environ,
+        HOME=home,
+        JUDICOR_API_KEY=API_KEY,
+        # Measure raw throughput, not the per-key rate limit
+        JUDICOR_API_KEYS=f"bench={API_KEY}:0",
+        JUDICOR_PLANE_MODE="prod",
+        JUDICOR_PLANE_HOST="127.0.0.1",
+        JUDICOR_PLANE_PORT=str(port),
+        JUDICOR_PLANE_WORKERS=str(workers),
+    )
+    return subprocess.Popen(
+        [sys.executable, "-m", "judicor.control_plane.run"],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+def _drive(url, method, path, total, concurrency, payload=None) -> float:
+    local = threading.local()
+    headers = {"X-API-Key": API_KEY}
+
+    def one(_):
+        session = getattr(local, "session", None)
+        if session is None:
+            session = local.session = requests.Session()
+        if method == "GET":
+            resp = session.get(f"{url}{path}", headers=headers)
+        else:
+            resp = session.post(f"{url}{path}", json=payload, headers=headers)
+        resp.raise_for_status()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, range(total)))
+    return total / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+
+    print(
+        f"{'workers':>8} {'GET detail req/s':>18} "
+        f"{'POST timeline req/s':>20}"
+    )
+    for workers in args.workers:
+        port = _free_port()
+        url = f"http://127.0.0.1:{port}"
+        with tempfile.TemporaryDirectory() as home:
+            proc = _start_server(workers, port, home)
+            try:
+                _wait_ready(url)
+                created = requests.post(
+                    f"{url}/incidents",
+                    json={"title": "bench"},
+                    headers={"X-API-Key": API_KEY},
+                ).json()
+                path = f"/incidents/{created['id']}"
+                reads = _drive(
+                    url, "GET", path, args.requests, args.concurrency
+                )
+                writes = _drive(
+                    url,
+                    "POST",
+                    f"{path}/timeline",
+                    args.requests // 4,
+                    args.concurrency,
+                    payload={"event_type": "note", "message": "bench"},
+                )
+                print(f"{workers:>8} {reads:>18.0f} {writes:>20.0f}")
+            finally:
+                proc.terminate()
+                proc.wait(timeout=30)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Command latency with and without `judicor daemon`.
+
+Against a throw-away HOME, reports the median of:
+
+- the daemon round trip for a command over the Unix socket (what a
+  forwarded CLI command or `judicor shell` pays per command),
+- a full `judicor <command>` process forwarded to the daemon,
+- a full `judicor <command>` process executing in-process.
+
+    python benchmarks/daemon_latency.py --rounds 50 --command status
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+CLI = [sys.executable, "-c", "from judicor.cli.app import main; main()"]
+
+
+def _median_ms(samples) -> str:
+    return f"{statistics.median(samples) * 1000:8.2f} ms"
+
+
+def _time_process(args, env, rounds) -> list:
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        subprocess.run(CLI + args, env=env, capture_output=True, check=True)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--command", default="status")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as home:
+        env = dict(
+            os.environ,
+            HOME=home,
+            JUDICOR_DAEMON_SOCKET=os.path.join(home, "d.sock"),
+        )
+        subprocess.run(
+            CLI + ["attach", "1"], env=env, capture_output=True, check=True
+        )
+        local = _time_process(
+            [args.command], dict(env, JUDICOR_DAEMON="0"), args.rounds
+        )
+
+        server = subprocess.Popen(
+            CLI + ["daemon"], env=env, stdout=subprocess.PIPE
+        )
+        try:
+            server.stdout.readline()
+            os.environ["JUDICOR_DAEMON_SOCKET"] = env["JUDICOR_DAEMON_SOCKET"]
+            from judicor.daemon.client import connect
+
+            client = connect()
+            method = getattr(client, f"{args.command}_incident", None)
+            method = method or getattr(client, f"{args.command}_incidents")
+            method()
+            round_trips = []
+            for _ in range(args.rounds * 10):
+                start = time.perf_counter()
+                method()
+                round_trips.append(time.perf_counter() - start)
+            client.close()
+
+            forwarded = _time_process([args.command], env, args.rounds)
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+
+    print(f"command: {args.command}, rounds: {args.rounds} (medians)")
+    print(f"daemon round trip          : {_median_ms(round_trips)}")
+    print(f"CLI process, via daemon    : {_median_ms(forwarded)}")
+    print(f"CLI process, in-process    : {_median_ms(local)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Reasoner setup cost: one Gemini client per role vs one shared lazy client.
+
+Builds the per-role reasoner mapping the way the CLI does and reports the
+time to build it and the time until every role has a usable SDK client
+(the point where the first request can be sent). No request leaves the
+machine; a placeholder `GOOGLE_API_KEY` is used if none is set.
+
+    python benchmarks/reasoner_startup.py --rounds 20
+"""
+
+import argparse
+import os
+import statistics
+import time
+
+from google import genai
+
+from judicor.ai import providers
+from judicor.ai.implementations import gemini
+from judicor.ai.pipeline import build_reasoners
+from judicor.ai.roles import AgentRole
+
+
+def _eager() -> float:
+    # Previous behaviour: every role constructed its own genai.Client
+    start = time.perf_counter()
+    reasoners = {
+        role: gemini.GeminiAIReasoner(role=role, client=genai.Client())
+        for role in AgentRole
+    }
+    for reasoner in reasoners.values():
+        reasoner.client
+    return time.perf_counter() - start
+
+
+def _lazy() -> tuple:
+    providers.reset_shared_clients()
+    start = time.perf_counter()
+    reasoners = build_reasoners()
+    built = time.perf_counter() - start
+    for reasoner in reasoners.values():
+        reasoner.inner.inner.inner.client
+    return built, time.perf_counter() - start
+
+
+def _ms(samples) -> str:
+    return f"{statistics.median(samples) * 1000:8.2f} ms"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    os.environ.setdefault("GOOGLE_API_KEY", "benchmark-placeholder")
+    os.environ["JUDICOR_AI_PROVIDER"] = "gemini"
+    os.environ["JUDICOR_AI_CACHE"] = "1"
+
+    eager = [_eager() for _ in range(args.rounds)]
+    lazy = [_lazy() for _ in range(args.rounds)]
+
+    print(f"roles: {len(AgentRole)}, rounds: {args.rounds} (medians)")
+    print(f"eager, client per role, ready : {_ms(eager)}")
+    print(f"lazy, build reasoners         : {_ms([b for b, _ in lazy])}")
+    print(f"lazy, shared client, ready    : {_ms([r for _, r in lazy])}")
+
+
+if __name__ == "__main__":
+    main()
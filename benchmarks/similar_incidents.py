@@ -0,0 +1,88 @@
+"""
+Similar-incident query latency over a large synthetic corpus.
+
+Fills an in-memory `SimilarIndex` with synthetic resolved incidents
+drawn from a vocabulary of service, symptom and remediation terms plus
+a long tail of rare identifiers, then reports build time (including
+champion lists, as a process loading the log does) and the p50 / p95 /
+max latency of `query` for prompt-sized texts.
+
+    python benchmarks/similar_incidents.py --incidents 100000 --queries 500
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+from judicor.ai.similar import SimilarIndex
+
+SERVICES = (
+    "checkout-api", "payments-worker", "db-primary", "db-replica",
+    "redis-cache", "kafka-broker", "auth-service", "search-api",
+    "ingress-nginx", "billing-cron", "notifications", "cdn-edge",
+)
+SYMPTOMS = (
+    "latency", "timeouts", "5xx", "oom", "crashloop", "disk", "full",
+    "replication", "lag", "evictions", "saturation", "deadlock",
+    "certificate", "expired", "dns", "resolution", "throttling", "queue",
+    "backlog", "memory", "leak", "cpu", "spike", "connection", "refused",
+)
+REMEDIATIONS = (
+    "rollback", "restart", "scaled", "failover", "rotated", "purged",
+    "increased", "limits", "patched", "drained", "rebalanced", "reverted",
+)
+
+
+def _document(rng: random.Random, n: int):
+    service = rng.choice(SERVICES)
+    symptoms = rng.sample(SYMPTOMS, 3)
+    title = f"{service} {' '.join(symptoms[:2])}"
+    text = " ".join(
+        [service]
+        + symptoms
+        + rng.sample(REMEDIATIONS, 2)
+        + [f"build{rng.randrange(5000)}", f"host{rng.randrange(2000)}"]
+        + [rng.choice(SYMPTOMS) for _ in range(20)]
+    )
+    return n, title, text
+
+
+def _percentile(samples, q):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--incidents", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--k", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    index = SimilarIndex()
+    start = time.perf_counter()
+    for n in range(1, args.incidents + 1):
+        index.add(*_document(rng, n))
+    index.build_champions()
+    build = time.perf_counter() - start
+
+    latencies = []
+    for _ in range(args.queries):
+        _, title, text = _document(rng, 0)
+        query = f"{title}\nwhy is {text.split()[0]} failing?"
+        start = time.perf_counter()
+        index.query(query, k=args.k)
+        latencies.append(time.perf_counter() - start)
+
+    print(f"incidents      {args.incidents}")
+    print(f"build          {build:.1f}s")
+    print(f"query p50      {statistics.median(latencies) * 1000:.2f}ms")
+    print(f"query p95      {_percentile(latencies, 0.95) * 1000:.2f}ms")
+    print(f"query max      {max(latencies) * 1000:.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
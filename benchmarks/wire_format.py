@@ -0,0 +1,122 @@
+"""
+Wire format cost for incident detail payloads with a timeline.
+
+Builds detail bodies shaped like `GET /incidents/{id}?fields=...,timeline`
+for several timeline lengths and reports the encoded size plus the median
+encode and decode time for each available format: JSON, MessagePack
+(needs `msgpack`), each optionally gzip- or zstd-compressed (zstd needs
+`zstandard`). Formats whose package is missing are skipped.
+
+    python benchmarks/wire_format.py --events 10 100 1000 --rounds 50
+"""
+
+import argparse
+import gzip
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+
+from judicor.control_plane import compression
+from judicor.domain import encoding
+
+EVENT_TYPES = ("ask", "state_change", "summary", "note", "alert")
+MESSAGES = (
+    "Asked AI: why did p99 latency on checkout-api jump after the deploy?",
+    "Incident moved to investigating",
+    "Incident summary updated",
+    "Rolled back payments-worker to 2024.06.1; error rate recovering",
+    "Alert fired again: KubePodCrashLooping (namespace=checkout)",
+)
+
+
+def _payload(events: int) -> dict:
+    start = datetime(2024, 6, 1, tzinfo=timezone.utc)
+    return {
+        "id": 42,
+        "title": "Checkout latency regression",
+        "state": "investigating",
+        "created_at": start.isoformat(),
+        "updated_at": (start + timedelta(hours=3)).isoformat(),
+        "summary": "Latency regression traced to the payments-worker "
+        "deploy; rollback in progress. " * 4,
+        "timeline": [
+            {
+                "incident_id": 42,
+                "event_type": EVENT_TYPES[n % len(EVENT_TYPES)],
+                "message": MESSAGES[n % len(MESSAGES)],
+                "timestamp": (start + timedelta(seconds=17 * n)).isoformat(),
+            }
+            for n in range(events)
+        ],
+    }
+
+
+def _formats():
+    media_types = [("json", encoding.JSON_MEDIA_TYPE)]
+    if encoding.msgpack_available():
+        media_types.append(("msgpack", encoding.MSGPACK_MEDIA_TYPE))
+    codings = [None, "gzip"]
+    if compression.zstd_available():
+        codings.append("zstd")
+    for name, media_type in media_types:
+        for coding in codings:
+            label = name if coding is None else f"{name}+{coding}"
+            yield label, media_type, coding
+
+
+def _decompress(body: bytes, coding) -> bytes:
+    if coding == "gzip":
+        return gzip.decompress(body)
+    if coding == "zstd":
+        import zstandard
+
+        return zstandard.ZstdDecompressor().decompress(body)
+    return body
+
+
+def _measure(data: dict, media_type: str, coding, rounds: int) -> tuple:
+    encode_times, decode_times = [], []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        body = encoding.encode(data, media_type)
+        if coding is not None:
+            body = compression.compress(body, coding)
+        encode_times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        encoding.decode(_decompress(body, coding), media_type)
+        decode_times.append(time.perf_counter() - start)
+    return (
+        len(body),
+        statistics.median(encode_times),
+        statistics.median(decode_times),
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--events", type=int, nargs="+", default=[10, 100, 1000]
+    )
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"rounds: {args.rounds} (medians)")
+    print(
+        f"{'events':>6}  {'format':<14} {'bytes':>9} {'ratio':>6} "
+        f"{'encode':>10} {'decode':>10}"
+    )
+    for events in args.events:
+        data = _payload(events)
+        baseline = None
+        for label, media_type, coding in _formats():
+            size, enc, dec = _measure(data, media_type, coding, args.rounds)
+            baseline = baseline or size
+            print(
+                f"{events:>6}  {label:<14} {size:>9} {size / baseline:>6.2f} "
+                f"{enc * 1000:>7.3f} ms {dec * 1000:>7.3f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
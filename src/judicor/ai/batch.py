@@ -0,0 +1,80 @@
+# src/judicor/ai/batch.py
+
+"""
+Folding several reasoner questions into one model request.
+
+Items are numbered from 1 in the prompt and the model is asked for a
+JSON object mapping each number to its answer, which
+``split_batch_answer`` maps back to the items. Numbers rather than
+incident IDs key the answers so one incident may appear twice.
+"""
+
+import json
+import os
+import re
+from typing import Dict, Iterator, List, Sequence, TypeVar
+
+from judicor.ai.interface import BatchItem
+
+DEFAULT_BATCH_SIZE = 10
+
+BATCH_FORMAT = (
+    "Answer every item separately. Respond with only a JSON object "
+    'mapping each item number to its answer as a string, e.g. {"1": '
+    '"...", "2": "..."}.'
+)
+
+# Failure message for items a batched reply left out; callers re-ask
+# them one at a time through their full reasoner chain
+ITEM_MISSING = "The batched reply did not answer this item"
+
+_FENCE_RE = re.compile(r"^```(?:json)?\s*|\s*```$")
+
+T = TypeVar("T")
+
+
+def get_batch_size() -> int:
+    """Items per batched request (`JUDICOR_TRIAGE_BATCH_SIZE`)."""
+    raw = os.getenv("JUDICOR_TRIAGE_BATCH_SIZE")
+    try:
+        size = int(raw) if raw else DEFAULT_BATCH_SIZE
+    except ValueError:
+        size = DEFAULT_BATCH_SIZE
+    return max(1, size)
+
+
+def chunked(items: Sequence[T], size: int) -> Iterator[Sequence[T]]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def format_batch_items(items: Sequence[BatchItem]) -> str:
+    blocks = []
+    for number, (incident, question) in enumerate(items, start=1):
+        blocks.append(
+            f"Item {number}:\n"
+            f"- ID: {incident.id}\n"
+            f"- Title: {incident.title}\n"
+            f"- State: {incident.status}\n"
+            f"Context:\n{question.strip()}"
+        )
+    return "\n\n".join(blocks)
+
+
+def split_batch_answer(text: str, count: int) -> List[str]:
+    """
+    Answers for items 1..``count`` from a batched response; items the
+    model skipped (or an unparseable response) come back empty.
+    """
+    try:
+        data = json.loads(_FENCE_RE.sub("", text.strip()))
+    except ValueError:
+        data = None
+    if not isinstance(data, dict):
+        return [""] * count
+    answers: Dict[str, str] = {
+        str(key).strip(): str(value).strip()
+        for key, value in data.items()
+        if value is not None
+    }
+    return [answers.get(str(number), "") for number in range(1, count + 1)]
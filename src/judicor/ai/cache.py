@@ -0,0 +1,368 @@
+# src/judicor/ai/cache.py
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+from judicor.ai.interface import (
+    AIReasoner,
+    BatchItem,
+    ChunkCallback,
+    call_batch,
+)
+from judicor.ai.lazy import LazyAIReasoner
+from judicor.ai.roles import AgentRole
+from judicor.domain.models import Incident
+from judicor.domain.results import AskResult
+from judicor.observability.metrics import REGISTRY
+from judicor.session.utils import ensure_dir, secure_write_json
+
+BASE_DIR = Path.home() / ".judicor" / "cache" / "ai"
+
+DEFAULT_TTL_SECONDS = 300
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_MAX_DISK_ENTRIES = 10_000
+PRUNE_EVERY = 100
+
+CACHE_REQUESTS = REGISTRY.counter(
+    "judicor_ai_cache_requests_total",
+    "Reasoner cache lookups by role and result (hit, disk_hit, miss).",
+    ["role", "result"],
+)
+CACHE_SAVED_SECONDS = REGISTRY.counter(
+    "judicor_ai_cache_saved_seconds_total",
+    "Upstream latency avoided by serving reasoner answers from cache.",
+    ["role"],
+)
+
+VersionFn = Callable[[Incident], str]
+
+
+def incident_version(incident: Incident) -> str:
+    """
+    Default incident version: changes whenever the incident record does.
+
+    Context assembled into the prompt (summary, history, timeline) is
+    left out on purpose when the caller passes a `KeyedPrompt`: every ask
+    appends to history and timeline, so keying on it would never repeat.
+    """
+    return f"{incident.state.value}:{incident.updated_at.isoformat()}"
+
+
+class KeyedPrompt(str):
+    """
+    Prompt text carrying the part of it a cache should key on.
+
+    The pipeline renders context (timestamped timeline lines, the history
+    each ask grows) around the request; it passes the bare request as
+    ``cache_basis`` so the same question can be answered from cache.
+    """
+
+    cache_basis: str
+
+    def __new__(cls, text: str, cache_basis: str) -> "KeyedPrompt":
+        prompt = super().__new__(cls, text)
+        prompt.cache_basis = cache_basis
+        return prompt
+
+
+def normalize_prompt(prompt: str) -> str:
+    return " ".join(prompt.lower().split())
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    saved_seconds: float = 0.0
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.disk_hits + self.misses
+        return (self.hits + self.disk_hits) / total if total else 0.0
+
+    def to_json(self) -> dict:
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_ratio": self.hit_ratio,
+            "saved_seconds": self.saved_seconds,
+        }
+
+
+class CachingAIReasoner(AIReasoner):
+    """
+    Decorator caching successful answers of the wrapped reasoner.
+
+    Keyed on role, model, normalized prompt hash and incident version.
+    Entries live in a size-bounded in-memory LRU and, optionally, in a
+    file-per-entry disk tier shared across CLI processes. Both tiers
+    expire entries after ``ttl`` seconds.
+    """
+
+    def __init__(
+        self,
+        inner: AIReasoner,
+        role: AgentRole,
+        ttl: float = DEFAULT_TTL_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        disk: bool = False,
+        max_disk_entries: int = DEFAULT_MAX_DISK_ENTRIES,
+        version_fn: VersionFn = incident_version,
+    ) -> None:
+        self.inner = inner
+        self.role = role
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.disk = disk
+        self.max_disk_entries = max_disk_entries
+        self.version_fn = version_fn
+        self.stats = CacheStats()
+        self._entries: "OrderedDict[str, dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_writes = 0
+
+    @property
+    def model(self) -> str:
+        # Read per key so a lazily created inner reasoner is not forced
+        # into existence when the cache is built.
+        return getattr(self.inner, "model", type(self.inner).__name__)
+
+    # ------------------------------------------------------------------
+    # AIReasoner
+    # ------------------------------------------------------------------
+
+    def ask(self, incident: Incident, question: str) -> AskResult:
+        key = self.cache_key(incident, question)
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+
+        start = time.perf_counter()
+        result = self.inner.ask(incident, question)
+        self._store(key, result, time.perf_counter() - start)
+        return result
+
+    def ask_stream(
+        self, incident: Incident, question: str, on_chunk: ChunkCallback
+    ) -> AskResult:
+        key = self.cache_key(incident, question)
+        cached = self._lookup(key)
+        if cached is not None:
+            if cached.answer:
+                on_chunk(str(cached.answer))
+            return cached
+
+        start = time.perf_counter()
+        result = self.inner.ask_stream(incident, question, on_chunk)
+        self._store(key, result, time.perf_counter() - start)
+        return result
+
+    def ask_batch(self, items: Sequence[BatchItem]) -> List[AskResult]:
+        keys = [
+            self.cache_key(incident, question) for incident, question in items
+        ]
+        results: List[Optional[AskResult]] = [
+            self._lookup(key) for key in keys
+        ]
+        missing = [n for n, result in enumerate(results) if result is None]
+        if not missing:
+            return results
+
+        # Only the misses reach the model, still as one batch
+        start = time.perf_counter()
+        pending = [items[n] for n in missing]
+        answers = call_batch(self.inner, pending)
+        latency = (time.perf_counter() - start) / len(missing)
+        for n, result in zip(missing, answers):
+            self._store(keys[n], result, latency)
+            results[n] = result
+        return results
+
+    # ------------------------------------------------------------------
+    # Cache internals
+    # ------------------------------------------------------------------
+
+    def cache_key(self, incident: Incident, question: str) -> str:
+        basis = getattr(question, "cache_basis", question)
+        material = "\x1f".join(
+            (
+                self.role.value,
+                str(self.model),
+                str(incident.id),
+                self.version_fn(incident),
+                hashlib.sha256(
+                    normalize_prompt(basis).encode("utf-8")
+                ).hexdigest(),
+            )
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _lookup(self, key: str) -> Optional[AskResult]:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry["stored_at"] > self.ttl:
+                del self._entries[key]
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.stats.hits += 1
+                self.stats.saved_seconds += entry["latency"]
+                result_label = "hit"
+
+        if entry is None and self.disk:
+            entry = self._disk_load(key, now)
+            if entry is not None:
+                self._remember(key, entry)
+                with self._lock:
+                    self.stats.disk_hits += 1
+                    self.stats.saved_seconds += entry["latency"]
+                result_label = "disk_hit"
+
+        if entry is None:
+            with self._lock:
+                self.stats.misses += 1
+            CACHE_REQUESTS.inc(role=self.role.value, result="miss")
+            return None
+
+        CACHE_REQUESTS.inc(role=self.role.value, result=result_label)
+        CACHE_SAVED_SECONDS.inc(entry["latency"], role=self.role.value)
+        return AskResult(
+            success=True,
+            message=entry.get("message"),
+            answer=entry.get("answer"),
+            confidence=entry.get("confidence"),
+            reasoning=entry.get("reasoning"),
+        )
+
+    def _store(self, key: str, result: AskResult, latency: float) -> None:
+        # Failures are never cached so a transient upstream error is
+        # retried on the next ask.
+        if not result.success:
+            return
+        entry = {
+            "message": result.message,
+            "answer": result.answer,
+            "confidence": result.confidence,
+            "reasoning": result.reasoning,
+            "latency": latency,
+            "stored_at": time.time(),
+        }
+        self._remember(key, entry)
+        if self.disk:
+            self._disk_save(key, entry)
+
+    def _remember(self, key: str, entry: dict) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _disk_load(self, key: str, now: float) -> Optional[dict]:
+        path = BASE_DIR / f"{key}.json"
+        if not path.exists():
+            return None
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+        except Exception:
+            return None
+        if now - float(entry.get("stored_at", 0)) > self.ttl:
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            return None
+        return entry
+
+    def _disk_save(self, key: str, entry: dict) -> None:
+        try:
+            ensure_dir(BASE_DIR)
+            secure_write_json(BASE_DIR / f"{key}.json", entry)
+        except (OSError, TypeError):
+            return
+        self._disk_writes += 1
+        if self._disk_writes % PRUNE_EVERY == 0:
+            prune_disk(self.max_disk_entries)
+
+
+def prune_disk(max_entries: int = DEFAULT_MAX_DISK_ENTRIES) -> int:
+    """Drop the oldest disk entries beyond ``max_entries``."""
+    if not BASE_DIR.exists():
+        return 0
+    entries = []
+    for path in BASE_DIR.glob("*.json"):
+        try:
+            entries.append((path.stat().st_mtime, path))
+        except FileNotFoundError:
+            continue
+    overflow = len(entries) - max_entries
+    removed = 0
+    if overflow > 0:
+        entries.sort()
+        for _, path in entries[:overflow]:
+            try:
+                path.unlink()
+                removed += 1
+            except FileNotFoundError:
+                pass
+    return removed
+
+
+def _env_float(name: str, default: float) -> float:
+    raw = os.getenv(name)
+    try:
+        return float(raw) if raw else default
+    except ValueError:
+        return default
+
+
+def cache_from_env(inner: AIReasoner, role: AgentRole) -> AIReasoner:
+    """
+    Wrap ``inner`` according to `JUDICOR_AI_CACHE*` settings.
+
+    `JUDICOR_AI_CACHE=0` disables caching entirely;
+    `JUDICOR_AI_CACHE_DISK=1` adds the on-disk tier.
+    """
+    if os.getenv("JUDICOR_AI_CACHE", "1").lower() in ("0", "false", "off"):
+        return inner
+    return CachingAIReasoner(
+        inner,
+        role,
+        ttl=_env_float("JUDICOR_AI_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS),
+        max_entries=int(
+            _env_float("JUDICOR_AI_CACHE_SIZE", DEFAULT_MAX_ENTRIES)
+        ),
+        disk=os.getenv("JUDICOR_AI_CACHE_DISK", "0").lower()
+        in ("1", "true", "on"),
+    )
+
+
+def cache_stats(reasoners: Dict[AgentRole, AIReasoner]) -> Dict[str, dict]:
+    """Collect per-role stats from (possibly wrapped) caching reasoners."""
+    stats = {}
+    for role, reasoner in reasoners.items():
+        while reasoner is not None and not isinstance(
+            reasoner, CachingAIReasoner
+        ):
+            if isinstance(reasoner, LazyAIReasoner) and not reasoner.created:
+                reasoner = None
+                break
+            reasoner = getattr(reasoner, "inner", None)
+        if reasoner is not None:
+            stats[role.value] = reasoner.stats.to_json()
+    return stats
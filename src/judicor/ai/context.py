@@ -0,0 +1,258 @@
+# src/judicor/ai/context.py
+
+import functools
+import os
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from judicor.ai import similar
+from judicor.ai.roles import AgentRole
+from judicor.domain.models import Incident
+from judicor.observability.metrics import REGISTRY
+from judicor.session import history_store, timeline_store
+
+DEFAULT_TOKEN_BUDGET = 2000
+DEFAULT_HISTORY_ENTRIES = 10
+DEFAULT_TIMELINE_EVENTS = 20
+# Rendered (incident, section) entries kept per builder, least recently
+# used dropped first
+MAX_CACHED_SECTIONS = 1024
+# Average characters per token for English text in BPE tokenizers
+CHARS_PER_TOKEN = 4
+
+SECTIONS = ("summary", "history", "timeline")
+# Sections plus resolved incidents resembling this one
+RETRIEVAL_SECTIONS = SECTIONS + ("similar",)
+ELLIPSIS = "..."
+
+PROMPT_TOKENS = REGISTRY.histogram(
+    "judicor_ai_prompt_tokens",
+    "Estimated tokens per assembled reasoner context, by role.",
+    ["role"],
+    buckets=(64, 128, 256, 512, 1024, 2048, 4096, 8192, 16384),
+)
+
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+
+# (line, estimated tokens)
+Piece = Tuple[str, int]
+
+
+@functools.lru_cache(maxsize=8192)
+def estimate_tokens(text: str) -> int:
+    """
+    Approximate token count without a model tokenizer.
+
+    Words and punctuation count as one token each, long words as one
+    token per CHARS_PER_TOKEN characters, which tracks subword
+    tokenizers closely enough for budgeting.
+    """
+    return sum(
+        -(-len(match.group()) // CHARS_PER_TOKEN)
+        for match in _TOKEN_RE.finditer(text)
+    )
+
+
+def truncate_to_tokens(text: str, budget: int) -> str:
+    """Keep the tail of ``text`` (the most recent part) within budget."""
+    if budget <= 0:
+        return ""
+    if estimate_tokens(text) <= budget:
+        return text
+    budget -= estimate_tokens(ELLIPSIS)
+    # Characters are a safe upper bound; trim until the estimate fits.
+    kept = text[-budget * CHARS_PER_TOKEN:] if budget > 0 else ""
+    while kept and estimate_tokens(kept) > budget:
+        kept = kept[len(kept) // 10 + 1:]
+    return ELLIPSIS + kept
+
+
+@dataclass
+class PromptContext:
+    text: str
+    tokens: int
+    # Estimated tokens per included section
+    sections: Dict[str, int] = field(default_factory=dict)
+    # History entries / timeline events left out to respect the budget
+    dropped: int = 0
+
+
+def _env_int(name: str, default: int) -> int:
+    raw = os.getenv(name)
+    try:
+        return int(raw) if raw else default
+    except ValueError:
+        return default
+
+
+class ContextBuilder:
+    """
+    Assembles reasoner context from the rolling summary, the most recent
+    history entries and the timeline tail within a token budget.
+
+    The request itself is always included; the summary comes next, then
+    history and timeline, newest first, and finally similar resolved
+    incidents, until the budget is spent.
+    Rendered pieces are cached per incident and only rebuilt when the
+    underlying store file changes.
+    """
+
+    def __init__(
+        self,
+        budget: Optional[int] = None,
+        history_entries: Optional[int] = None,
+        timeline_events: Optional[int] = None,
+    ) -> None:
+        self.budget = (
+            budget
+            if budget is not None
+            else _env_int("JUDICOR_CONTEXT_TOKEN_BUDGET", DEFAULT_TOKEN_BUDGET)
+        )
+        self.history_entries = (
+            history_entries
+            if history_entries is not None
+            else _env_int(
+                "JUDICOR_CONTEXT_HISTORY_ENTRIES", DEFAULT_HISTORY_ENTRIES
+            )
+        )
+        self.timeline_events = (
+            timeline_events
+            if timeline_events is not None
+            else _env_int(
+                "JUDICOR_CONTEXT_TIMELINE_EVENTS", DEFAULT_TIMELINE_EVENTS
+            )
+        )
+        # (incident_id, section) -> (store version, rendered pieces)
+        self._pieces: "OrderedDict[Tuple[int, str], tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def build(
+        self,
+        incident: Incident,
+        request: str,
+        role: Optional[AgentRole] = None,
+        sections: Sequence[str] = SECTIONS,
+    ) -> PromptContext:
+        request_tokens = estimate_tokens(request)
+        remaining = self.budget - request_tokens
+        blocks: List[str] = []
+        counts: Dict[str, int] = {}
+        dropped = 0
+
+        if "summary" in sections:
+            pieces = self._section(incident.id, "summary")
+            if pieces and remaining > 0:
+                summary, tokens = pieces[0]
+                if tokens > remaining:
+                    summary = truncate_to_tokens(summary, remaining)
+                    tokens = estimate_tokens(summary)
+                blocks.append(f"Summary:\n{summary}")
+                counts["summary"] = tokens
+                remaining -= tokens
+
+        for name, title in (
+            ("history", "Recent history"),
+            ("timeline", "Recent timeline"),
+        ):
+            if name not in sections:
+                continue
+            pieces = self._section(incident.id, name)
+            kept: List[str] = []
+            used = 0
+            for line, tokens in reversed(pieces):
+                if tokens > remaining - used:
+                    break
+                kept.append(line)
+                used += tokens
+            dropped += len(pieces) - len(kept)
+            if kept:
+                blocks.append(f"{title}:\n" + "\n".join(reversed(kept)))
+                counts[name] = used
+                remaining -= used
+
+        if "similar" in sections and remaining > 0:
+            kept = []
+            used = 0
+            for line, tokens in self._similar(incident, request):
+                if tokens > remaining - used:
+                    break
+                kept.append(line)
+                used += tokens
+            if kept:
+                blocks.append("Similar past incidents:\n" + "\n".join(kept))
+                counts["similar"] = used
+                remaining -= used
+
+        if blocks:
+            blocks.append(f"Request:\n{request}")
+            text = "\n\n".join(blocks)
+        else:
+            text = request
+        counts["request"] = request_tokens
+        total = sum(counts.values())
+        if role is not None:
+            PROMPT_TOKENS.observe(total, role=role.value)
+        return PromptContext(
+            text=text, tokens=total, sections=counts, dropped=dropped
+        )
+
+    def _similar(self, incident: Incident, request: str) -> List[Piece]:
+        summary = history_store.load_summary(incident.id) or ""
+        matches = similar.find_similar(
+            f"{incident.title}\n{summary}\n{request}", exclude=(incident.id,)
+        )
+        lines = [
+            f"- #{match.incident_id} {match.title}"
+            + (f": {match.snippet}" if match.snippet else "")
+            for match in matches
+        ]
+        return [(line, estimate_tokens(line)) for line in lines]
+
+    def _section(self, incident_id: int, section: str) -> List[Piece]:
+        version = self._version(incident_id, section)
+        key = (incident_id, section)
+        with self._lock:
+            cached = self._pieces.get(key)
+            if cached is not None:
+                self._pieces.move_to_end(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        pieces = self._render(incident_id, section) if version else []
+        with self._lock:
+            self._pieces[key] = (version, pieces)
+            self._pieces.move_to_end(key)
+            while len(self._pieces) > MAX_CACHED_SECTIONS:
+                self._pieces.popitem(last=False)
+        return pieces
+
+    @staticmethod
+    def _version(incident_id: int, section: str):
+        if section == "summary":
+            return history_store.summary_version(incident_id)
+        if section == "history":
+            return history_store.history_version(incident_id)
+        return timeline_store.timeline_version(incident_id)
+
+    def _render(self, incident_id: int, section: str) -> List[Piece]:
+        if section == "summary":
+            summary = history_store.load_summary(incident_id)
+            return [(summary, estimate_tokens(summary))] if summary else []
+        if section == "history":
+            entries = history_store.load_history(incident_id)
+            lines = [
+                f"- [{entry.role.value}] {entry.content}"
+                for entry in entries[-self.history_entries:]
+                if self.history_entries
+            ]
+        else:
+            events = timeline_store.load_timeline(incident_id)
+            lines = [
+                f"- {event.timestamp.isoformat(timespec='seconds')} "
+                f"{event.event_type}: {event.message}"
+                for event in events[-self.timeline_events:]
+                if self.timeline_events
+            ]
+        return [(line, estimate_tokens(line)) for line in lines]
@@ -1,25 +1,72 @@
 # src/judicor/ai/factory.py
 
+import functools
 import os
 
 from judicor.ai.interface import AIReasoner
 from judicor.ai.roles import AgentRole
-from judicor.ai.implementations.dummy import DummyAIReasoner
-from judicor.ai.implementations.gemini import GeminiAIReasoner
 
 DEFAULT_AI_PROVIDER = "dummy"
+AI_PROVIDERS = ("dummy", "gemini")
+# Last resort of a provider chain: deterministic and always available
+FALLBACK_PROVIDER = "dummy"
 
 
 def create_ai_reasoner(role: AgentRole) -> AIReasoner:
-    ai_reasoner_type = os.getenv(
-        "JUDICOR_AI_PROVIDER", DEFAULT_AI_PROVIDER
-    ).lower()
+    """
+    Reasoner for ``role`` from `JUDICOR_AI_PROVIDER`.
 
+    A comma-separated list (``gemini,dummy``) builds a fallback chain
+    tried in order; the dummy reasoner is appended as the last resort.
+    """
+    raw = os.getenv("JUDICOR_AI_PROVIDER", DEFAULT_AI_PROVIDER).lower()
+    names = list(
+        dict.fromkeys(name.strip() for name in raw.split(",") if name.strip())
+    ) or [DEFAULT_AI_PROVIDER]
+    if len(names) == 1:
+        return _create_provider(names[0], role)
+
+    for name in names:
+        if name not in AI_PROVIDERS:
+            raise ValueError(f"Unknown Judicor ai reasoner type: {name}")
+    if FALLBACK_PROVIDER not in names:
+        names.append(FALLBACK_PROVIDER)
+
+    from judicor.ai.fallback import FallbackAIReasoner
+    from judicor.ai.lazy import LazyAIReasoner
+
+    # Lazy, so a provider that cannot be set up (missing credentials)
+    # fails its calls and falls through instead of breaking the chain.
+    providers = [
+        (name, LazyAIReasoner(functools.partial(_create_provider, name, role)))
+        for name in names
+    ]
+    return FallbackAIReasoner(providers, role)
+
+
+def _create_provider(ai_reasoner_type: str, role: AgentRole) -> AIReasoner:
+    # Provider SDKs are imported only for the selected provider
     if ai_reasoner_type == "dummy":
-        return DummyAIReasoner(role=role)
+        from judicor.ai.implementations import dummy
+
+        return dummy.DummyAIReasoner(role=role)
     elif ai_reasoner_type == "gemini":
-        return GeminiAIReasoner(role=role)
+        from judicor.ai.implementations import gemini
+
+        return _limited(
+            gemini.GeminiAIReasoner(role=role), ai_reasoner_type, role
+        )
     else:
         raise ValueError(
             f"Unknown Judicor ai reasoner type: {ai_reasoner_type}"
         )
+
+
+def _limited(reasoner: AIReasoner, provider: str, role: AgentRole):
+    """Apply the cross-process provider limiter when one is configured."""
+    from judicor.ai.limiter import RateLimitedAIReasoner, limiter_from_env
+
+    limiter = limiter_from_env(provider)
+    if limiter is None:
+        return reasoner
+    return RateLimitedAIReasoner(reasoner, limiter, role)
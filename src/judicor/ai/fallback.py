@@ -0,0 +1,436 @@
+# src/judicor/ai/fallback.py
+
+import functools
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from judicor.ai.interface import (
+    AIReasoner,
+    BatchItem,
+    ChunkCallback,
+    call_batch,
+)
+from judicor.ai.roles import AgentRole
+from judicor.domain.models import Incident
+from judicor.domain.results import AskResult
+from judicor.observability.metrics import REGISTRY
+
+CLOSED = "closed"
+HALF_OPEN = "half_open"
+OPEN = "open"
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_RESET_SECONDS = 30.0
+DEFAULT_HEDGE_PERCENTILE = 0.95
+DEFAULT_HEDGE_MIN_SAMPLES = 20
+LATENCY_WINDOW = 200
+
+ALL_UNAVAILABLE = "All AI providers are unavailable"
+
+BREAKER_STATE = REGISTRY.gauge(
+    "judicor_ai_breaker_state",
+    "Circuit breaker state per provider (0 closed, 1 half-open, 2 open).",
+    ["provider"],
+)
+BREAKER_TRANSITIONS = REGISTRY.counter(
+    "judicor_ai_breaker_transitions_total",
+    "Circuit breaker state changes by provider and new state.",
+    ["provider", "state"],
+)
+HEDGED_REQUESTS = REGISTRY.counter(
+    "judicor_ai_hedged_requests_total",
+    "Asks that sent a backup request after the hedge delay, by role and "
+    "winning request (primary, backup, none).",
+    ["role", "winner"],
+)
+FALLBACK_ANSWERS = REGISTRY.counter(
+    "judicor_ai_fallback_answers_total",
+    "Answers served by a provider other than the first in the chain.",
+    ["role", "provider"],
+)
+
+
+def _env_float(name: str, default: float) -> float:
+    raw = os.getenv(name)
+    try:
+        return float(raw) if raw else default
+    except ValueError:
+        return default
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker for one provider.
+
+    Opens after ``failure_threshold`` failures in a row; after
+    ``reset_timeout`` seconds a single trial call is let through
+    (half-open) and its outcome closes or re-opens the breaker.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        reset_timeout: float = DEFAULT_RESET_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.failures = 0
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._trial_running = False
+        self._lock = threading.Lock()
+        BREAKER_STATE.set(STATE_VALUES[CLOSED], provider=name)
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if (
+                self._state == OPEN
+                and self.clock() - self._opened_at >= self.reset_timeout
+            ):
+                return HALF_OPEN
+            return self._state
+
+    def allow(self) -> bool:
+        """Whether a call may be sent now (claims the half-open trial)."""
+        with self._lock:
+            if self._state == CLOSED:
+                return True
+            if self._state == OPEN:
+                if self.clock() - self._opened_at < self.reset_timeout:
+                    return False
+                self._transition(HALF_OPEN)
+            if self._trial_running:
+                return False
+            self._trial_running = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self._trial_running = False
+            if self._state != CLOSED:
+                self._transition(CLOSED)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            self._trial_running = False
+            if self._state == HALF_OPEN or (
+                self._state == CLOSED
+                and self.failures >= self.failure_threshold
+            ):
+                self._opened_at = self.clock()
+                self._transition(OPEN)
+
+    def _transition(self, state: str) -> None:
+        self._state = state
+        BREAKER_STATE.set(STATE_VALUES[state], provider=self.name)
+        BREAKER_TRANSITIONS.inc(provider=self.name, state=state)
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(provider: str) -> CircuitBreaker:
+    """Process-wide breaker per provider, shared by every role."""
+    breaker = _breakers.get(provider)
+    if breaker is None:
+        with _breakers_lock:
+            breaker = _breakers.get(provider)
+            if breaker is None:
+                breaker = CircuitBreaker(
+                    provider,
+                    failure_threshold=int(
+                        _env_float(
+                            "JUDICOR_AI_BREAKER_FAILURES",
+                            DEFAULT_FAILURE_THRESHOLD,
+                        )
+                    ),
+                    reset_timeout=_env_float(
+                        "JUDICOR_AI_BREAKER_RESET_SECONDS",
+                        DEFAULT_RESET_SECONDS,
+                    ),
+                )
+                _breakers[provider] = breaker
+    return breaker
+
+
+def reset_breakers() -> None:
+    with _breakers_lock:
+        _breakers.clear()
+
+
+class LatencyWindow:
+    """Recent successful call latencies for percentile lookups."""
+
+    def __init__(self, size: int = LATENCY_WINDOW) -> None:
+        self._samples: "deque[float]" = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def add(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, q: float) -> Optional[float]:
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        index = min(len(samples) - 1, int(q * len(samples)))
+        return samples[index]
+
+
+def _spawn(fn: Callable[[], AskResult]) -> "Future[AskResult]":
+    # Daemon threads: a hedged call that loses the race must not keep
+    # the CLI process alive until the provider times out.
+    future: "Future[AskResult]" = Future()
+
+    def run() -> None:
+        future.set_result(fn())
+
+    threading.Thread(target=run, name="judicor-hedge", daemon=True).start()
+    return future
+
+
+class FallbackAIReasoner(AIReasoner):
+    """
+    Composite reasoner trying an ordered chain of providers.
+
+    Providers whose circuit breaker is open are skipped. A failed call
+    falls through to the next provider. Once a provider has enough
+    latency samples, a call still running after its p95 latency is
+    hedged: the next provider gets the same request and the first
+    successful answer wins. Streaming calls fall back but are not
+    hedged, since two streams cannot share one output. Batches are not
+    hedged either; items a provider failed move on to the next one.
+    """
+
+    def __init__(
+        self,
+        providers: Sequence[Tuple[str, AIReasoner]],
+        role: AgentRole,
+        hedge: Optional[bool] = None,
+        hedge_percentile: Optional[float] = None,
+        hedge_min_samples: Optional[int] = None,
+    ) -> None:
+        if not providers:
+            raise ValueError("At least one AI provider is required")
+        self.providers = list(providers)
+        self._reasoners = dict(self.providers)
+        self.role = role
+        self.hedge = (
+            hedge
+            if hedge is not None
+            else os.getenv("JUDICOR_AI_HEDGE", "1").lower()
+            not in ("0", "false", "off")
+        )
+        self.hedge_percentile = hedge_percentile or _env_float(
+            "JUDICOR_AI_HEDGE_PERCENTILE", DEFAULT_HEDGE_PERCENTILE
+        )
+        self.hedge_min_samples = (
+            hedge_min_samples
+            if hedge_min_samples is not None
+            else int(
+                _env_float(
+                    "JUDICOR_AI_HEDGE_MIN_SAMPLES", DEFAULT_HEDGE_MIN_SAMPLES
+                )
+            )
+        )
+        self.latencies = {name: LatencyWindow() for name, _ in providers}
+
+    @property
+    def model(self) -> str:
+        # The provider currently answering first, so cached answers from
+        # a fallback are not served under the primary's key.
+        for name, reasoner in self.providers:
+            if get_breaker(name).state != OPEN:
+                return getattr(reasoner, "model", name)
+        return "unavailable"
+
+    def hedge_delay(self, provider: str) -> Optional[float]:
+        window = self.latencies[provider]
+        if not self.hedge or len(window) < self.hedge_min_samples:
+            return None
+        return window.percentile(self.hedge_percentile)
+
+    # ------------------------------------------------------------------
+    # AIReasoner
+    # ------------------------------------------------------------------
+
+    def ask(self, incident: Incident, question: str) -> AskResult:
+        available = self._available()
+        failure: Optional[AskResult] = None
+        for name in available:
+            delay = self.hedge_delay(name)
+            if delay is None:
+                result = self._call(name, incident, question)
+            else:
+                name, result = self._hedged(
+                    name, delay, available, incident, question
+                )
+            if result.success:
+                self._count_fallback(name)
+                return result
+            failure = result
+        return failure or AskResult(success=False, message=ALL_UNAVAILABLE)
+
+    def ask_stream(
+        self, incident: Incident, question: str, on_chunk: ChunkCallback
+    ) -> AskResult:
+        failure: Optional[AskResult] = None
+        for name in self._available():
+            emitted = False
+
+            def tracked(text: str) -> None:
+                nonlocal emitted
+                emitted = True
+                on_chunk(text)
+
+            result = self._call(name, incident, question, tracked)
+            if result.success:
+                self._count_fallback(name)
+                return result
+            failure = result
+            if emitted:
+                # Part of the answer is already on screen; a different
+                # provider's answer cannot be appended to it.
+                break
+        return failure or AskResult(success=False, message=ALL_UNAVAILABLE)
+
+    def ask_batch(self, items: Sequence[BatchItem]) -> List[AskResult]:
+        results: List[Optional[AskResult]] = [None] * len(items)
+        pending = list(range(len(items)))
+        for name in self._available():
+            answers = self._call_batch(name, [items[n] for n in pending])
+            for n, result in zip(pending, answers):
+                results[n] = result
+                if result.success:
+                    self._count_fallback(name)
+            pending = [n for n in pending if not results[n].success]
+            if not pending:
+                break
+        return [
+            result or AskResult(success=False, message=ALL_UNAVAILABLE)
+            for result in results
+        ]
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _available(self) -> Iterator[str]:
+        """Provider names in order, skipping open breakers."""
+        for name, _ in self.providers:
+            if get_breaker(name).allow():
+                yield name
+
+    def _call(
+        self,
+        name: str,
+        incident: Incident,
+        question: str,
+        on_chunk: Optional[ChunkCallback] = None,
+    ) -> AskResult:
+        reasoner = self._reasoners[name]
+        breaker = get_breaker(name)
+        start = time.perf_counter()
+        try:
+            if on_chunk is None:
+                result = reasoner.ask(incident, question)
+            else:
+                result = reasoner.ask_stream(incident, question, on_chunk)
+        except Exception as exc:
+            result = AskResult(success=False, message=str(exc))
+        if result.success:
+            self.latencies[name].add(time.perf_counter() - start)
+            breaker.record_success()
+        else:
+            breaker.record_failure()
+        return result
+
+    def _call_batch(
+        self, name: str, items: Sequence[BatchItem]
+    ) -> List[AskResult]:
+        breaker = get_breaker(name)
+        try:
+            results = call_batch(self._reasoners[name], items)
+        except Exception as exc:
+            results = [
+                AskResult(success=False, message=str(exc)) for _ in items
+            ]
+        # Partial answers show the provider is up; batch latency is not
+        # comparable with single asks, so it stays out of the window.
+        if any(result.success for result in results):
+            breaker.record_success()
+        else:
+            breaker.record_failure()
+        return results
+
+    def _hedged(
+        self,
+        primary: str,
+        delay: float,
+        available: Iterator[str],
+        incident: Incident,
+        question: str,
+    ) -> Tuple[str, AskResult]:
+        """
+        Run ``primary`` and, if it is still pending after ``delay``, the
+        next available provider; return the first successful answer.
+        """
+        first = _spawn(
+            functools.partial(self._call, primary, incident, question)
+        )
+        in_flight = {first: primary}
+        backup: Optional[str] = None
+        hedged = False
+        failure = (primary, AskResult(success=False, message=ALL_UNAVAILABLE))
+        while in_flight:
+            done, _ = wait(
+                in_flight,
+                timeout=None if hedged else delay,
+                return_when=FIRST_COMPLETED,
+            )
+            if not done:
+                hedged = True
+                backup = next(available, None)
+                if backup is not None:
+                    future = _spawn(
+                        functools.partial(
+                            self._call, backup, incident, question
+                        )
+                    )
+                    in_flight[future] = backup
+                continue
+            for future in done:
+                name = in_flight.pop(future)
+                result = future.result()
+                if result.success:
+                    if hedged and backup is not None:
+                        winner = "primary" if name == primary else "backup"
+                        HEDGED_REQUESTS.inc(
+                            role=self.role.value, winner=winner
+                        )
+                    return name, result
+                failure = (name, result)
+        if hedged and backup is not None:
+            HEDGED_REQUESTS.inc(role=self.role.value, winner="none")
+        return failure
+
+    def _count_fallback(self, name: str) -> None:
+        if name != self.providers[0][0]:
+            FALLBACK_ANSWERS.inc(role=self.role.value, provider=name)
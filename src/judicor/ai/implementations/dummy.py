@@ -1,6 +1,6 @@
 # src/judicor/ai/implementations/dummy.py
 
-from judicor.ai.interface import AIReasoner
+from judicor.ai.interface import AIReasoner, ChunkCallback
 from judicor.domain.models import Incident
 from judicor.domain.results import AskResult
 
@@ -19,3 +19,11 @@ class DummyAIReasoner(AIReasoner):
             confidence=0.9,
             reasoning="Static dummy reasoning",
         )
+
+    def ask_stream(
+        self, incident: Incident, question: str, on_chunk: ChunkCallback
+    ) -> AskResult:
+        result = self.ask(incident, question)
+        for i, word in enumerate(str(result.answer).split(" ")):
+            on_chunk(word if i == 0 else f" {word}")
+        return result
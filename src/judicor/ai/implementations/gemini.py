@@ -1,13 +1,56 @@
 # src/judicor/ai/implementations/gemini.py
 
 import os
+from typing import List, Sequence
+
 from google import genai
 
-from judicor.ai.interface import AIReasoner
+from judicor.ai.batch import (
+    BATCH_FORMAT,
+    ITEM_MISSING,
+    format_batch_items,
+    split_batch_answer,
+)
+from judicor.ai.interface import (
+    AIReasoner,
+    BatchItem,
+    ChunkCallback,
+    batch_via_ask,
+)
+from judicor.ai.providers import get_shared_client
 from judicor.ai.roles import AgentRole
 from judicor.domain.models import Incident
 from judicor.domain.results import AskResult
 
+DEFAULT_MAX_CONNECTIONS = 10
+DEFAULT_KEEPALIVE_SECONDS = 60.0
+
+
+def _create_genai_client():
+    """Build the shared Gemini client with a keep-alive connection pool."""
+    import httpx
+
+    max_connections = int(
+        os.getenv("JUDICOR_GEMINI_MAX_CONNECTIONS", DEFAULT_MAX_CONNECTIONS)
+    )
+    keepalive = float(
+        os.getenv(
+            "JUDICOR_GEMINI_KEEPALIVE_SECONDS", DEFAULT_KEEPALIVE_SECONDS
+        )
+    )
+    limits = httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_connections,
+        keepalive_expiry=keepalive,
+    )
+    # Client picks API key from env
+    try:
+        return genai.Client(
+            http_options={"client_args": {"limits": limits}}
+        )
+    except TypeError:
+        return genai.Client()
+
 
 class GeminiAIReasoner(AIReasoner):
     """
@@ -19,16 +62,27 @@ class GeminiAIReasoner(AIReasoner):
     - Returning raw output (no validation / policy)
     """
 
-    def __init__(self, role: AgentRole, model: str = "gemini-3-flash-preview"):
+    def __init__(
+        self,
+        role: AgentRole,
+        model: str = "gemini-3-flash-preview",
+        client=None,
+    ):
         api_key = os.getenv("GOOGLE_API_KEY")
         if not api_key:
             raise RuntimeError("GOOGLE_API_KEY is not set")
 
-        # Client picks API key from env
-        self.client = genai.Client()
+        self._client = client
         self.model = model
         self.role = role
 
+    @property
+    def client(self):
+        # One pooled client is shared by all roles and created on first use
+        if self._client is None:
+            self._client = get_shared_client("gemini", _create_genai_client)
+        return self._client
+
     def ask(self, incident: Incident, question: str) -> AskResult:
         prompt = self._build_prompt(incident, question)
 
@@ -50,7 +104,62 @@ class GeminiAIReasoner(AIReasoner):
             reasoning=None,
         )
 
-    def _build_prompt(self, incident: Incident, question: str) -> str:
+    def ask_stream(
+        self, incident: Incident, question: str, on_chunk: ChunkCallback
+    ) -> AskResult:
+        prompt = self._build_prompt(incident, question)
+        parts = []
+
+        try:
+            stream = self.client.models.generate_content_stream(
+                model=self.model,
+                contents=prompt,
+            )
+            for chunk in stream:
+                text = getattr(chunk, "text", "") or ""
+                if text:
+                    parts.append(text)
+                    on_chunk(text)
+        except Exception as exc:  # pragma: no cover - upstream client errors
+            return AskResult(success=False, message=str(exc))
+
+        return AskResult(
+            True,
+            answer="".join(parts).strip(),
+            confidence=1.0,
+            reasoning=None,
+        )
+
+    def ask_batch(self, items: Sequence[BatchItem]) -> List[AskResult]:
+        """
+        Answer all items in one request. Items missing from the reply
+        fail with `ITEM_MISSING` rather than being asked here, which
+        would bypass the wrappers (limiter, cache) around this reasoner.
+        """
+        if len(items) < 2:
+            return batch_via_ask(self, items)
+
+        try:
+            response = self.client.models.generate_content(
+                model=self.model,
+                contents=self._build_batch_prompt(items),
+            )
+        except Exception as exc:  # pragma: no cover - upstream client errors
+            return [
+                AskResult(success=False, message=str(exc)) for _ in items
+            ]
+
+        answers = split_batch_answer(
+            getattr(response, "text", "") or "", len(items)
+        )
+        return [
+            AskResult(True, answer=answer, confidence=1.0, reasoning=None)
+            if answer
+            else AskResult(success=False, message=ITEM_MISSING)
+            for answer in answers
+        ]
+
+    def _instruction(self) -> str:
         if self.role == AgentRole.ANALYZER:
             instruction = "Analyze the incident and highlight likely causes."
         elif self.role == AgentRole.INVESTIGATOR:
@@ -69,7 +178,10 @@ class GeminiAIReasoner(AIReasoner):
             )
         else:
             instruction = "Provide helpful reasoning."
+        return instruction
 
+    def _build_prompt(self, incident: Incident, question: str) -> str:
+        instruction = self._instruction()
         return f"""
 You are an AI assistant helping investigate a production incident.
 
@@ -85,4 +197,16 @@ Context:
 {question}
 
 Respond concisely and stay within your role.
+"""
+
+    def _build_batch_prompt(self, items: Sequence[BatchItem]) -> str:
+        return f"""
+You are an AI assistant helping investigate production incidents.
+
+Role: {self.role.value}
+Instruction: {self._instruction()}
+
+{format_batch_items(items)}
+
+{BATCH_FORMAT} Keep each answer concise and stay within your role.
 """
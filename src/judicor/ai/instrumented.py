@@ -0,0 +1,88 @@
+# src/judicor/ai/instrumented.py
+
+import time
+from typing import List, Sequence
+
+from judicor.ai.interface import (
+    AIReasoner,
+    BatchItem,
+    ChunkCallback,
+    call_batch,
+)
+from judicor.ai.roles import AgentRole
+from judicor.domain.models import Incident
+from judicor.domain.results import AskResult
+from judicor.observability.metrics import (
+    AI_BATCH_SIZE,
+    AI_DURATION,
+    AI_REQUESTS,
+    AI_TIME_TO_FIRST_TOKEN,
+)
+
+
+class InstrumentedAIReasoner(AIReasoner):
+    """
+    Decorator recording latency and outcome of every call per AgentRole.
+
+    Adds no behaviour of its own; the wrapped reasoner's result is
+    returned untouched.
+    """
+
+    def __init__(self, inner: AIReasoner, role: AgentRole):
+        self.inner = inner
+        self.role = role
+
+    def ask(self, incident: Incident, question: str) -> AskResult:
+        start = time.perf_counter()
+        outcome = "error"
+        try:
+            result = self.inner.ask(incident, question)
+            outcome = "ok" if result.success else "failed"
+            return result
+        finally:
+            AI_DURATION.observe(
+                time.perf_counter() - start, role=self.role.value
+            )
+            AI_REQUESTS.inc(role=self.role.value, outcome=outcome)
+
+    def ask_batch(self, items: Sequence[BatchItem]) -> List[AskResult]:
+        # One observation per batch: the duration is one round trip
+        start = time.perf_counter()
+        outcome = "error"
+        try:
+            results = call_batch(self.inner, items)
+            ok = all(result.success for result in results)
+            outcome = "ok" if ok else "failed"
+            return results
+        finally:
+            AI_DURATION.observe(
+                time.perf_counter() - start, role=self.role.value
+            )
+            AI_REQUESTS.inc(role=self.role.value, outcome=outcome)
+            AI_BATCH_SIZE.observe(len(items), role=self.role.value)
+
+    def ask_stream(
+        self, incident: Incident, question: str, on_chunk: ChunkCallback
+    ) -> AskResult:
+        start = time.perf_counter()
+        first_chunk = True
+        outcome = "error"
+
+        def timed_chunk(text: str) -> None:
+            nonlocal first_chunk
+            if first_chunk:
+                first_chunk = False
+                AI_TIME_TO_FIRST_TOKEN.observe(
+                    time.perf_counter() - start, role=self.role.value
+                )
+            on_chunk(text)
+
+        try:
+            result = self.inner.ask_stream(incident, question, timed_chunk)
+            outcome = "ok" if result.success else "failed"
+            return result
+        finally:
+            AI_DURATION.observe(
+                time.perf_counter() - start, role=self.role.value
+            )
+            AI_REQUESTS.inc(role=self.role.value, outcome=outcome)
@@ -1,9 +1,15 @@
 # src/judicor/ai/interface.py
 
 from abc import ABC, abstractmethod
+from typing import Callable, List, Sequence, Tuple
+
 from judicor.domain.results import AskResult
 from judicor.domain.models import Incident
 
+ChunkCallback = Callable[[str], None]
+# (incident, question) pair answered as part of a batch
+BatchItem = Tuple[Incident, str]
+
 
 class AIReasoner(ABC):
     """
@@ -17,3 +23,47 @@ class AIReasoner(ABC):
     def ask(self, incident: Incident, question: str) -> AskResult:
         """Generate a resoning response for a given incident"""
         pass
+
+    def ask_stream(
+        self, incident: Incident, question: str, on_chunk: ChunkCallback
+    ) -> AskResult:
+        """
+        Generate a response, passing answer text to ``on_chunk`` as it is
+        produced. The returned result carries the complete answer.
+
+        Default implementation for non-streaming engines: emits the whole
+        answer as a single chunk.
+        """
+        return stream_via_ask(self, incident, question, on_chunk)
+
+    def ask_batch(self, items: Sequence[BatchItem]) -> List[AskResult]:
+        """
+        Answer several questions, returning one result per item in order.
+
+        Default implementation: one ``ask`` per item. Engines that can
+        answer many items in a single request override this.
+        """
+        return batch_via_ask(self, items)
+
+
+def stream_via_ask(
+    reasoner, incident: Incident, question: str, on_chunk: ChunkCallback
+) -> AskResult:
+    """Adapt any object with ``ask`` to the streaming call shape."""
+    result = reasoner.ask(incident, question)
+    if result.success and result.answer:
+        on_chunk(str(result.answer))
+    return result
+
+
+def batch_via_ask(reasoner, items: Sequence[BatchItem]) -> List[AskResult]:
+    """Adapt any object with ``ask`` to the batch call shape."""
+    return [reasoner.ask(incident, question) for incident, question in items]
+
+
+def call_batch(reasoner, items: Sequence[BatchItem]) -> List[AskResult]:
+    """Batch call on any object with ``ask`` (its ``ask_batch`` if any)."""
+    ask_batch = getattr(reasoner, "ask_batch", None)
+    if ask_batch is None:
+        return batch_via_ask(reasoner, items)
+    return ask_batch(items)
@@ -0,0 +1,66 @@
+# src/judicor/ai/lazy.py
+
+import threading
+from typing import Callable, List, Optional, Sequence
+
+from judicor.ai.interface import AIReasoner, BatchItem, ChunkCallback
+from judicor.domain.models import Incident
+from judicor.domain.results import AskResult
+
+
+class LazyAIReasoner(AIReasoner):
+    """
+    Decorator deferring reasoner construction until the first call.
+
+    Commands that never reach the AI (list, show, resolve) do not pay for
+    provider setup. A construction failure such as missing credentials is
+    returned as a failed result and retried on the next call.
+    """
+
+    def __init__(self, factory: Callable[[], AIReasoner]) -> None:
+        self.factory = factory
+        self._inner: Optional[AIReasoner] = None
+        self._lock = threading.Lock()
+
+    @property
+    def created(self) -> bool:
+        return self._inner is not None
+
+    @property
+    def inner(self) -> AIReasoner:
+        if self._inner is None:
+            with self._lock:
+                if self._inner is None:
+                    self._inner = self.factory()
+        return self._inner
+
+    @property
+    def model(self) -> str:
+        try:
+            inner = self.inner
+        except RuntimeError:
+            return "unavailable"
+        return getattr(inner, "model", type(inner).__name__)
+
+    def ask(self, incident: Incident, question: str) -> AskResult:
+        try:
+            inner = self.inner
+        except RuntimeError as exc:
+            return AskResult(success=False, message=str(exc))
+        return inner.ask(incident, question)
+
+    def ask_stream(
+        self, incident: Incident, question: str, on_chunk: ChunkCallback
+    ) -> AskResult:
+        try:
+            inner = self.inner
+        except RuntimeError as exc:
+            return AskResult(success=False, message=str(exc))
+        return inner.ask_stream(incident, question, on_chunk)
+
+    def ask_batch(self, items: Sequence[BatchItem]) -> List[AskResult]:
+        try:
+            inner = self.inner
+        except RuntimeError as exc:
+            return [AskResult(success=False, message=str(exc)) for _ in items]
+        return inner.ask_batch(items)
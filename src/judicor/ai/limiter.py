@@ -0,0 +1,290 @@
+# src/judicor/ai/limiter.py
+
+import json
+import os
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+from judicor.ai.interface import (
+    AIReasoner,
+    BatchItem,
+    ChunkCallback,
+    call_batch,
+)
+from judicor.ai.roles import AgentRole
+from judicor.domain.models import Incident
+from judicor.domain.results import AskResult
+from judicor.observability.metrics import REGISTRY
+from judicor.session.utils import ensure_dir, file_lock, secure_write_json
+
+BASE_DIR = Path.home() / ".judicor" / "limits"
+
+DEFAULT_MAX_WAIT_SECONDS = 60.0
+DEFAULT_LEASE_SECONDS = 300.0
+# A waiter that stopped polling for this long is assumed to be gone
+TICKET_TTL_SECONDS = 5.0
+POLL_INTERVAL = 0.05
+# Waiters behind the head of the queue poll less often, up to this
+MAX_POLL_INTERVAL = 0.5
+
+# Lower runs first: interactive asks ahead of background summaries
+ROLE_PRIORITY = {
+    AgentRole.INVESTIGATOR: 0,
+    AgentRole.ANALYZER: 1,
+    AgentRole.RESOLVER: 1,
+    AgentRole.SUMMARIZER: 2,
+}
+
+LIMIT_WAIT_EXCEEDED = "AI provider limit: waited {seconds:.0f}s for a slot"
+
+LIMITER_WAIT = REGISTRY.histogram(
+    "judicor_ai_limiter_wait_seconds",
+    "Time reasoner calls queued for a provider slot, by provider and role.",
+    ["provider", "role"],
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+LIMITER_TIMEOUTS = REGISTRY.counter(
+    "judicor_ai_limiter_timeouts_total",
+    "Reasoner calls given up after waiting too long for a provider slot.",
+    ["provider", "role"],
+)
+
+
+def _env_float(name: str, default: float) -> float:
+    raw = os.getenv(name)
+    try:
+        return float(raw) if raw else default
+    except ValueError:
+        return default
+
+
+class ProviderLimiter:
+    """
+    Token bucket plus in-flight cap for one provider, shared by every
+    process on the machine.
+
+    State lives in ``BASE_DIR/<provider>.json`` and is only read and
+    written under its file lock. Waiting calls register a ticket; the
+    slot goes to the ticket with the best role priority, oldest first.
+    Leases of crashed processes expire after ``lease_seconds``.
+    A ``rate`` or ``max_in_flight`` of 0 leaves that dimension unlimited.
+    """
+
+    def __init__(
+        self,
+        provider: str,
+        rate: float = 0.0,
+        burst: float = 1.0,
+        max_in_flight: int = 0,
+        max_wait: float = DEFAULT_MAX_WAIT_SECONDS,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS,
+    ) -> None:
+        self.provider = provider
+        self.rate = rate
+        self.burst = max(burst, 1.0)
+        self.max_in_flight = max_in_flight
+        self.max_wait = max_wait
+        self.lease_seconds = lease_seconds
+
+    @property
+    def path(self) -> Path:
+        return BASE_DIR / f"{self.provider}.json"
+
+    def acquire(self, role: AgentRole) -> Optional[str]:
+        """Wait for a slot; return its lease id, or None on timeout."""
+        ticket = uuid.uuid4().hex
+        priority = ROLE_PRIORITY.get(role, 1)
+        start = time.time()
+        deadline = start + self.max_wait
+        ensure_dir(BASE_DIR)
+        while True:
+            now = time.time()
+            with file_lock(self.path):
+                state, dirty = self._load(now)
+                waiting = state["waiting"]
+                entry = waiting.get(ticket)
+                if entry is None:
+                    entry = waiting[ticket] = {
+                        "priority": priority,
+                        "since": now,
+                        "seen": now,
+                    }
+                    dirty = True
+                elif now - entry["seen"] >= TICKET_TTL_SECONDS / 2:
+                    # Heartbeat, so other processes keep the ticket
+                    entry["seen"] = now
+                    dirty = True
+
+                rank = (priority, entry["since"])
+                ahead = sum(
+                    1
+                    for other in waiting.values()
+                    if (other["priority"], other["since"]) < rank
+                )
+                if ahead:
+                    delay = min(POLL_INTERVAL * (ahead + 1), MAX_POLL_INTERVAL)
+                else:
+                    delay = min(
+                        self._try_take(state, ticket, now), POLL_INTERVAL
+                    )
+                if delay == 0.0 or now >= deadline:
+                    del waiting[ticket]
+                    dirty = True
+                # Polls that change nothing leave the file alone
+                if dirty:
+                    self._save(state)
+
+            if delay == 0.0:
+                LIMITER_WAIT.observe(
+                    now - start, provider=self.provider, role=role.value
+                )
+                return ticket
+            if now >= deadline:
+                LIMITER_TIMEOUTS.inc(provider=self.provider, role=role.value)
+                return None
+            time.sleep(max(0.001, min(delay, deadline - now)))
+
+    def release(self, lease: str) -> None:
+        with file_lock(self.path):
+            state, _ = self._load(time.time())
+            state["leases"].pop(lease, None)
+            self._save(state)
+
+    @contextmanager
+    def slot(self, role: AgentRole) -> Iterator[bool]:
+        """Hold a slot for the block; yields False if none was granted."""
+        lease = self.acquire(role)
+        try:
+            yield lease is not None
+        finally:
+            if lease is not None:
+                self.release(lease)
+
+    def _try_take(self, state: dict, ticket: str, now: float) -> float:
+        """
+        Take a slot for ``ticket``: 0, or how long to wait. A refill
+        without a take need not be saved; it is recomputed from
+        ``updated`` on the next attempt.
+        """
+        if self.max_in_flight and len(state["leases"]) >= self.max_in_flight:
+            return POLL_INTERVAL
+        if self.rate > 0:
+            elapsed = max(0.0, now - state["updated"])
+            state["tokens"] = min(
+                self.burst, state["tokens"] + elapsed * self.rate
+            )
+            state["updated"] = now
+            if state["tokens"] < 1.0:
+                return (1.0 - state["tokens"]) / self.rate
+            state["tokens"] -= 1.0
+        state["leases"][ticket] = now + self.lease_seconds
+        return 0.0
+
+    def _load(self, now: float) -> Tuple[dict, bool]:
+        """
+        State with expired leases and tickets dropped, and whether that
+        differs from the file, so the caller knows to save it.
+        """
+        state = None
+        if self.path.exists():
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    state = json.load(f)
+            except Exception:
+                state = None
+        changed = not state
+        if not state:
+            state = {"tokens": self.burst, "updated": now}
+        state.setdefault("tokens", self.burst)
+        state.setdefault("updated", now)
+        leases = state.get("leases", {})
+        state["leases"] = {
+            lease: expires
+            for lease, expires in leases.items()
+            if expires > now
+        }
+        waiting = state.get("waiting", {})
+        state["waiting"] = {
+            ticket: entry
+            for ticket, entry in waiting.items()
+            if now - entry.get("seen", 0) < TICKET_TTL_SECONDS
+        }
+        changed = changed or (
+            len(state["leases"]) != len(leases)
+            or len(state["waiting"]) != len(waiting)
+        )
+        return state, changed
+
+    def _save(self, state: dict) -> None:
+        secure_write_json(self.path, state)
+
+
+def limiter_from_env(provider: str) -> Optional[ProviderLimiter]:
+    """
+    Limiter from `JUDICOR_AI_RATE` / `JUDICOR_AI_BURST` /
+    `JUDICOR_AI_MAX_IN_FLIGHT` (all unset: no limiter).
+    """
+    rate = _env_float("JUDICOR_AI_RATE", 0.0)
+    max_in_flight = int(_env_float("JUDICOR_AI_MAX_IN_FLIGHT", 0))
+    if rate <= 0 and max_in_flight <= 0:
+        return None
+    return ProviderLimiter(
+        provider,
+        rate=rate,
+        burst=_env_float("JUDICOR_AI_BURST", max(rate, 1.0)),
+        max_in_flight=max_in_flight,
+        max_wait=_env_float(
+            "JUDICOR_AI_LIMIT_MAX_WAIT_SECONDS", DEFAULT_MAX_WAIT_SECONDS
+        ),
+    )
+
+
+class RateLimitedAIReasoner(AIReasoner):
+    """
+    Decorator holding a provider slot for the duration of each call.
+
+    A call that cannot get a slot within the limiter's ``max_wait``
+    returns a failed result instead of reaching the provider, so a
+    fallback chain can move on to the next provider.
+    """
+
+    def __init__(
+        self, inner: AIReasoner, limiter: ProviderLimiter, role: AgentRole
+    ) -> None:
+        self.inner = inner
+        self.limiter = limiter
+        self.role = role
+
+    @property
+    def model(self) -> str:
+        return getattr(self.inner, "model", type(self.inner).__name__)
+
+    def ask(self, incident: Incident, question: str) -> AskResult:
+        with self.limiter.slot(self.role) as granted:
+            if not granted:
+                return self._wait_exceeded()
+            return self.inner.ask(incident, question)
+
+    def ask_stream(
+        self, incident: Incident, question: str, on_chunk: ChunkCallback
+    ) -> AskResult:
+        with self.limiter.slot(self.role) as granted:
+            if not granted:
+                return self._wait_exceeded()
+            return self.inner.ask_stream(incident, question, on_chunk)
+
+    def ask_batch(self, items: Sequence[BatchItem]) -> List[AskResult]:
+        # A batch is one provider request, so it takes one slot
+        with self.limiter.slot(self.role) as granted:
+            if not granted:
+                return [self._wait_exceeded() for _ in items]
+            return call_batch(self.inner, items)
+
+    def _wait_exceeded(self) -> AskResult:
+        return AskResult(
+            success=False,
+            message=LIMIT_WAIT_EXCEEDED.format(seconds=self.limiter.max_wait),
+        )
@@ -0,0 +1,269 @@
+# src/judicor/ai/pipeline.py
+
+import functools
+import os
+from typing import Dict, List, Optional, Sequence
+
+from judicor.ai.batch import ITEM_MISSING, chunked, get_batch_size
+from judicor.ai.cache import KeyedPrompt, cache_from_env
+from judicor.ai.context import RETRIEVAL_SECTIONS, ContextBuilder
+from judicor.ai.factory import create_ai_reasoner
+from judicor.ai.instrumented import InstrumentedAIReasoner
+from judicor.ai.interface import AIReasoner, ChunkCallback
+from judicor.ai.lazy import LazyAIReasoner
+from judicor.ai.policy import ReasoningPolicy
+from judicor.ai.roles import AgentRole
+from judicor.ai.summary import (
+    SummaryScheduler,
+    chunk_entries,
+    format_entry,
+    get_chunk_limits,
+)
+from judicor.domain.models import Incident, IncidentState
+from judicor.domain.results import AskResult
+from judicor.session import history_store, incident_store, timeline_store
+
+DEFAULT_SUMMARY_MODE = "background"
+# States in which an incident without any history still awaits analysis
+TRIAGE_STATES = (IncidentState.CREATED, IncidentState.ACTIVE)
+
+
+def build_reasoners(
+    provided: Optional[AIReasoner] = None,
+) -> Dict[AgentRole, AIReasoner]:
+    """
+    Create one cached, instrumented reasoner per AgentRole.
+
+    Provider reasoners are built on first use and share one SDK client
+    (see `judicor.ai.providers`).
+    """
+    mapping: Dict[AgentRole, AIReasoner] = {}
+    for role in AgentRole:
+        if provided is not None:
+            reasoner = provided
+        else:
+            reasoner = LazyAIReasoner(
+                functools.partial(create_ai_reasoner, role)
+            )
+        mapping[role] = InstrumentedAIReasoner(
+            cache_from_env(reasoner, role), role
+        )
+    return mapping
+
+
+def needs_triage(incident: Incident) -> bool:
+    """Whether ``incident`` is open and has not been analyzed yet."""
+    return (
+        incident.state in TRIAGE_STATES
+        and history_store.history_version(incident.id) is None
+    )
+
+
+def triage_candidates(
+    incident_ids: Optional[Sequence[int]] = None,
+) -> List[Incident]:
+    """
+    Incidents to triage: ``incident_ids`` in order (duplicates dropped),
+    or every incident still awaiting analysis.
+
+    Raises:
+        LookupError: if one of ``incident_ids`` does not exist.
+    """
+    if incident_ids is None:
+        return [
+            incident
+            for incident in incident_store.list_incidents()
+            if needs_triage(incident)
+        ]
+    incidents = []
+    for incident_id in dict.fromkeys(incident_ids):
+        incident = incident_store.load_incident(incident_id)
+        if incident is None:
+            raise LookupError(f"Incident {incident_id} not found")
+        incidents.append(incident)
+    return incidents
+
+
+class ReasoningPipeline:
+    """
+    Runs the investigator -> policy -> summarizer flow for an incident.
+
+    Shared by the local client and the control plane so both execute the
+    same reasoning steps and write the same timeline/history records.
+    """
+
+    def __init__(
+        self,
+        reasoners: Dict[AgentRole, AIReasoner],
+        policy: Optional[ReasoningPolicy] = None,
+        summary_mode: Optional[str] = None,
+        context: Optional[ContextBuilder] = None,
+    ) -> None:
+        self.reasoners = reasoners
+        self.policy = policy or ReasoningPolicy()
+        self.context = context or ContextBuilder()
+
+        mode = (
+            summary_mode
+            or os.getenv("JUDICOR_SUMMARY_MODE", DEFAULT_SUMMARY_MODE)
+        ).lower()
+        if mode not in ("background", "sync"):
+            raise ValueError(f"Unknown summary mode: {mode}")
+        # Background mode takes the summarizer round trip off the ask path
+        self.summaries: Optional[SummaryScheduler] = (
+            SummaryScheduler(self.summarize) if mode == "background" else None
+        )
+
+    def ask(
+        self,
+        incident: Incident,
+        question: str,
+        on_chunk: Optional[ChunkCallback] = None,
+    ) -> AskResult:
+        """
+        Answer a question; with ``on_chunk`` the investigator's answer is
+        streamed as it is generated. The policy can only judge the
+        complete answer, so a failed result after streamed chunks means
+        the streamed text is withdrawn; callers must say so.
+        """
+        if incident.state == IncidentState.ACTIVE:
+            try:
+                incident_store.update_state(
+                    incident, IncidentState.INVESTIGATING
+                )
+                timeline_store.append_event(
+                    incident.id,
+                    "state_change",
+                    "Incident moved to investigating",
+                )
+            except ValueError:
+                pass
+
+        investigator = self.reasoners[AgentRole.INVESTIGATOR]
+        # Cached per question and incident version, not per rendered
+        # context, which this very ask is about to extend
+        prompt = KeyedPrompt(
+            self.context.build(
+                incident,
+                question,
+                role=AgentRole.INVESTIGATOR,
+                sections=RETRIEVAL_SECTIONS,
+            ).text,
+            cache_basis=question,
+        )
+        if on_chunk is None:
+            raw_result = investigator.ask(incident, prompt)
+        else:
+            raw_result = investigator.ask_stream(incident, prompt, on_chunk)
+        timeline_store.append_event(
+            incident.id,
+            "ask",
+            f"Asked AI: {question}",
+        )
+
+        evaluated = self.policy.evaluate(raw_result)
+        history_store.append_entry(
+            incident.id,
+            AgentRole.INVESTIGATOR,
+            evaluated.answer or evaluated.message or "",
+        )
+
+        if self.summaries is not None:
+            self.summaries.schedule(incident)
+        else:
+            self.summarize(incident)
+        return evaluated
+
+    def triage(self, incidents: Sequence[Incident]) -> List[AskResult]:
+        """
+        Run the analyzer over ``incidents``, batching up to
+        `JUDICOR_TRIAGE_BATCH_SIZE` of them per reasoner call, and record
+        each analysis as the incident's first history entry and summary.
+        Returns one result per incident, in order.
+        """
+        analyzer = self.reasoners[AgentRole.ANALYZER]
+        results: List[AskResult] = []
+        for batch in chunked(list(incidents), get_batch_size()):
+            items = [
+                (
+                    incident,
+                    self.context.build(
+                        incident,
+                        f"Analyze newly created incident {incident.title}",
+                        role=AgentRole.ANALYZER,
+                        sections=("similar",),
+                    ).text,
+                )
+                for incident in batch
+            ]
+            analyses = [
+                # Skipped by the batched reply: ask again, limits included
+                analyzer.ask(incident, question)
+                if not result.success and result.message == ITEM_MISSING
+                else result
+                for (incident, question), result in zip(
+                    items, analyzer.ask_batch(items)
+                )
+            ]
+            for incident, analysis in zip(batch, analyses):
+                if analysis.success and analysis.answer:
+                    covered = history_store.append_entry(
+                        incident.id, AgentRole.ANALYZER, analysis.answer
+                    )
+                    history_store.set_summary(
+                        incident.id, analysis.answer, covered=covered
+                    )
+                    timeline_store.append_event(
+                        incident.id,
+                        "analysis",
+                        "Initial analysis generated",
+                    )
+                results.append(analysis)
+        return results
+
+    def summarize(self, incident: Incident) -> None:
+        """
+        Fold history entries the summary checkpoint does not cover yet
+        into the summary, one bounded chunk per summarizer call, so an
+        interrupted run or a new model resumes where the last one
+        stopped instead of replaying everything.
+        """
+        summarizer = self.reasoners[AgentRole.SUMMARIZER]
+        checkpoint = history_store.load_checkpoint(incident.id)
+        covered = checkpoint.covered if checkpoint else 0
+        pending = history_store.entries_since(incident.id, covered)
+        max_entries, max_tokens = get_chunk_limits()
+
+        updated = False
+        for chunk in chunk_entries(pending, max_entries, max_tokens):
+            entries = "\n".join(format_entry(entry) for entry in chunk)
+            # The previous summary is added by the context builder
+            summary_prompt = self.context.build(
+                incident,
+                f"Update summary with new history entries:\n{entries}",
+                role=AgentRole.SUMMARIZER,
+                sections=("summary",),
+            ).text
+            summary_result = summarizer.ask(incident, summary_prompt)
+            if not (summary_result.success and summary_result.answer):
+                # Keep the checkpoint; the next run retries this chunk
+                break
+            covered += len(chunk)
+            if not history_store.set_summary(
+                incident.id, summary_result.answer, covered=covered
+            ):
+                # A newer summary (e.g. the resolution) got there first
+                break
+            updated = True
+
+        if updated:
+            timeline_store.append_event(
+                incident.id,
+                "summary",
+                "Incident summary updated",
+            )
+
+    def flush(self) -> None:
+        """Wait for any deferred summary work to be written."""
+        if self.summaries is not None:
+            self.summaries.flush()
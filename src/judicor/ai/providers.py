@@ -0,0 +1,32 @@
+# src/judicor/ai/providers.py
+
+"""
+Process-wide registry of provider SDK clients.
+
+Reasoners for every AgentRole share one client (and so one connection
+pool and TLS session) per provider, created on first use.
+"""
+
+import threading
+from typing import Any, Callable, Dict
+
+_clients: Dict[str, Any] = {}
+_lock = threading.Lock()
+
+
+def get_shared_client(name: str, factory: Callable[[], Any]) -> Any:
+    client = _clients.get(name)
+    if client is not None:
+        return client
+    with _lock:
+        client = _clients.get(name)
+        if client is None:
+            client = factory()
+            _clients[name] = client
+        return client
+
+
+def reset_shared_clients() -> None:
+    """Forget all clients (tests, or after changing credentials)."""
+    with _lock:
+        _clients.clear()
@@ -0,0 +1,379 @@
+# src/judicor/ai/similar.py
+
+"""
+Similar-incident retrieval over resolved incidents.
+
+A BM25-weighted TF-IDF inverted index kept in memory and persisted as
+an append-only JSON-lines log under ``BASE_DIR``. Resolving an incident
+appends one record, and other processes pick it up by reading the log
+from the offset they last saw; re-resolving appends a newer record,
+and the log is compacted once superseded records dominate it. A query
+only scores documents on the postings of its own terms, capped per term
+by champion lists, so its cost stays bounded as the corpus grows.
+"""
+
+import heapq
+import json
+import math
+import os
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from judicor.domain.models import IncidentState
+from judicor.observability.metrics import REGISTRY
+from judicor.session import history_store, incident_store
+from judicor.session.utils import ensure_dir, file_lock
+
+BASE_DIR = Path.home() / ".judicor" / "index"
+
+DEFAULT_TOP_K = 3
+# Terms kept per document, by frequency; bounds postings and log size
+MAX_TERMS_PER_DOC = 64
+# Postings scored per query term; common terms only score the
+# documents where they weigh most (champion lists)
+CHAMPIONS_PER_TERM = 1000
+MAX_HISTORY_ENTRIES = 20
+SNIPPET_CHARS = 200
+# Compact the log once it holds this many times more records than
+# documents (and at least COMPACT_MIN_RECORDS records)
+COMPACT_RATIO = 2
+COMPACT_MIN_RECORDS = 100
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+STOPWORDS = frozenset(
+    """
+    a an and are as at be been but by for from has have in is it its of on
+    or that the this to was were will with not no into after before than
+    then there their they we our you your he she his her them which who
+    """.split()
+)
+
+SIMILAR_QUERY_DURATION = REGISTRY.histogram(
+    "judicor_similar_query_duration_seconds",
+    "Similar-incident index query latency in seconds.",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25),
+)
+
+_WORD_RE = re.compile(r"[a-z0-9][a-z0-9_\-]*[a-z0-9]|[a-z0-9]")
+
+
+def tokenize(text: str) -> List[str]:
+    return [
+        word
+        for word in _WORD_RE.findall(text.lower())
+        if len(word) > 1 and word not in STOPWORDS
+    ]
+
+
+def get_top_k() -> int:
+    raw = os.getenv("JUDICOR_SIMILAR_TOP_K")
+    try:
+        return int(raw) if raw else DEFAULT_TOP_K
+    except ValueError:
+        return DEFAULT_TOP_K
+
+
+@dataclass
+class SimilarIncident:
+    incident_id: int
+    title: str
+    snippet: str
+    score: float
+
+
+def _index_path() -> Path:
+    return BASE_DIR / "similar.jsonl"
+
+
+class SimilarIndex:
+    """In-memory inverted index mirroring the on-disk log."""
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._clear()
+
+    def _clear(self) -> None:
+        self.titles: Dict[int, str] = {}
+        self.snippets: Dict[int, str] = {}
+        self.terms: Dict[int, Dict[str, int]] = {}
+        self.lengths: Dict[int, int] = {}
+        self.postings: Dict[str, Dict[int, int]] = {}
+        # Min-heaps of (tf, -length, id) for terms with long postings
+        self._champions: Dict[str, list] = {}
+        self.total_length = 0
+        # Position in the log read so far, and which file it was
+        self._offset = 0
+        self._inode = 0
+        # Records read from that file, superseded ones included
+        self.records = 0
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def needs_compaction(self) -> bool:
+        """True once superseded records make up most of the log."""
+        return (
+            self.records >= COMPACT_MIN_RECORDS
+            and self.records > COMPACT_RATIO * len(self.terms)
+        )
+
+    def add(
+        self, incident_id: int, title: str, text: str, snippet: str = ""
+    ) -> None:
+        """Index (or replace) one document."""
+        counts = Counter(tokenize(f"{title}\n{text}"))
+        terms = dict(counts.most_common(MAX_TERMS_PER_DOC))
+        with self._lock:
+            self._remove(incident_id)
+            self.titles[incident_id] = title
+            self.snippets[incident_id] = snippet
+            self.terms[incident_id] = terms
+            length = sum(terms.values())
+            self.lengths[incident_id] = length
+            self.total_length += length
+            for term, tf in terms.items():
+                self.postings.setdefault(term, {})[incident_id] = tf
+                champions = self._champions.get(term)
+                if champions is None:
+                    continue
+                key = (tf, -length, incident_id)
+                if len(champions) < CHAMPIONS_PER_TERM:
+                    heapq.heappush(champions, key)
+                elif key > champions[0]:
+                    heapq.heapreplace(champions, key)
+
+    def _remove(self, incident_id: int) -> None:
+        old = self.terms.pop(incident_id, None)
+        if old is None:
+            return
+        self.total_length -= self.lengths.pop(incident_id, 0)
+        for term in old:
+            # Rebuilt on the next query that needs it
+            self._champions.pop(term, None)
+            docs = self.postings.get(term)
+            if docs is not None:
+                docs.pop(incident_id, None)
+                if not docs:
+                    del self.postings[term]
+
+    def _candidates(self, term: str, docs: Dict[int, int]) -> Iterable[int]:
+        """Documents worth scoring for ``term``: all, or its champions."""
+        if len(docs) <= CHAMPIONS_PER_TERM:
+            return docs
+        champions = self._champions.get(term)
+        if champions is None:
+            champions = self._build_champions(term, docs)
+        return [key[2] for key in champions]
+
+    def _build_champions(self, term: str, docs: Dict[int, int]) -> list:
+        lengths = self.lengths
+        champions = heapq.nlargest(
+            CHAMPIONS_PER_TERM,
+            ((tf, -lengths[d], d) for d, tf in docs.items()),
+        )
+        heapq.heapify(champions)
+        self._champions[term] = champions
+        return champions
+
+    def build_champions(self) -> None:
+        """Build missing champion lists now rather than on first query."""
+        with self._lock:
+            for term, docs in self.postings.items():
+                if (
+                    len(docs) > CHAMPIONS_PER_TERM
+                    and term not in self._champions
+                ):
+                    self._build_champions(term, docs)
+
+    def query(
+        self,
+        text: str,
+        k: int = DEFAULT_TOP_K,
+        exclude: Iterable[int] = (),
+    ) -> List[SimilarIncident]:
+        with SIMILAR_QUERY_DURATION.time(), self._lock:
+            count = len(self.terms)
+            if not count or k <= 0:
+                return []
+            average = self.total_length / count
+            lengths = self.lengths
+            weighted = []
+            candidates = set()
+            for term in set(tokenize(text)):
+                docs = self.postings.get(term)
+                if not docs:
+                    continue
+                df = len(docs)
+                idf = math.log(1 + (count - df + 0.5) / (df + 0.5))
+                weighted.append((idf, docs))
+                candidates.update(self._candidates(term, docs))
+            candidates.difference_update(exclude)
+
+            scores: Dict[int, float] = {}
+            for incident_id in candidates:
+                norm = BM25_K1 * (
+                    1 - BM25_B + BM25_B * lengths[incident_id] / average
+                )
+                score = 0.0
+                for idf, docs in weighted:
+                    tf = docs.get(incident_id)
+                    if tf:
+                        score += idf * tf * (BM25_K1 + 1) / (tf + norm)
+                scores[incident_id] = score
+            best = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+            return [
+                SimilarIncident(
+                    incident_id=incident_id,
+                    title=self.titles[incident_id],
+                    snippet=self.snippets[incident_id],
+                    score=score,
+                )
+                for incident_id, score in best
+            ]
+
+    def refresh(self) -> None:
+        """Apply records appended to the log since the last read."""
+        path = _index_path()
+        with self._lock:
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                return
+            if stat.st_ino != self._inode:
+                # First read, or the log was rebuilt; start over
+                self._clear()
+                self._inode = stat.st_ino
+            if stat.st_size == self._offset:
+                return
+            with open(path, "rb") as f:
+                f.seek(self._offset)
+                data = f.read()
+            # Only whole lines; a concurrent append may be mid-write
+            end = data.rfind(b"\n") + 1
+            for line in data[:end].splitlines():
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                self.records += 1
+                self.add(
+                    int(record["id"]),
+                    record.get("title", ""),
+                    record.get("text", ""),
+                    record.get("snippet", ""),
+                )
+            self._offset += end
+            self.build_champions()
+
+
+_index = SimilarIndex()
+
+
+def get_index() -> SimilarIndex:
+    """Process-wide index, backfilled from resolved incidents if new."""
+    if not _index_path().exists():
+        rebuild()
+    _index.refresh()
+    if _index.needs_compaction():
+        compact()
+        _index.refresh()
+    return _index
+
+
+def reset() -> None:
+    global _index
+    _index = SimilarIndex()
+
+
+def _document(incident_id: int) -> Optional[dict]:
+    incident = incident_store.load_incident(incident_id)
+    if incident is None:
+        return None
+    summary = history_store.load_summary(incident_id) or ""
+    history = history_store.load_history(incident_id)[-MAX_HISTORY_ENTRIES:]
+    text = "\n".join([summary] + [entry.content for entry in history])
+    return {
+        "id": incident.id,
+        "title": incident.title,
+        "text": text,
+        "snippet": " ".join(summary.split())[:SNIPPET_CHARS],
+    }
+
+
+def index_incident(incident_id: int) -> None:
+    """Append a resolved incident to the index log."""
+    path = _index_path()
+    if not path.exists():
+        # The backfill covers this incident too
+        rebuild()
+        return
+    record = _document(incident_id)
+    if record is None:
+        return
+    ensure_dir(BASE_DIR)
+    with file_lock(path):
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+
+
+def rebuild() -> int:
+    """Rewrite the log from every resolved incident; return the count."""
+    path = _index_path()
+    ensure_dir(BASE_DIR)
+    # Collected under the lock: an append made meanwhile would otherwise
+    # be replaced away with the old log
+    with file_lock(path):
+        records = []
+        for incident in incident_store.list_incidents():
+            if incident.state != IncidentState.RESOLVED:
+                continue
+            record = _document(incident.id)
+            if record is not None:
+                records.append(json.dumps(record))
+        _replace_log(path, records)
+    return len(records)
+
+
+def compact() -> int:
+    """Drop superseded records from the log; return the records kept."""
+    path = _index_path()
+    with file_lock(path):
+        try:
+            with open(path, encoding="utf-8") as f:
+                lines = f.read().splitlines()
+        except FileNotFoundError:
+            return 0
+        latest: Dict[int, str] = {}
+        for line in lines:
+            try:
+                incident_id = int(json.loads(line)["id"])
+            except (ValueError, KeyError, TypeError):
+                continue
+            # Re-inserted so the log keeps the order of the latest records
+            latest.pop(incident_id, None)
+            latest[incident_id] = line
+        _replace_log(path, latest.values())
+    return len(latest)
+
+
+def _replace_log(path: Path, lines: Iterable[str]) -> None:
+    """Atomically swap in a new log; the caller holds its lock."""
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        for line in lines:
+            f.write(line + "\n")
+    os.replace(tmp, path)
+
+
+def find_similar(
+    text: str, k: Optional[int] = None, exclude: Iterable[int] = ()
+) -> List[SimilarIncident]:
+    k = get_top_k() if k is None else k
+    if k <= 0 or not text.strip():
+        return []
+    return get_index().query(text, k=k, exclude=exclude)
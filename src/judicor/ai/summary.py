@@ -0,0 +1,216 @@
+# src/judicor/ai/summary.py
+
+import atexit
+import os
+import threading
+import time
+import weakref
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from judicor.ai.context import estimate_tokens
+from judicor.domain.models import Incident
+from judicor.observability.metrics import REGISTRY
+from judicor.session.history_store import HistoryEntry
+
+DEFAULT_DEBOUNCE_SECONDS = 2.0
+# Longest a process exit waits for pending summaries
+DEFAULT_EXIT_TIMEOUT_SECONDS = 10.0
+DEFAULT_CHUNK_ENTRIES = 20
+DEFAULT_CHUNK_TOKENS = 1000
+# A busy incident is still summarized at least this often
+MAX_DELAY_FACTOR = 5
+
+SUMMARY_BATCH_SIZE = REGISTRY.histogram(
+    "judicor_summary_batch_answers",
+    "Answers folded into one background summarizer call.",
+    buckets=(1, 2, 3, 5, 10, 25, 50),
+)
+
+Summarize = Callable[[Incident], None]
+
+_schedulers: "weakref.WeakSet[SummaryScheduler]" = weakref.WeakSet()
+
+
+def get_debounce_seconds() -> float:
+    raw = os.getenv("JUDICOR_SUMMARY_DEBOUNCE_SECONDS")
+    try:
+        return float(raw) if raw else DEFAULT_DEBOUNCE_SECONDS
+    except ValueError:
+        return DEFAULT_DEBOUNCE_SECONDS
+
+
+def get_exit_timeout() -> float:
+    raw = os.getenv("JUDICOR_SUMMARY_EXIT_TIMEOUT_SECONDS")
+    try:
+        return float(raw) if raw else DEFAULT_EXIT_TIMEOUT_SECONDS
+    except ValueError:
+        return DEFAULT_EXIT_TIMEOUT_SECONDS
+
+
+def _env_int(name: str, default: int) -> int:
+    raw = os.getenv(name)
+    try:
+        return int(raw) if raw else default
+    except ValueError:
+        return default
+
+
+def get_chunk_limits() -> Tuple[int, int]:
+    """(entries, tokens) folded into one summarizer call at most."""
+    entries = _env_int("JUDICOR_SUMMARY_CHUNK_ENTRIES", DEFAULT_CHUNK_ENTRIES)
+    tokens = _env_int("JUDICOR_SUMMARY_CHUNK_TOKENS", DEFAULT_CHUNK_TOKENS)
+    return max(1, entries), tokens
+
+
+def format_entry(entry: HistoryEntry) -> str:
+    return f"- [{entry.role.value}] {entry.content}"
+
+
+def chunk_entries(
+    entries: List[HistoryEntry], max_entries: int, max_tokens: int
+) -> Iterator[List[HistoryEntry]]:
+    """
+    Split ``entries`` into consecutive chunks of at most ``max_entries``
+    entries and about ``max_tokens`` estimated tokens. An entry larger
+    than the token limit still gets a chunk of its own.
+    """
+    chunk: List[HistoryEntry] = []
+    tokens = 0
+    for entry in entries:
+        cost = estimate_tokens(format_entry(entry))
+        if chunk and (
+            len(chunk) >= max_entries or tokens + cost > max_tokens
+        ):
+            yield chunk
+            chunk, tokens = [], 0
+        chunk.append(entry)
+        tokens += cost
+    if chunk:
+        yield chunk
+
+
+@dataclass
+class _Pending:
+    incident: Incident
+    # Asks folded into this run; the answers themselves are read from
+    # the history past the summary checkpoint
+    asks: int = 0
+    due: float = 0.0
+    deadline: float = 0.0
+
+
+class SummaryScheduler:
+    """
+    Debounced, background summarizer runs.
+
+    Asks for the same incident arriving within the debounce window are
+    folded into one summarizer run. A single worker thread executes the
+    calls, so ``set_summary`` writes for an incident are applied in the
+    order the answers were produced. Pending work is flushed at process
+    exit.
+    """
+
+    def __init__(
+        self, summarize: Summarize, debounce: Optional[float] = None
+    ) -> None:
+        self.summarize = summarize
+        self.debounce = (
+            get_debounce_seconds() if debounce is None else debounce
+        )
+        self._pending: Dict[int, _Pending] = {}
+        self._active: Optional[int] = None
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        _schedulers.add(self)
+
+    def schedule(self, incident: Incident) -> None:
+        now = time.monotonic()
+        with self._cond:
+            entry = self._pending.get(incident.id)
+            if entry is None:
+                entry = _Pending(
+                    incident=incident,
+                    deadline=now + self.debounce * MAX_DELAY_FACTOR,
+                )
+                self._pending[incident.id] = entry
+            entry.incident = incident
+            entry.asks += 1
+            entry.due = min(now + self.debounce, entry.deadline)
+            self._ensure_worker()
+            self._cond.notify_all()
+
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._pending)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Run everything now; return False if ``timeout`` expired."""
+        with self._cond:
+            for entry in self._pending.values():
+                entry.due = 0.0
+            self._cond.notify_all()
+            return self._cond.wait_for(
+                lambda: not self._pending and self._active is None,
+                timeout=timeout,
+            )
+
+    def _ensure_worker(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._work, name="judicor-summary", daemon=True
+            )
+            self._thread.start()
+
+    def _next_due(self) -> Optional[_Pending]:
+        if not self._pending:
+            return None
+        return min(self._pending.values(), key=lambda e: e.due)
+
+    def _work(self) -> None:
+        while True:
+            with self._cond:
+                entry = self._next_due()
+                while entry is None or entry.due > time.monotonic():
+                    wait = None
+                    if entry is not None:
+                        wait = entry.due - time.monotonic()
+                    self._cond.wait(timeout=wait)
+                    entry = self._next_due()
+                del self._pending[entry.incident.id]
+                self._active = entry.incident.id
+
+            try:
+                SUMMARY_BATCH_SIZE.observe(entry.asks)
+                self.summarize(entry.incident)
+            except Exception:
+                # A failed summary must not kill the worker; the next ask
+                # schedules a fresh attempt.
+                pass
+            finally:
+                with self._cond:
+                    self._active = None
+                    self._cond.notify_all()
+
+
+def flush_all(timeout: Optional[float] = None) -> bool:
+    """
+    Flush every live scheduler within ``timeout`` seconds in total;
+    return False if some work was still pending when it expired.
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    done = True
+    for scheduler in list(_schedulers):
+        remaining = None
+        if deadline is not None:
+            remaining = max(0.0, deadline - time.monotonic())
+        done = scheduler.flush(timeout=remaining) and done
+    return done
+
+
+def _flush_at_exit() -> None:
+    # Bounded: a hung summarizer call must not keep the process alive
+    flush_all(timeout=get_exit_timeout())
+
+
+atexit.register(_flush_at_exit)
@@ -4,8 +4,14 @@
 CLI application for Judicor.
 """
 
+import os
+from pathlib import Path
+from typing import Callable, List, Optional, TypeVar
+
 import typer
 from judicor.client.factory import create_judicor_client
+from judicor.client.interface import JudicorClient
+from judicor.domain.messages import ANSWER_WITHDRAWN
 
 app = typer.Typer(
     name="judicor",
@@ -21,19 +27,64 @@ app = typer.Typer(
 
 _client_instance = None
 
+T = TypeVar("T")
+
+
+def _connect_daemon():
+    """
+    Forward to a running `judicor daemon` unless JUDICOR_DAEMON=0, or
+    unless it was started with other client or provider settings.
+    """
+    if os.getenv("JUDICOR_DAEMON", "1").lower() in ("0", "false", "off"):
+        return None
+    from judicor.daemon.client import DaemonConfigMismatch, connect
+    from judicor.daemon.protocol import config_fingerprint
+
+    try:
+        return connect(config=config_fingerprint())
+    except DaemonConfigMismatch as exc:
+        typer.echo(f"{exc}; running in-process.", err=True)
+        return None
+
+
+def _create_client():
+    try:
+        # using factory to create client based on env JUDICOR_CLIENT_TYPE
+        return create_judicor_client()
+    except ValueError as exc:
+        typer.echo(str(exc))
+        raise typer.Exit(code=1)
+
 
 def get_client():
     global _client_instance
     if _client_instance is None:
-        try:
-            # using factory to create client based on env JUDICOR_CLIENT_TYPE
-            _client_instance = create_judicor_client()
-        except ValueError as exc:
-            typer.echo(str(exc))
-            raise typer.Exit(code=1)
+        _client_instance = _connect_daemon()
+    if _client_instance is None:
+        _client_instance = _create_client()
     return _client_instance
 
 
+def call_client(operation: Callable[[JudicorClient], T]) -> T:
+    """
+    Run ``operation`` against the CLI client. If the request never reached
+    the daemon (it had gone away), run it again in-process. Once sent, a
+    failure is reported instead: the daemon may already have acted on it.
+    """
+    global _client_instance
+    from judicor.daemon.client import DaemonError, DaemonUnavailable
+
+    try:
+        return operation(get_client())
+    except DaemonUnavailable as exc:
+        typer.echo(f"Daemon failed ({exc}); running in-process.", err=True)
+        _client_instance = _create_client()
+        return operation(_client_instance)
+    except DaemonError as exc:
+        typer.echo(f"Daemon error: {exc}", err=True)
+        raise typer.Exit(code=1)
+
+
 # -----------------------------------------------------------------------------
 # Commands
 # -----------------------------------------------------------------------------
@@ -50,8 +101,7 @@ def init():
 @app.command("list")
 def list_incidents():
     """List all incidents."""
-    client = get_client()
-    incidents = client.list_incidents()
+    incidents = call_client(lambda client: client.list_incidents())
 
     if not incidents:
         typer.echo("No incidents found.")
@@ -68,8 +118,9 @@ def list_incidents():
 @app.command("attach")
 def attach_incident(incident_id: int):
     """Attach to an active incident session by ID."""
-    client = get_client()
-    result = client.attach_incident(incident_id)
+    result = call_client(
+        lambda client: client.attach_incident(incident_id)
+    )
 
     if result.success:
         typer.echo(f"Attached to incident {incident_id}.")
@@ -81,8 +132,7 @@ def attach_incident(incident_id: int):
 @app.command("detach")
 def detach_incident():
     """Detach from the currently attached incident session."""
-    client = get_client()
-    result = client.detach_incident()
+    result = call_client(lambda client: client.detach_incident())
 
     if result.success:
         typer.echo("Detached from incident.")
@@ -94,14 +144,39 @@ def detach_incident():
 @app.command("ask")
 def ask_ai(question: str):
     """Ask a question to the AI assistant about the current incident."""
-    client = get_client()
-    result = client.ask_ai(question)
+    streamed = False
+
+    def on_chunk(text: str) -> None:
+        nonlocal streamed
+        if not streamed:
+            streamed = True
+            typer.echo("Answer: ", nl=False)
+        typer.echo(text, nl=False)
+
+    def run(client):
+        nonlocal streamed
+        if streamed:
+            # The daemon died mid-answer; the in-process retry starts over
+            typer.echo("")
+            streamed = False
+        return client.ask_ai_stream(question, on_chunk)
+
+    # Tokens are printed as they arrive, before the reasoning policy has
+    # judged the complete answer
+    result = call_client(run)
+
+    if streamed:
+        typer.echo("")
 
     if not result.success:
-        typer.echo(f"AI could not answer: {result.message}")
+        if streamed:
+            typer.echo(ANSWER_WITHDRAWN.format(message=result.message))
+        else:
+            typer.echo(f"AI could not answer: {result.message}")
         raise typer.Exit(code=1)
 
-    typer.echo(f"Answer: {result.answer}")
+    if not streamed:
+        typer.echo(f"Answer: {result.answer}")
 
     if result.confidence is not None:
         typer.echo(f"Confidence: {result.confidence:.2f}")
@@ -113,8 +188,7 @@ def ask_ai(question: str):
 @app.command("status")
 def status_incident():
     """Check the status of the current session."""
-    client = get_client()
-    result = client.status_incident()
+    result = call_client(lambda client: client.status_incident())
 
     if result.success:
         typer.echo(f"State: {result.state}")
@@ -127,8 +201,7 @@ def status_incident():
 @app.command("context")
 def context():
     """Show current session context."""
-    client = get_client()
-    status = client.status_incident()
+    status = call_client(lambda client: client.status_incident())
 
     if not status.success:
         typer.echo("No incident attached.")
@@ -141,8 +214,7 @@ def context():
 @app.command("resolve")
 def resolve_incident():
     """Resolve the currently attached incident and close the session."""
-    client = get_client()
-    result = client.resolve_incident()
+    result = call_client(lambda client: client.resolve_incident())
 
     if result.success:
         typer.echo("Incident resolved successfully.")
@@ -154,8 +226,7 @@ def resolve_incident():
 @app.command("trigger")
 def trigger():
     """Trigger creation of a new incident session."""
-    client = get_client()
-    result = client.trigger()
+    result = call_client(lambda client: client.trigger())
 
     if result.success:
         typer.echo(f"New incident created: {result.incident_id}")
@@ -164,6 +235,162 @@ def trigger():
         raise typer.Exit(code=1)
 
 
+@app.command("triage")
+def triage(
+    incident_ids: Optional[List[int]] = typer.Argument(
+        None, help="Incidents to analyze (default: all not yet analyzed)."
+    ),
+):
+    """Analyze several incidents at once, batching reasoner calls."""
+    result = call_client(
+        lambda client: client.triage(incident_ids or None)
+    )
+
+    for incident_id, analysis in result.analyses.items():
+        if analysis is None:
+            typer.echo(f"#{incident_id}: analysis failed")
+        else:
+            typer.echo(f"#{incident_id}: {analysis}")
+    typer.echo(result.message or "")
+    if not result.success:
+        raise typer.Exit(code=1)
+
+
+@app.command("sync")
+def sync(
+    status: bool = typer.Option(
+        False, "--status", help="Only report the queued backlog."
+    ),
+):
+    """Deliver mutations queued while the control plane was unreachable."""
+    # The outbox is on this machine, so flush it from this process even
+    # when a daemon serves the other commands
+    client = _create_client()
+    if not hasattr(client, "flush_outbox"):
+        typer.echo("This client has no offline outbox.")
+        return
+
+    from judicor.session import outbox_store
+
+    backlog = client.outbox_backlog()
+    typer.echo(f"Backlog: {backlog} queued")
+    others = outbox_store.size() - backlog
+    if others:
+        typer.echo(
+            f"{others} queued for another control plane or API key "
+            "(left in place)"
+        )
+    if status or not backlog:
+        return
+
+    report = client.flush_outbox()
+    typer.echo(
+        f"Flushed {report.sent} in {report.seconds:.2f}s "
+        f"({report.throughput:.1f}/s), {report.failed} rejected, "
+        f"{report.remaining} remaining"
+    )
+    for path, question, job_id in report.asks:
+        # Queued asks were answered server-side; point at their jobs
+        typer.echo(
+            f"Delivered ask {question!r} ({path}) as job {job_id}; "
+            "its answer is added to the incident history"
+        )
+    if report.remaining:
+        raise typer.Exit(code=1)
+
+
+@app.command("daemon")
+def daemon(
+    stop: bool = typer.Option(
+        False, "--stop", help="Stop the running daemon."
+    ),
+    status: bool = typer.Option(
+        False, "--status", help="Report whether a daemon is running."
+    ),
+):
+    """Serve CLI commands from a warm, long-lived client."""
+    from judicor.daemon.client import connect
+    from judicor.daemon.server import (
+        DaemonAlreadyRunning,
+        JudicorDaemon,
+        is_running,
+    )
+
+    if status:
+        if not is_running():
+            typer.echo("Daemon is not running.")
+            raise typer.Exit(code=1)
+        typer.echo("Daemon is running.")
+        return
+
+    if stop:
+        running = connect()
+        if running is None:
+            typer.echo("Daemon is not running.")
+            raise typer.Exit(code=1)
+        running.stop_daemon()
+        typer.echo("Daemon stopped.")
+        return
+
+    try:
+        server = JudicorDaemon(create_judicor_client())
+        server.start()
+    except (ValueError, DaemonAlreadyRunning) as exc:
+        typer.echo(str(exc))
+        raise typer.Exit(code=1)
+
+    import signal
+
+    signal.signal(signal.SIGTERM, lambda *_: server.shutdown())
+    typer.echo(f"Judicor daemon listening on {server.path}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+@app.command("shell")
+def shell(
+    file: Optional[Path] = typer.Option(
+        None,
+        "--file",
+        "-f",
+        help="Run commands from a file ('-' for stdin) instead of prompting.",
+    ),
+    keep_going: bool = typer.Option(
+        False,
+        "--keep-going",
+        help="In batch mode, continue after a failing command.",
+    ),
+):
+    """Run many commands against one client, interactively or in batch."""
+    import sys
+
+    from judicor.cli.shell import run_shell
+
+    command = typer.main.get_command(app)
+
+    if file is None and sys.stdin.isatty():
+        typer.echo("Judicor shell. Type 'exit' or press Ctrl-D to leave.")
+        run_shell(command)
+        return
+
+    if file is None or str(file) == "-":
+        lines = sys.stdin.read().splitlines()
+    else:
+        try:
+            lines = file.read_text(encoding="utf-8").splitlines()
+        except OSError as exc:
+            typer.echo(f"Cannot read {file}: {exc}")
+            raise typer.Exit(code=1)
+
+    failures = run_shell(
+        command, lines, stop_on_error=not keep_going, echo=True
+    )
+    if failures:
+        raise typer.Exit(code=1)
+
+
 # -----------------------------------------------------------------------------
 # Entrypoint
 # -----------------------------------------------------------------------------
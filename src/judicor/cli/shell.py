@@ -0,0 +1,139 @@
+# src/judicor/cli/shell.py
+
+"""
+Interactive / batch shell running Judicor CLI commands in one process.
+
+Each line is parsed like a shell command line and dispatched to the
+regular Typer commands, so the client (and with it the attached
+incident, reasoner caches and HTTP connections) lives for the whole
+session instead of one process per command.
+"""
+
+import os
+import shlex
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, List, Optional
+
+import typer
+
+HISTORY_FILE = Path.home() / ".judicor" / "shell_history"
+DEFAULT_HISTORY_SIZE = 1000
+PROMPT = "judicor> "
+EXIT_WORDS = ("exit", "quit")
+# Commands that make no sense nested inside a shell session
+UNAVAILABLE = ("shell", "daemon")
+
+
+def _load_history():
+    """Enable readline history; returns a saver, or None without readline."""
+    try:
+        import readline
+    except ImportError:  # pragma: no cover - platforms without readline
+        return None
+
+    try:
+        size = int(
+            os.getenv("JUDICOR_SHELL_HISTORY_SIZE", DEFAULT_HISTORY_SIZE)
+        )
+    except ValueError:
+        size = DEFAULT_HISTORY_SIZE
+    readline.set_history_length(size)
+    try:
+        readline.read_history_file(HISTORY_FILE)
+    except (FileNotFoundError, OSError):
+        pass
+
+    def save() -> None:
+        try:
+            HISTORY_FILE.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+            readline.write_history_file(HISTORY_FILE)
+            HISTORY_FILE.chmod(0o600)
+        except OSError:
+            pass
+
+    return save
+
+
+def _prompt_lines() -> Iterator[str]:
+    while True:
+        try:
+            yield input(PROMPT)
+        except KeyboardInterrupt:
+            # Ctrl-C abandons the current line, not the session
+            typer.echo("")
+        except EOFError:
+            typer.echo("")
+            return
+
+
+def run_command(command, argv: List[str]) -> bool:
+    """Run one CLI command line; return True on success."""
+    try:
+        code = command.main(
+            args=argv, prog_name="judicor", standalone_mode=False
+        )
+    except KeyboardInterrupt:
+        typer.echo("Interrupted.", err=True)
+        return False
+    except Exception as exc:
+        show: Optional[Callable[[], None]] = getattr(exc, "show", None)
+        if show is not None:
+            show()
+        else:
+            typer.echo(f"Error: {exc}", err=True)
+        return False
+    return not code
+
+
+def run_shell(
+    command,
+    lines: Optional[Iterable[str]] = None,
+    stop_on_error: bool = False,
+    echo: bool = False,
+) -> int:
+    """
+    Execute command lines until exhausted or `exit`.
+
+    Without ``lines`` the user is prompted (with readline history).
+    Returns the number of failed commands.
+    """
+    save_history = None
+    if lines is None:
+        save_history = _load_history()
+        lines = _prompt_lines()
+
+    failures = 0
+    try:
+        for number, line in enumerate(lines, start=1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if echo:
+                typer.echo(f"{PROMPT}{line}")
+            try:
+                argv = shlex.split(line)
+            except ValueError as exc:
+                typer.echo(f"Line {number}: {exc}", err=True)
+                failures += 1
+                if stop_on_error:
+                    break
+                continue
+            if argv[0] in EXIT_WORDS:
+                break
+            if argv[0] in UNAVAILABLE:
+                typer.echo(
+                    f"'{argv[0]}' is not available inside the shell.",
+                    err=True,
+                )
+                ok = False
+            else:
+                ok = run_command(command, argv)
+            if not ok:
+                failures += 1
+                if stop_on_error:
+                    typer.echo(f"Stopped at line {number}: {line}", err=True)
+                    break
+    finally:
+        if save_history is not None:
+            save_history()
+    return failures
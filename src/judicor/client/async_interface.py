@@ -0,0 +1,90 @@
+#  src/judicor/client/async_interface.py
+
+from abc import ABC, abstractmethod
+from typing import Callable, List, Optional
+
+from judicor.domain.models import Incident
+from judicor.domain.results import (
+    Result,
+    AttachResult,
+    AskResult,
+    TriggerResult,
+    StatusResult,
+)
+
+
+class AsyncJudicorClient(ABC):
+    """
+    Asyncio variant of the JudicorClient interface.
+
+    Mirrors JudicorClient; incident-scoped calls additionally accept an
+    explicit ``incident_id`` so one client can work on many incidents
+    concurrently (e.g. under ``asyncio.gather``) without attaching.
+    Omitted, they act on the attached incident.
+    """
+
+    @abstractmethod
+    async def list_incidents(self) -> List[Incident]:
+        """List all incidents."""
+        pass
+
+    @abstractmethod
+    async def attach_incident(self, incident_id: int) -> AttachResult:
+        """Attach to an active incident session by ID."""
+        pass
+
+    @abstractmethod
+    async def detach_incident(self) -> Result:
+        """Detach from the currently attached incident session."""
+        pass
+
+    @abstractmethod
+    async def ask_ai(
+        self, question: str, incident_id: Optional[int] = None
+    ) -> AskResult:
+        """Ask the AI assistant about an incident."""
+        pass
+
+    async def ask_ai_stream(
+        self,
+        question: str,
+        on_chunk: Callable[[str], None],
+        incident_id: Optional[int] = None,
+    ) -> AskResult:
+        """
+        Ask a question, passing answer text to `on_chunk` as it arrives.
+
+        Default for non-streaming clients: one chunk with the full answer.
+        """
+        result = await self.ask_ai(question, incident_id=incident_id)
+        if result.success and result.answer:
+            on_chunk(str(result.answer))
+        return result
+
+    @abstractmethod
+    async def status_incident(
+        self, incident_id: Optional[int] = None
+    ) -> StatusResult:
+        """Check the status of an incident."""
+        pass
+
+    @abstractmethod
+    async def resolve_incident(
+        self, incident_id: Optional[int] = None
+    ) -> Result:
+        """Resolve an incident (closing the session if it was attached)."""
+        pass
+
+    @abstractmethod
+    async def trigger(self) -> TriggerResult:
+        """Trigger to create a new incident session."""
+        pass
+
+    async def aclose(self) -> None:
+        """Release transport resources."""
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
@@ -1,30 +1,55 @@
 # src/judicor/client/factory.py
 
 import os
+from typing import Union
 
+from judicor.client.async_interface import AsyncJudicorClient
 from judicor.client.interface import JudicorClient
-from judicor.client.implementations.dummy import DummyJudicorClient
-from judicor.client.implementations.http import HttpJudicorClient
 
 DEFAULT_CLIENT_TYPE = "dummy"
 
 
-def create_judicor_client() -> JudicorClient:
+def create_judicor_client(
+    asynchronous: bool = False,
+) -> Union[JudicorClient, AsyncJudicorClient]:
     """
     Factory function to create a JudicorClient instance
     based on the `JUDICOR_CLIENT_TYPE` environment variable.
 
+    Args:
+        asynchronous: Return the asyncio implementation
+            (AsyncJudicorClient) of the selected client type.
+
     Returns:
-        JudicorClient: An instance of a JudicorClient implementation.
+        JudicorClient: An instance of a JudicorClient implementation,
+            or an AsyncJudicorClient when ``asynchronous`` is set.
 
     Raises:
-        ValueError: If the specified client type is unknown.
+        ValueError: If the specified client type is unknown or has no
+            async implementation.
     """
     client_type = os.getenv("JUDICOR_CLIENT_TYPE", DEFAULT_CLIENT_TYPE).lower()
 
+    # Implementations are imported on selection so the CLI only loads the
+    # transport it uses (requests for http, the AI stack for dummy).
+    if asynchronous:
+        if client_type == "http":
+            from judicor.client.implementations.async_http import (
+                AsyncHttpJudicorClient,
+            )
+
+            return AsyncHttpJudicorClient()
+        raise ValueError(
+            f"No async Judicor client for client type: {client_type}"
+        )
+
     if client_type == "dummy":
+        from judicor.client.implementations.dummy import DummyJudicorClient
+
         return DummyJudicorClient()
     if client_type == "http":
+        from judicor.client.implementations.http import HttpJudicorClient
+
         return HttpJudicorClient()
     else:
         raise ValueError(f"Unknown Judicor client type: {client_type}")
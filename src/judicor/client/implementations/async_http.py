@@ -0,0 +1,252 @@
+# src/judicor/client/implementations/async_http.py
+
+import asyncio
+import json
+import time
+import uuid
+from typing import Callable, List, Optional
+
+import httpx
+
+from judicor.client.async_interface import AsyncJudicorClient
+from judicor.client.implementations.http_base import (
+    ASK_POLL_INTERVAL,
+    ASK_POLL_MAX_INTERVAL,
+    HttpClientBase,
+)
+from judicor.domain import encoding
+from judicor.domain.messages import NO_INCIDENT_ATTACHED
+from judicor.domain.models import Incident, IncidentState
+from judicor.domain.results import (
+    Result,
+    AttachResult,
+    AskResult,
+    TriggerResult,
+    StatusResult,
+)
+
+
+class AsyncHttpJudicorClient(HttpClientBase, AsyncJudicorClient):
+    """
+    Asyncio HTTP client for the control plane on one httpx.AsyncClient.
+
+    All calls share a single pool of HTTP/1.1 keep-alive connections
+    (``JUDICOR_HTTP_POOL_SIZE``); timeouts, retries and debug output
+    follow the same settings as HttpJudicorClient.
+    """
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        api_key: Optional[str] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self._configure(base_url, api_key)
+        self.client = httpx.AsyncClient(
+            base_url=self.base_url,
+            transport=transport,
+            timeout=httpx.Timeout(
+                self.read_timeout, connect=self.connect_timeout
+            ),
+            limits=httpx.Limits(
+                max_connections=self.pool_size,
+                max_keepalive_connections=(
+                    self.pool_size if self.keep_alive else 0
+                ),
+            ),
+        )
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+    async def _request(self, method: str, path: str, **kwargs):
+        """Async counterpart of HttpJudicorClient._request."""
+        start = time.perf_counter()
+        attempt = 0
+        while True:
+            try:
+                resp = await self.client.request(method, path, **kwargs)
+            except httpx.TransportError as exc:
+                delay = self._retry_delay(
+                    method, path, attempt, self.retries, start, error=exc
+                )
+                if delay is None:
+                    raise
+            else:
+                delay = self._retry_delay(
+                    method, path, attempt, self.retries, start, resp=resp
+                )
+                if delay is None:
+                    resp.raise_for_status()
+                    return resp
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def _get(self, path: str):
+        headers = self._headers()
+        headers["Accept"] = self.accept
+        resp = await self._request("GET", path, headers=headers)
+        return encoding.decode(resp.content, resp.headers.get("content-type"))
+
+    async def _post(self, path: str, json=None, idempotency_key=None):
+        headers = self._headers()
+        headers["Idempotency-Key"] = idempotency_key or uuid.uuid4().hex
+        resp = await self._request(
+            "POST", path, json=json or {}, headers=headers
+        )
+        return resp.json()
+
+    async def _wait_for_job(self, job_id: str) -> dict:
+        deadline = time.monotonic() + self.ask_timeout
+        interval = ASK_POLL_INTERVAL
+        while True:
+            data = await self._get(f"/jobs/{job_id}")
+            if data["status"] in ("succeeded", "failed"):
+                return data
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"AI job {job_id} did not finish in time")
+            await asyncio.sleep(interval)
+            interval = min(interval * 2, ASK_POLL_MAX_INTERVAL)
+
+    async def _stream_job(
+        self, job_id: str, on_chunk: Callable[[str], None]
+    ) -> dict:
+        timeout = httpx.Timeout(self.ask_timeout, connect=self.connect_timeout)
+        async with self.client.stream(
+            "GET",
+            f"/jobs/{job_id}/stream",
+            headers=self._headers(),
+            timeout=timeout,
+        ) as resp:
+            resp.raise_for_status()
+            event = None
+            async for line in resp.aiter_lines():
+                if line.startswith("event:"):
+                    event = line[len("event:"):].strip()
+                elif line.startswith("data:"):
+                    data = json.loads(line[len("data:"):])
+                    if event == "token":
+                        on_chunk(data["text"])
+                    elif event == "result":
+                        return data
+        raise RuntimeError(f"Stream for AI job {job_id} ended early")
+
+    def _target(self, incident_id: Optional[int]) -> Optional[int]:
+        if incident_id is not None:
+            return incident_id
+        return self.current_incident
+
+    # ------------------------------------------------------------------
+    # Interface implementation
+    # ------------------------------------------------------------------
+    async def list_incidents(self) -> List[Incident]:
+        data = await self._get("/incidents")
+        return [
+            Incident(
+                id=item["id"],
+                title=item["title"],
+                state=IncidentState(item["state"]),
+            )
+            for item in data
+        ]
+
+    async def attach_incident(self, incident_id: int) -> AttachResult:
+        try:
+            await self._get(f"/incidents/{incident_id}?fields=id")
+        except Exception as exc:
+            return AttachResult(success=False, message=str(exc))
+
+        self.current_incident = incident_id
+        return AttachResult(success=True, incident_id=incident_id)
+
+    async def detach_incident(self) -> Result:
+        if self.current_incident is None:
+            return Result(success=False, message=NO_INCIDENT_ATTACHED)
+
+        self.current_incident = None
+        return Result(success=True, message="Detached successfully")
+
+    async def ask_ai(
+        self, question: str, incident_id: Optional[int] = None
+    ) -> AskResult:
+        target = self._target(incident_id)
+        if target is None:
+            return AskResult(success=False, message=NO_INCIDENT_ATTACHED)
+
+        try:
+            job = await self._post(
+                f"/incidents/{target}/ask", json={"question": question}
+            )
+            data = await self._wait_for_job(job["job_id"])
+        except Exception as exc:
+            return AskResult(success=False, message=str(exc))
+
+        return self._job_to_result(data)
+
+    async def ask_ai_stream(
+        self,
+        question: str,
+        on_chunk: Callable[[str], None],
+        incident_id: Optional[int] = None,
+    ) -> AskResult:
+        target = self._target(incident_id)
+        if target is None:
+            return AskResult(success=False, message=NO_INCIDENT_ATTACHED)
+
+        try:
+            job = await self._post(
+                f"/incidents/{target}/ask", json={"question": question}
+            )
+            data = await self._stream_job(job["job_id"], on_chunk)
+        except Exception as exc:
+            return AskResult(success=False, message=str(exc))
+
+        return self._job_to_result(data)
+
+    async def status_incident(
+        self, incident_id: Optional[int] = None
+    ) -> StatusResult:
+        target = self._target(incident_id)
+        if target is None:
+            return StatusResult(
+                success=False,
+                state="none",
+                summary=NO_INCIDENT_ATTACHED,
+            )
+
+        try:
+            data = await self._get(
+                f"/incidents/{target}?fields=state,summary"
+            )
+            return StatusResult(
+                success=True,
+                state=data["state"],
+                summary=data.get("summary", ""),
+            )
+        except Exception as exc:
+            return StatusResult(success=False, state="none", summary=str(exc))
+
+    async def resolve_incident(
+        self, incident_id: Optional[int] = None
+    ) -> Result:
+        target = self._target(incident_id)
+        if target is None:
+            return Result(success=False, message=NO_INCIDENT_ATTACHED)
+
+        try:
+            await self._post(f"/incidents/{target}/resolve", json={})
+            return Result(success=True, message="Incident resolved remotely")
+        except Exception as exc:
+            return Result(success=False, message=str(exc))
+
+    async def trigger(self) -> TriggerResult:
+        try:
+            data = await self._post(
+                "/incidents", json={"title": "New Incident"}
+            )
+            return TriggerResult(success=True, incident_id=data["id"])
+        except Exception as exc:
+            return TriggerResult(success=False, message=str(exc))
@@ -1,7 +1,12 @@
-from typing import Optional, List
+from typing import Callable, Dict, Optional, List, Sequence
 
+from judicor.ai import similar
 from judicor.ai.interface import AIReasoner
-from judicor.ai.factory import create_ai_reasoner
+from judicor.ai.pipeline import (
+    ReasoningPipeline,
+    build_reasoners,
+    triage_candidates,
+)
 from judicor.ai.policy import ReasoningPolicy
 from judicor.ai.roles import AgentRole
 from judicor.client.interface import JudicorClient
@@ -14,13 +19,13 @@ from judicor.session.store import (
     clear_session,
 )
 from judicor.domain.models import Incident, IncidentState
-from judicor.domain.state import transition_incident_state
-from judicor.domain.messages import NO_INCIDENT_ATTACHED
+from judicor.domain.messages import NO_INCIDENT_ATTACHED, TRIAGED
 from judicor.domain.results import (
     Result,
     AttachResult,
     AskResult,
     TriggerResult,
+    TriageResult,
     StatusResult,
 )
 
@@ -36,38 +41,60 @@ class DummyJudicorClient(JudicorClient):
         reasoner: Optional[AIReasoner] = None,
         policy: Optional[ReasoningPolicy] = None,
     ) -> None:
-        self.reasoners = self._init_reasoners(reasoner)
+        # Construction stays O(1): reasoners are created on first use,
+        # the incident map is loaded on first access and seeding waits
+        # for the first command that reads or creates incidents.
+        self.reasoners = build_reasoners(reasoner)
         self.policy = policy or ReasoningPolicy()
+        self.pipeline = ReasoningPipeline(self.reasoners, self.policy)
 
-        # In-memory incidents store (dummy backend)
-        stored = incident_store.list_incidents()
-        if stored:
-            self.incidents = {inc.id: inc for inc in stored}
-        else:
-            self.incidents = {}
-            self._seed_incidents()
+        self._incidents: Optional[Dict[int, Incident]] = None
+        self._seeded = False
 
         # Restore session if exists
         self.current_incident: Optional[Incident] = None
+        self.reload_session()
+
+    def reload_session(self) -> None:
+        """Re-read the attached incident (long-lived hosts call this)."""
         session_info = load_session()
-        if session_info is not None:
-            attached_id, _ = session_info
-            self.current_incident = self.incidents.get(attached_id)
+        if session_info is None:
+            self.current_incident = None
+            return
+        attached_id, _ = session_info
+        self.current_incident = incident_store.load_incident(attached_id)
+
+    @property
+    def incidents(self) -> Dict[int, Incident]:
+        """In-memory incidents store (dummy backend), loaded on access."""
+        if self._incidents is None:
+            self._ensure_seeded()
+            if self._incidents is None:
+                self._incidents = {
+                    inc.id: inc for inc in incident_store.list_incidents()
+                }
+        return self._incidents
+
+    @incidents.setter
+    def incidents(self, value: Dict[int, Incident]) -> None:
+        self._incidents = value
 
     def list_incidents(self) -> List[Incident]:
         """List all incidents."""
+        self._ensure_seeded()
         incidents = incident_store.list_incidents()
         self.incidents = {inc.id: inc for inc in incidents}
         return incidents
 
     def attach_incident(self, incident_id: int) -> AttachResult:
         """Attach to an active incident session by ID."""
+        self._ensure_seeded()
         incident = incident_store.load_incident(incident_id)
         if not incident:
             return AttachResult(success=False, message="Incident not found")
 
         self.current_incident = incident
-        self.incidents[incident_id] = incident
+        self._remember(incident)
         save_attached_incident(incident_id)
         timeline_store.append_event(
             incident_id, "attached", f"Attached to incident {incident_id}"
@@ -102,57 +129,22 @@ class DummyJudicorClient(JudicorClient):
         if self.current_incident is None:
             return AskResult(success=False, message=NO_INCIDENT_ATTACHED)
 
-        if self.current_incident.state == IncidentState.ACTIVE:
-            try:
-                transition_incident_state(
-                    self.current_incident, IncidentState.INVESTIGATING
-                )
-                self._persist_incident(self.current_incident)
-                timeline_store.append_event(
-                    self.current_incident.id,
-                    "state_change",
-                    "Incident moved to investigating",
-                )
-            except ValueError:
-                pass
-
-        investigator = self.reasoners[AgentRole.INVESTIGATOR]
-        raw_result = investigator.ask(self.current_incident, question)
-        timeline_store.append_event(
-            self.current_incident.id,
-            "ask",
-            f"Asked AI: {question}",
-        )
+        result = self.pipeline.ask(self.current_incident, question)
+        self._remember(self.current_incident)
+        return result
 
-        evaluated = self.policy.evaluate(raw_result)
-        history_store.append_entry(
-            self.current_incident.id,
-            AgentRole.INVESTIGATOR,
-            evaluated.answer or evaluated.message or "",
-        )
+    def ask_ai_stream(
+        self, question: str, on_chunk: Callable[[str], None]
+    ) -> AskResult:
+        """Ask the AI, streaming the investigator's answer to `on_chunk`."""
+        if self.current_incident is None:
+            return AskResult(success=False, message=NO_INCIDENT_ATTACHED)
 
-        # Run summarizer to keep rolling summary small for future asks
-        summarizer = self.reasoners[AgentRole.SUMMARIZER]
-        context = history_store.load_summary(self.current_incident.id) or ""
-        summary_prompt = (
-            f"Update summary with latest answer: {evaluated.answer}\n"
-            f"Previous summary: {context}"
-        )
-        summary_result = summarizer.ask(
-            self.current_incident,
-            summary_prompt,
+        result = self.pipeline.ask(
+            self.current_incident, question, on_chunk=on_chunk
         )
-        if summary_result.success and summary_result.answer:
-            history_store.set_summary(
-                self.current_incident.id, summary_result.answer
-            )
-            timeline_store.append_event(
-                self.current_incident.id,
-                "summary",
-                "Incident summary updated",
-            )
-
-        return evaluated
+        self._remember(self.current_incident)
+        return result
 
     def status_incident(self) -> StatusResult:
         """Check the status of the current incident session."""
@@ -179,33 +171,38 @@ class DummyJudicorClient(JudicorClient):
 
         incident_id = self.current_incident.id
         try:
-            transition_incident_state(
+            incident_store.update_state(
                 self.current_incident, IncidentState.RESOLVED
             )
-            self._persist_incident(self.current_incident)
+            self._remember(self.current_incident)
+            # Bring the summary up to date so the resolver sees every
+            # finding; only entries past the checkpoint are summarized.
+            self.pipeline.flush()
+            self.pipeline.summarize(self.current_incident)
             resolver = self.reasoners[AgentRole.RESOLVER]
-            context = history_store.load_summary(incident_id) or ""
-            resolution_result = resolver.ask(
+            context = self.pipeline.context.build(
                 self.current_incident,
-                (
-                    "Provide closure and root cause. "
-                    f"Summary: {context}"
-                ),
+                "Provide closure and root cause.",
+                role=AgentRole.RESOLVER,
+            )
+            resolution_result = resolver.ask(
+                self.current_incident, context.text
             )
             if resolution_result.success and resolution_result.answer:
-                history_store.append_entry(
+                covered = history_store.append_entry(
                     incident_id,
                     AgentRole.RESOLVER,
                     resolution_result.answer,
                 )
                 history_store.set_summary(
-                    incident_id, resolution_result.answer
+                    incident_id, resolution_result.answer, covered=covered
                 )
             timeline_store.append_event(
                 incident_id,
                 "state_change",
                 "Incident resolved",
             )
+            similar.index_incident(incident_id)
         except ValueError as exc:
             return Result(success=False, message=str(exc))
 
@@ -233,53 +230,60 @@ class DummyJudicorClient(JudicorClient):
         )
 
         try:
-            transition_incident_state(incident, IncidentState.ACTIVE)
-            self._persist_incident(incident)
+            incident_store.update_state(incident, IncidentState.ACTIVE)
+            self._remember(incident)
             timeline_store.append_event(
                 incident.id,
                 "state_change",
                 "Incident moved to active",
             )
-            analyzer = self.reasoners[AgentRole.ANALYZER]
-            analysis = analyzer.ask(
-                incident,
-                f"Analyze newly created incident {incident.title}",
-            )
-            if analysis.success and analysis.answer:
-                history_store.append_entry(
-                    incident.id, AgentRole.ANALYZER, analysis.answer
-                )
-                history_store.set_summary(
-                    incident.id, analysis.answer
-                )
-                timeline_store.append_event(
-                    incident.id,
-                    "analysis",
-                    "Initial analysis generated",
-                )
+            self.pipeline.triage([incident])
         except ValueError:
             pass
 
         return TriggerResult(success=True, incident_id=incident.id)
 
+    def triage(
+        self, incident_ids: Optional[Sequence[int]] = None
+    ) -> TriageResult:
+        """Analyze incidents in batches (default: all untriaged ones)."""
+        self._ensure_seeded()
+        try:
+            incidents = triage_candidates(incident_ids)
+        except LookupError as exc:
+            return TriageResult(success=False, message=str(exc))
+
+        results = self.pipeline.triage(incidents)
+        analyses = {
+            incident.id: result.answer or None if result.success else None
+            for incident, result in zip(incidents, results)
+        }
+        analyzed = sum(answer is not None for answer in analyses.values())
+        return TriageResult(
+            success=analyzed == len(incidents),
+            message=TRIAGED.format(analyzed=analyzed, total=len(incidents)),
+            analyses=analyses,
+        )
+
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
 
+    def _remember(self, incident: Incident) -> None:
+        # Only keep an already loaded map current; never force a scan
+        if self._incidents is not None:
+            self._incidents[incident.id] = incident
+
     def _persist_incident(self, incident: Incident) -> None:
-        self.incidents[incident.id] = incident
+        self._remember(incident)
         incident_store.save_incident(incident)
 
-    def _init_reasoners(
-        self, provided: Optional[AIReasoner]
-    ) -> dict[AgentRole, AIReasoner]:
-        mapping: dict[AgentRole, AIReasoner] = {}
-        for role in AgentRole:
-            if provided is not None:
-                mapping[role] = provided
-            else:
-                mapping[role] = create_ai_reasoner(role)
-        return mapping
+    def _ensure_seeded(self) -> None:
+        if self._seeded:
+            return
+        self._seeded = True
+        if not incident_store.has_incidents():
+            self._seed_incidents()
 
     def _seed_incidents(self) -> None:
         seeds = [
@@ -295,7 +299,7 @@ class DummyJudicorClient(JudicorClient):
 
         for title, state in seeds:
             incident = incident_store.create_incident(title, state)
-            self.incidents[incident.id] = incident
+            self._remember(incident)
             timeline_store.append_event(
                 incident.id,
                 "created",
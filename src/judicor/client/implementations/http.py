@@ -1,56 +1,309 @@
+import json
 import os
-from typing import Optional, List
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Callable, Optional, List, Sequence, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from judicor.domain.models import IncidentState
 
+from judicor.client.implementations.http_base import (
+    ASK_POLL_INTERVAL,
+    ASK_POLL_MAX_INTERVAL,
+    HttpClientBase,
+    RETRYABLE_STATUSES,
+    _env_float,
+)
 from judicor.client.interface import JudicorClient
-from judicor.domain.messages import NO_INCIDENT_ATTACHED
+from judicor.domain import encoding
+from judicor.domain.messages import NO_INCIDENT_ATTACHED, QUEUED_OFFLINE
 from judicor.domain.models import Incident
 from judicor.domain.results import (
     Result,
     AttachResult,
     AskResult,
     TriggerResult,
+    TriageResult,
     StatusResult,
 )
+from judicor.session import outbox_store
+from judicor.session.utils import ensure_dir, file_lock
+
+DEFAULT_OUTBOX_BATCH_SIZE = 50
+
+
+@dataclass
+class FlushReport:
+    sent: int = 0
+    failed: int = 0
+    remaining: int = 0
+    seconds: float = 0.0
+    # (path, question, job id) of delivered asks; their answers arrive
+    # through those jobs, not through the flush
+    asks: List[Tuple[str, str, str]] = field(default_factory=list)
+
+    @property
+    def throughput(self) -> float:
+        return self.sent / self.seconds if self.seconds else 0.0
+
+
+class _TimeoutAdapter(HTTPAdapter):
+    """HTTPAdapter applying a default (connect, read) timeout."""
+
+    def __init__(self, timeout, **kwargs) -> None:
+        self.timeout = timeout
+        super().__init__(**kwargs)
 
+    def send(self, request, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        return super().send(request, **kwargs)
 
-class HttpJudicorClient(JudicorClient):
+
+class HttpJudicorClient(HttpClientBase, JudicorClient):
     """HTTP client talking to the control plane API."""
 
     def __init__(
         self, base_url: Optional[str] = None, api_key: Optional[str] = None
     ):
-        self.base_url = base_url or os.getenv(
-            "JUDICOR_API_URL", "http://localhost:8000"
+        self._configure(base_url, api_key)
+        self.timeout = (self.connect_timeout, self.read_timeout)
+        self.outbox_enabled = os.getenv("JUDICOR_OUTBOX", "1").lower() not in (
+            "0",
+            "false",
+            "off",
+        )
+        self.outbox_batch_size = int(
+            _env_float("JUDICOR_OUTBOX_BATCH_SIZE", DEFAULT_OUTBOX_BATCH_SIZE)
         )
-        self.api_key = api_key or os.getenv("JUDICOR_API_KEY", "")
-        self.session = requests.Session()
-        self.current_incident: Optional[int] = None
+        # Entries queued for another plane or API key are left alone
+        self.outbox_key_id = outbox_store.key_id(self.api_key)
+        self.outbox_target = outbox_store.target_id(
+            self.base_url, self.outbox_key_id
+        )
+        self.session = self._build_session()
 
     # ------------------------------------------------------------------
     # Helpers
     # ------------------------------------------------------------------
-    def _headers(self) -> dict:
-        if not self.api_key:
-            raise RuntimeError("JUDICOR_API_KEY is required for HTTP client")
-        return {"X-API-Key": self.api_key}
+    def _build_session(self) -> requests.Session:
+        session = requests.Session()
+        adapter = _TimeoutAdapter(
+            self.timeout,
+            pool_connections=self.pool_size,
+            pool_maxsize=self.pool_size,
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        if not self.keep_alive:
+            session.headers["Connection"] = "close"
+        return session
+
+    def _request(
+        self, method: str, path: str, retries: Optional[int] = None, **kwargs
+    ):
+        """
+        Send a request, retrying connection errors, timeouts and
+        transient statuses up to ``retries`` (default ``self.retries``)
+        times.
+
+        Only called for idempotent requests: GETs, and POSTs carrying an
+        Idempotency-Key (reused across attempts).
+        """
+        if retries is None:
+            retries = self.retries
+        send = getattr(self.session, method.lower())
+        start = time.perf_counter()
+        attempt = 0
+        while True:
+            try:
+                resp = send(f"{self.base_url}{path}", **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as exc:
+                delay = self._retry_delay(
+                    method, path, attempt, retries, start, error=exc
+                )
+                if delay is None:
+                    raise
+            else:
+                delay = self._retry_delay(
+                    method, path, attempt, retries, start, resp=resp
+                )
+                if delay is None:
+                    resp.raise_for_status()
+                    return resp
+            attempt += 1
+            time.sleep(delay)
 
     def _get(self, path: str):
-        resp = self.session.get(
-            f"{self.base_url}{path}", headers=self._headers()
+        headers = self._headers()
+        headers["Accept"] = self.accept
+        resp = self._request("GET", path, headers=headers)
+        return encoding.decode(resp.content, resp.headers.get("content-type"))
+
+    def _post(self, path: str, json=None, idempotency_key=None):
+        # Every mutation carries an Idempotency-Key so a retried request is
+        # answered from the control plane's response cache, not re-run.
+        headers = self._headers()
+        headers["Idempotency-Key"] = idempotency_key or uuid.uuid4().hex
+        resp = self._request(
+            "POST", path, json=json or {}, headers=headers
         )
-        resp.raise_for_status()
         return resp.json()
 
-    def _post(self, path: str, json=None):
-        resp = self.session.post(
-            f"{self.base_url}{path}", json=json or {}, headers=self._headers()
+    def _mutate(self, path: str, payload: dict) -> Tuple[Optional[dict], int]:
+        """
+        POST a mutation, falling back to the offline outbox.
+
+        Returns ``(response, 0)`` when delivered, or ``(None, backlog)``
+        when the control plane is unreachable and the mutation was
+        queued. While older entries are queued, new mutations are queued
+        behind them so the server sees them in order.
+        """
+        key = uuid.uuid4().hex
+        if self.outbox_enabled and self.outbox_backlog():
+            self.flush_outbox()
+            if self.outbox_backlog():
+                return None, self._enqueue(path, payload, key)
+        try:
+            return self._post(path, json=payload, idempotency_key=key), 0
+        except (requests.ConnectionError, requests.Timeout):
+            if not self.outbox_enabled:
+                raise
+            # A timed-out POST may have been applied; replaying it with
+            # the same Idempotency-Key returns the stored response.
+            return None, self._enqueue(path, payload, key)
+
+    def _enqueue(self, path: str, payload: dict, key: str) -> int:
+        outbox_store.enqueue(
+            path, payload, key, self.base_url, self.outbox_key_id
         )
-        resp.raise_for_status()
-        return resp.json()
+        return self.outbox_backlog()
+
+    def outbox_backlog(self) -> int:
+        """Mutations queued for this control plane and API key."""
+        return outbox_store.size(self.outbox_target)
+
+    def flush_outbox(self, batch_size: Optional[int] = None) -> FlushReport:
+        """
+        Deliver queued mutations oldest first, ``batch_size`` entries per
+        read of the outbox. Only entries queued for this client's
+        ``base_url`` and API key are sent. Stops at the first entry that
+        still cannot be delivered so ordering is preserved; entries the
+        server rejects outright are moved to ``outbox/failed``.
+        """
+        batch_size = batch_size or self.outbox_batch_size
+        report = FlushReport()
+        start = time.perf_counter()
+        ensure_dir(outbox_store.BASE_DIR)
+        try:
+            with file_lock(outbox_store.BASE_DIR / "flush", blocking=False):
+                self._flush_batches(batch_size, report)
+        except BlockingIOError:
+            # Another process is already flushing
+            pass
+        report.seconds = time.perf_counter() - start
+        report.remaining = self.outbox_backlog()
+        return report
+
+    def _flush_batches(self, batch_size: int, report: FlushReport) -> None:
+        while True:
+            batch = outbox_store.pending(
+                limit=batch_size, target=self.outbox_target
+            )
+            if not batch:
+                return
+            for entry in batch:
+                if (
+                    entry.base_url.rstrip("/") != self.base_url.rstrip("/")
+                    or entry.key_id != self.outbox_key_id
+                ):
+                    # Tag collision: never replay to the wrong target
+                    entry.last_error = "Queued for another plane or API key"
+                    outbox_store.dead_letter(entry)
+                    report.failed += 1
+                    continue
+                headers = self._headers()
+                headers["Idempotency-Key"] = entry.idempotency_key
+                try:
+                    resp = self._request(
+                        "POST",
+                        entry.path,
+                        retries=0,
+                        json=entry.payload,
+                        headers=headers,
+                    )
+                except requests.HTTPError as exc:
+                    status = getattr(exc.response, "status_code", None)
+                    if status in RETRYABLE_STATUSES:
+                        self._defer(entry, exc)
+                        return
+                    entry.last_error = str(exc)
+                    outbox_store.dead_letter(entry)
+                    report.failed += 1
+                except (requests.ConnectionError, requests.Timeout) as exc:
+                    self._defer(entry, exc)
+                    return
+                else:
+                    outbox_store.remove(entry.id)
+                    report.sent += 1
+                    if entry.path.endswith("/ask"):
+                        # Replays send no msgpack Accept header: JSON
+                        report.asks.append(
+                            (
+                                entry.path,
+                                entry.payload.get("question", ""),
+                                resp.json()["job_id"],
+                            )
+                        )
+
+    @staticmethod
+    def _defer(entry, exc: Exception) -> None:
+        entry.attempts += 1
+        entry.last_error = str(exc)
+        outbox_store.update(entry)
+
+    def _wait_for_job(self, job_id: str) -> dict:
+        deadline = time.monotonic() + self.ask_timeout
+        interval = ASK_POLL_INTERVAL
+        while True:
+            data = self._get(f"/jobs/{job_id}")
+            if data["status"] in ("succeeded", "failed"):
+                return data
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"AI job {job_id} did not finish in time")
+            time.sleep(interval)
+            interval = min(interval * 2, ASK_POLL_MAX_INTERVAL)
+
+    def _stream_job(
+        self, job_id: str, on_chunk: Callable[[str], None]
+    ) -> dict:
+        """Follow the job's server-sent event stream until its result."""
+        # Tokens may be far apart while the model thinks: bound the read
+        # by the ask timeout rather than the per-request read timeout.
+        resp = self._request(
+            "GET",
+            f"/jobs/{job_id}/stream",
+            headers=self._headers(),
+            stream=True,
+            timeout=(self.timeout[0], self.ask_timeout),
+        )
+
+        event = None
+        for line in resp.iter_lines():
+            if isinstance(line, bytes):
+                line = line.decode("utf-8")
+            if line.startswith("event:"):
+                event = line[len("event:"):].strip()
+            elif line.startswith("data:"):
+                data = json.loads(line[len("data:"):])
+                if event == "token":
+                    on_chunk(data["text"])
+                elif event == "result":
+                    return data
+        raise RuntimeError(f"Stream for AI job {job_id} ended early")
 
     # ------------------------------------------------------------------
     # Interface implementation
@@ -67,9 +320,9 @@ class HttpJudicorClient(JudicorClient):
         ]
 
     def attach_incident(self, incident_id: int) -> AttachResult:
-        # Ensure incident exists
+        # Ensure incident exists; the projection skips summary/timeline
         try:
-            self._get(f"/incidents/{incident_id}")
+            self._get(f"/incidents/{incident_id}?fields=id")
         except Exception as exc:
             return AttachResult(success=False, message=str(exc))
 
@@ -87,19 +340,45 @@ class HttpJudicorClient(JudicorClient):
         if self.current_incident is None:
             return AskResult(success=False, message=NO_INCIDENT_ATTACHED)
 
-        # For now delegate to timeline append + return stub; real AI call would
-        # be server-side
+        # The reasoning pipeline runs server-side as a background job;
+        # submit it and poll until it finishes.
         try:
-            self._post(
-                f"/incidents/{self.current_incident}/timeline",
-                json={"event_type": "ask", "message": question},
+            job, pending = self._mutate(
+                f"/incidents/{self.current_incident}/ask",
+                {"question": question},
             )
+            if job is None:
+                return AskResult(
+                    success=False,
+                    message=QUEUED_OFFLINE.format(pending=pending),
+                )
+            data = self._wait_for_job(job["job_id"])
         except Exception as exc:
             return AskResult(success=False, message=str(exc))
 
-        return AskResult(
-            success=True, answer="Remote AI response", confidence=1.0
-        )
+        return self._job_to_result(data)
+
+    def ask_ai_stream(
+        self, question: str, on_chunk: Callable[[str], None]
+    ) -> AskResult:
+        if self.current_incident is None:
+            return AskResult(success=False, message=NO_INCIDENT_ATTACHED)
+
+        try:
+            job, pending = self._mutate(
+                f"/incidents/{self.current_incident}/ask",
+                {"question": question},
+            )
+            if job is None:
+                return AskResult(
+                    success=False,
+                    message=QUEUED_OFFLINE.format(pending=pending),
+                )
+            data = self._stream_job(job["job_id"], on_chunk)
+        except Exception as exc:
+            return AskResult(success=False, message=str(exc))
+
+        return self._job_to_result(data)
 
     def status_incident(self) -> StatusResult:
         if self.current_incident is None:
@@ -110,7 +389,9 @@ class HttpJudicorClient(JudicorClient):
             )
 
         try:
-            data = self._get(f"/incidents/{self.current_incident}")
+            data = self._get(
+                f"/incidents/{self.current_incident}?fields=state,summary"
+            )
             return StatusResult(
                 success=True,
                 state=data["state"],
@@ -124,14 +405,37 @@ class HttpJudicorClient(JudicorClient):
             return Result(success=False, message=NO_INCIDENT_ATTACHED)
 
         try:
-            self._post(
-                f"/incidents/{self.current_incident}/resolve",
-                json={},
+            response, pending = self._mutate(
+                f"/incidents/{self.current_incident}/resolve", {}
+            )
+        except Exception as exc:
+            return Result(success=False, message=str(exc))
+
+        if response is None:
+            return Result(
+                success=False, message=QUEUED_OFFLINE.format(pending=pending)
+            )
+        return Result(success=True, message="Incident resolved remotely")
+
+    def append_timeline_event(self, event_type: str, message: str) -> Result:
+        """Add an event to the attached incident's timeline."""
+        if self.current_incident is None:
+            return Result(success=False, message=NO_INCIDENT_ATTACHED)
+
+        try:
+            response, pending = self._mutate(
+                f"/incidents/{self.current_incident}/timeline",
+                {"event_type": event_type, "message": message},
             )
-            return Result(success=True, message="Incident resolved remotely")
         except Exception as exc:
             return Result(success=False, message=str(exc))
 
+        if response is None:
+            return Result(
+                success=False, message=QUEUED_OFFLINE.format(pending=pending)
+            )
+        return Result(success=True, message="Timeline event added")
+
     def trigger(self) -> TriggerResult:
         try:
             data = self._post(
@@ -142,3 +446,31 @@ class HttpJudicorClient(JudicorClient):
             return TriggerResult(success=True, incident_id=incident_id)
         except Exception as exc:
             return TriggerResult(success=False, message=str(exc))
+
+    def triage(
+        self, incident_ids: Optional[Sequence[int]] = None
+    ) -> TriageResult:
+        payload = {}
+        if incident_ids is not None:
+            payload["incident_ids"] = list(incident_ids)
+        headers = self._headers()
+        headers["Idempotency-Key"] = uuid.uuid4().hex
+        try:
+            # Not queued offline: the analyses are the point of the call.
+            # Batches of model calls can outlast the normal read timeout.
+            resp = self._request(
+                "POST",
+                "/incidents/triage",
+                json=payload,
+                headers=headers,
+                timeout=(self.timeout[0], self.ask_timeout),
+            )
+            data = resp.json()
+        except Exception as exc:
+            return TriageResult(success=False, message=str(exc))
+
+        return TriageResult(
+            success=data.get("failed", 0) == 0,
+            message=data.get("message"),
+            analyses=data.get("analyses", {}),
+        )
@@ -0,0 +1,190 @@
+# src/judicor/client/implementations/http_base.py
+
+"""
+Transport-agnostic plumbing shared by the blocking (requests) and asyncio
+(httpx) control-plane clients. Imports neither transport, so loading one
+client does not pull in the other's library.
+"""
+
+import os
+import random
+import sys
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from judicor.domain import encoding
+from judicor.domain.results import AskResult
+
+DEFAULT_ASK_TIMEOUT = 120.0
+ASK_POLL_INTERVAL = 0.05
+ASK_POLL_MAX_INTERVAL = 1.0
+
+DEFAULT_CONNECT_TIMEOUT = 3.05
+DEFAULT_READ_TIMEOUT = 30.0
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 0.2
+DEFAULT_BACKOFF_MAX = 5.0
+# Seconds one request may spend retrying, Retry-After waits included
+DEFAULT_RETRY_BUDGET = 30.0
+DEFAULT_POOL_SIZE = 10
+# 409: same Idempotency-Key still in flight; the rest are transient
+RETRYABLE_STATUSES = (409, 429, 502, 503, 504)
+
+
+def _env_float(name: str, default: float) -> float:
+    raw = os.getenv(name)
+    try:
+        return float(raw) if raw else default
+    except ValueError:
+        return default
+
+
+@dataclass
+class RequestStats:
+    requests: int = 0
+    retries: int = 0
+    failures: int = 0
+    total_seconds: float = 0.0
+
+    def to_json(self) -> dict:
+        return {
+            "requests": self.requests,
+            "retries": self.retries,
+            "failures": self.failures,
+            "total_seconds": self.total_seconds,
+        }
+
+
+class HttpClientBase:
+    """
+    Settings, headers, backoff and request accounting shared by the
+    blocking and asyncio HTTP clients, so both follow the same
+    ``JUDICOR_*`` settings and retry policy.
+    """
+
+    def _configure(
+        self, base_url: Optional[str], api_key: Optional[str]
+    ) -> None:
+        self.base_url = str(
+            base_url or os.getenv("JUDICOR_API_URL", "http://localhost:8000")
+        )
+        self.api_key = api_key or os.getenv("JUDICOR_API_KEY", "")
+        self.current_incident: Optional[int] = None
+        self.ask_timeout = _env_float(
+            "JUDICOR_ASK_TIMEOUT", DEFAULT_ASK_TIMEOUT
+        )
+        self.connect_timeout = _env_float(
+            "JUDICOR_HTTP_CONNECT_TIMEOUT", DEFAULT_CONNECT_TIMEOUT
+        )
+        self.read_timeout = _env_float(
+            "JUDICOR_HTTP_READ_TIMEOUT", DEFAULT_READ_TIMEOUT
+        )
+        self.retries = int(_env_float("JUDICOR_HTTP_RETRIES", DEFAULT_RETRIES))
+        self.backoff = _env_float("JUDICOR_HTTP_BACKOFF", DEFAULT_BACKOFF)
+        self.backoff_max = _env_float(
+            "JUDICOR_HTTP_BACKOFF_MAX", DEFAULT_BACKOFF_MAX
+        )
+        self.retry_budget = _env_float(
+            "JUDICOR_HTTP_RETRY_BUDGET", DEFAULT_RETRY_BUDGET
+        )
+        self.pool_size = int(
+            _env_float("JUDICOR_HTTP_POOL_SIZE", DEFAULT_POOL_SIZE)
+        )
+        self.keep_alive = os.getenv(
+            "JUDICOR_HTTP_KEEP_ALIVE", "1"
+        ).lower() not in ("0", "false", "off")
+        self.debug = os.getenv("JUDICOR_DEBUG", "0").lower() in (
+            "1",
+            "true",
+            "on",
+        )
+        self.stats = RequestStats()
+        # JSON unless JUDICOR_WIRE_FORMAT=msgpack and msgpack is installed
+        self.accept = encoding.accept_header(encoding.get_wire_format())
+
+    def _headers(self) -> dict:
+        if not self.api_key:
+            raise RuntimeError("JUDICOR_API_KEY is required for HTTP client")
+        return {"X-API-Key": self.api_key}
+
+    def _backoff_delay(
+        self, attempt: int, retry_after: Optional[str] = None
+    ) -> float:
+        """
+        Exponential backoff with jitter, capped at ``backoff_max``. A
+        server's Retry-After is honoured as given, even above the cap;
+        `_retry_delay` gives up instead when it would overrun the budget.
+        """
+        if retry_after:
+            try:
+                return max(0.0, float(retry_after))
+            except ValueError:
+                pass
+        delay = self.backoff * (2 ** attempt) * random.uniform(0.5, 1.0)
+        return min(delay, self.backoff_max)
+
+    def _retry_delay(
+        self,
+        method: str,
+        path: str,
+        attempt: int,
+        retries: int,
+        start: float,
+        resp=None,
+        error: Optional[Exception] = None,
+    ) -> Optional[float]:
+        """
+        Seconds to wait before retrying after ``resp`` (or transport
+        ``error``), or None once the attempt is final; a final attempt
+        is recorded and left to the caller to raise or return.
+        """
+        delay = None
+        if error is not None:
+            outcome, ok = str(error), False
+            if attempt < retries:
+                delay = self._backoff_delay(attempt)
+        else:
+            outcome = resp.status_code
+            ok = resp.status_code < 400
+            if resp.status_code in RETRYABLE_STATUSES and attempt < retries:
+                delay = self._backoff_delay(
+                    attempt, resp.headers.get("Retry-After")
+                )
+        elapsed = time.perf_counter() - start
+        if delay is not None and elapsed + delay > self.retry_budget:
+            # Fail now rather than sleep past the point of giving up
+            delay = None
+        if delay is None:
+            self._record(method, path, outcome, attempt, start, ok)
+        return delay
+
+    def _record(self, method, path, outcome, retries, start, ok) -> None:
+        elapsed = time.perf_counter() - start
+        self.stats.requests += 1
+        self.stats.retries += retries
+        self.stats.total_seconds += elapsed
+        if not ok:
+            self.stats.failures += 1
+        if self.debug:
+            print(
+                f"[judicor] {method} {path} -> {outcome} "
+                f"in {elapsed * 1000:.1f} ms, retries={retries}",
+                file=sys.stderr,
+            )
+
+    @staticmethod
+    def _job_to_result(data: dict) -> AskResult:
+        if data["status"] != "succeeded":
+            return AskResult(
+                success=False, message=data.get("error") or "AI job failed"
+            )
+
+        result = data.get("result") or {}
+        return AskResult(
+            success=result.get("success", False),
+            message=result.get("message"),
+            answer=result.get("answer"),
+            confidence=result.get("confidence"),
+            reasoning=result.get("reasoning"),
+        )
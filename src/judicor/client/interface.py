@@ -1,11 +1,14 @@
 #  src/judicor/client/interface.py
 
 from abc import ABC, abstractmethod
+from typing import Callable, Optional, Sequence
+
 from judicor.domain.results import (
     Result,
     AttachResult,
     AskResult,
     TriggerResult,
+    TriageResult,
     StatusResult,
 )
 
@@ -20,10 +23,12 @@ class JudicorClient(ABC):
         - detach_incident: Detach from the currently attached incident session.
         - ask_ai: Ask a question to the AI assistant
             about the currently attached incident.
+        - ask_ai_stream: Like ask_ai, emitting answer text as it arrives.
         - status_incident: Check the status of the current session.
         - resolve_incident: Resolve the currently attached incident
             and close the session.
         - trigger: Trigger to create a new incident session.
+        - triage: Analyze incidents that have not been analyzed yet.
     """
 
     @abstractmethod
@@ -49,6 +54,19 @@ class JudicorClient(ABC):
         """
         pass
 
+    def ask_ai_stream(
+        self, question: str, on_chunk: Callable[[str], None]
+    ) -> AskResult:
+        """
+        Ask a question, passing answer text to `on_chunk` as it arrives.
+
+        Default for non-streaming clients: one chunk with the full answer.
+        """
+        result = self.ask_ai(question)
+        if result.success and result.answer:
+            on_chunk(str(result.answer))
+        return result
+
     @abstractmethod
     def status_incident(self) -> StatusResult:
         """Check the status of the current session."""
@@ -63,3 +81,13 @@ class JudicorClient(ABC):
     def trigger(self) -> TriggerResult:
         """Trigger to create a new incident session."""
         pass
+
+    @abstractmethod
+    def triage(
+        self, incident_ids: Optional[Sequence[int]] = None
+    ) -> TriageResult:
+        """
+        Analyze the given incidents, or every open incident without an
+        analysis, in as few reasoner calls as possible.
+        """
+        pass
@@ -0,0 +1,217 @@
+# src/judicor/control_plane/alerts.py
+
+import hashlib
+import json
+import os
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from judicor.domain.models import IncidentState
+from judicor.session import incident_store, timeline_store
+from judicor.session.utils import (
+    file_lock,
+    file_version,
+    parse_dt,
+    secure_write_json,
+)
+
+BASE_DIR = Path.home() / ".judicor" / "alerts"
+
+DEFAULT_FINGERPRINT_FIELDS = "alertname,service,severity"
+DEFAULT_DEDUP_WINDOW_SECONDS = 3600
+
+# A repeat alert only rewrites the shared file once its last-seen time
+# has moved by this much; storms of one alert then cost no writes
+SEEN_RESOLUTION = timedelta(seconds=30)
+
+OPEN_STATES = (
+    IncidentState.CREATED,
+    IncidentState.ACTIVE,
+    IncidentState.INVESTIGATING,
+)
+
+
+def get_fingerprint_fields() -> List[str]:
+    raw = os.getenv(
+        "JUDICOR_ALERT_FINGERPRINT_FIELDS", DEFAULT_FINGERPRINT_FIELDS
+    )
+    return [f.strip() for f in raw.split(",") if f.strip()]
+
+
+def get_dedup_window() -> timedelta:
+    raw = os.getenv("JUDICOR_ALERT_DEDUP_WINDOW_SECONDS")
+    try:
+        seconds = int(raw) if raw else DEFAULT_DEDUP_WINDOW_SECONDS
+    except ValueError:
+        seconds = DEFAULT_DEDUP_WINDOW_SECONDS
+    return timedelta(seconds=seconds)
+
+
+def _lookup(payload: Dict[str, Any], path: str) -> Any:
+    """Resolve a dotted path (e.g. ``labels.alertname``) in a payload."""
+    value: Any = payload
+    for part in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+def compute_fingerprint(
+    payload: Dict[str, Any], fields: Optional[List[str]] = None
+) -> str:
+    """
+    Compute a stable fingerprint for an alert payload.
+
+    Only the configured fields take part in the hash, so alerts that differ
+    in timestamps or free-text descriptions still collapse together.
+    """
+    fields = fields if fields is not None else get_fingerprint_fields()
+    material = {field: _lookup(payload, field) for field in fields}
+    raw = json.dumps(material, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def _index_path() -> Path:
+    return BASE_DIR / "index.json"
+
+
+class AlertIndex:
+    """
+    Fingerprint -> open incident index shared by all worker processes.
+
+    Each worker keeps the entries in memory and mirrors them to one small
+    JSON file under ``BASE_DIR``; a lookup only stats that file and
+    re-reads it when another worker has changed it. Hold ``locked()``
+    across match -> create -> record so two workers cannot both open an
+    incident for one fingerprint. All of this is blocking file I/O, so
+    async callers run it in a thread. The index is derived data: it is
+    rebuilt from the incident and timeline stores at startup.
+    """
+
+    def __init__(self) -> None:
+        self._entries: Dict[str, Tuple[int, datetime]] = {}
+        self._version: Optional[Tuple[int, ...]] = None
+        self._lock = threading.RLock()
+        self._depth = 0
+
+    @contextmanager
+    def locked(self) -> Iterator[None]:
+        """Exclusive access across threads and processes (re-entrant)."""
+        with self._lock:
+            self._depth += 1
+            try:
+                if self._depth > 1:
+                    yield
+                else:
+                    with file_lock(_index_path()):
+                        yield
+            finally:
+                self._depth -= 1
+
+    def rebuild(self) -> None:
+        entries: Dict[str, Tuple[int, datetime]] = {}
+        for incident in incident_store.list_incidents():
+            if not incident.fingerprint or incident.state not in OPEN_STATES:
+                continue
+            last_seen = incident.updated_at
+            events = timeline_store.load_timeline(incident.id)
+            if events:
+                last_seen = max(last_seen, events[-1].timestamp)
+            current = entries.get(incident.fingerprint)
+            if current is None or current[1] < last_seen:
+                entries[incident.fingerprint] = (incident.id, last_seen)
+
+        with self.locked():
+            self._entries = entries
+            self._save()
+
+    def clear(self) -> None:
+        with self.locked():
+            self._entries = {}
+            self._version = None
+            _index_path().unlink(missing_ok=True)
+
+    def match(
+        self,
+        fingerprint: str,
+        window: timedelta,
+        now: Optional[datetime] = None,
+    ) -> Optional[int]:
+        """Return the open incident for a fingerprint seen within window."""
+        now = now or datetime.now(timezone.utc)
+        with self.locked():
+            self._refresh()
+            entry = self._entries.get(fingerprint)
+        if entry is None:
+            return None
+        incident_id, last_seen = entry
+        if now - last_seen > window:
+            return None
+        return incident_id
+
+    def record(
+        self,
+        fingerprint: str,
+        incident_id: int,
+        seen_at: Optional[datetime] = None,
+    ) -> None:
+        seen_at = seen_at or datetime.now(timezone.utc)
+        with self.locked():
+            self._refresh()
+            current = self._entries.get(fingerprint)
+            self._entries[fingerprint] = (incident_id, seen_at)
+            if (
+                current is not None
+                and current[0] == incident_id
+                and seen_at - current[1] < SEEN_RESOLUTION
+            ):
+                return
+            self._save()
+
+    def discard_incident(self, incident_id: int) -> None:
+        with self.locked():
+            self._refresh()
+            stale = [
+                fp
+                for fp, (inc_id, _) in self._entries.items()
+                if inc_id == incident_id
+            ]
+            for fp in stale:
+                del self._entries[fp]
+            if stale:
+                self._save()
+
+    def _refresh(self) -> None:
+        """
+        Pick up changes made by other workers (under the lock).
+
+        Only a changed file version triggers a read. A missing or corrupt
+        file keeps the in-memory entries; the next save recreates it.
+        """
+        version = file_version(_index_path())
+        if version is None or version == self._version:
+            return
+        try:
+            with open(_index_path(), encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        self._entries = {
+            fp: (int(incident_id), parse_dt(seen))
+            for fp, (incident_id, seen) in data.items()
+        }
+        self._version = version
+
+    def _save(self) -> None:
+        secure_write_json(
+            _index_path(),
+            {
+                fp: [incident_id, seen.isoformat()]
+                for fp, (incident_id, seen) in self._entries.items()
+            },
+        )
+        self._version = file_version(_index_path())
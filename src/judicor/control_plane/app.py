@@ -1,33 +1,200 @@
+import asyncio
+import functools
+import json
 import os
-from fastapi import Depends, FastAPI, Header, HTTPException, status
+from contextlib import asynccontextmanager
+from typing import Dict, Optional
 
+from fastapi import Depends, FastAPI, Header, HTTPException, Request, status
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Match
+
+from judicor.control_plane.alerts import (
+    AlertIndex,
+    compute_fingerprint,
+    get_dedup_window,
+)
+from judicor.control_plane.compression import CompressionMiddleware
+from judicor.control_plane.idempotency import (
+    AUTHORIZED,
+    IdempotencyMiddleware,
+)
+from judicor.control_plane.instrumentation import MetricsMiddleware
+from judicor.control_plane.jobs import (
+    JOB_RETENTION_SECONDS,
+    JobRunner,
+    QueueFullError,
+    get_job_lease_seconds,
+)
+from judicor.control_plane.limits import (
+    ApiKeyQuota,
+    LoadSheddingMiddleware,
+    RateLimiter,
+    parse_api_keys,
+    retry_after,
+    start_sync,
+)
+from judicor.domain import encoding
+from judicor.domain.messages import TRIAGED
 from judicor.domain.models import IncidentState
+from judicor.ai import similar, summary
+from judicor.ai.pipeline import triage_candidates
 from judicor.ai.roles import AgentRole
-from judicor.session import incident_store, timeline_store, history_store
+from judicor.observability import metrics
+from judicor.session import (
+    history_store,
+    idempotency_store,
+    incident_store,
+    job_store,
+    timeline_store,
+)
+
+alert_index = AlertIndex()
+rate_limiter = RateLimiter()
+job_runner = JobRunner()
+
+# Registered here, once, so runners built elsewhere (tests, tools) never
+# take over the series this worker exports
+ASK_QUEUE_DEPTH = metrics.REGISTRY.gauge(
+    "judicor_ask_queue_depth",
+    "Ask jobs queued or running on this worker.",
+    callback=lambda: {(): float(job_runner.depth)},
+)
+
+STREAM_POLL_INTERVAL = 0.1
+
+DEFAULT_DETAIL_FIELDS = (
+    "id",
+    "title",
+    "state",
+    "created_at",
+    "updated_at",
+    "summary",
+)
+DETAIL_FIELDS = DEFAULT_DETAIL_FIELDS + ("timeline",)
+
+metrics.REGISTRY.gauge(
+    "judicor_rate_limit_tokens",
+    "Tokens left in each (client, route) rate-limit bucket.",
+    ["client", "route"],
+    callback=rate_limiter.snapshot,
+)
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    # A malformed JUDICOR_API_KEYS stops startup rather than every request
+    _get_api_keys()
+    alert_index.rebuild()
+    idempotency_store.prune()
+    job_store.prune(JOB_RETENTION_SECONDS)
+    # Jobs left queued or running by a worker that died never finish
+    job_store.fail_abandoned(get_job_lease_seconds())
+    snapshots = metrics.start_snapshots()
+    bucket_sync = start_sync(rate_limiter)
+    yield
+    bucket_sync.stop()
+    job_runner.shutdown(wait=True)
+    summary.flush_all(timeout=summary.get_exit_timeout())
+    if snapshots is not None:
+        snapshots.stop()
+
 
-app = FastAPI(title="Judicor Control Plane")
+app = FastAPI(title="Judicor Control Plane", lifespan=lifespan)
 
 
 def _get_api_key() -> str:
     return os.getenv("JUDICOR_API_KEY", "secret-key")
 
 
-async def require_api_key(x_api_key: str = Header(...)):
-    if x_api_key != _get_api_key():
+def _get_api_keys() -> Dict[str, ApiKeyQuota]:
+    return _parse_api_keys(os.getenv("JUDICOR_API_KEYS"), _get_api_key())
+
+
+@functools.lru_cache(maxsize=1)
+def _parse_api_keys(
+    raw: Optional[str], legacy_key: str
+) -> Dict[str, ApiKeyQuota]:
+    # Parsed once per configuration, not on every request
+    return parse_api_keys(raw, legacy_key)
+
+
+def negotiated_response(request: Request, data) -> Response:
+    """Render ``data`` as JSON or, if the client asks, MessagePack."""
+    media_type = encoding.negotiate(request.headers.get("accept"))
+    return Response(
+        content=encoding.encode(data, media_type),
+        media_type=media_type,
+        headers={"Vary": "Accept"},
+    )
+
+
+def _check_api_key(api_key: str, route: str) -> None:
+    quota = _get_api_keys().get(api_key)
+    if quota is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid API key",
         )
 
+    wait = rate_limiter.check(quota, route)
+    if wait:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Rate limit exceeded",
+            headers={"Retry-After": retry_after(wait)},
+        )
+
+
+async def require_api_key(request: Request, x_api_key: str = Header(...)):
+    if request.scope.get(AUTHORIZED):
+        # Checked (and counted) by IdempotencyMiddleware already
+        return
+    route = getattr(request.scope.get("route"), "path", request.url.path)
+    _check_api_key(x_api_key, route)
+
+
+def _authorize_request(scope) -> Optional[Response]:
+    """Auth and rate-limit check for middleware, before routing."""
+    route = scope.get("path", "")
+    for candidate in app.router.routes:
+        match, _ = candidate.matches(scope)
+        if match == Match.FULL:
+            route = candidate.path
+            break
+    headers = dict(scope.get("headers") or [])
+    try:
+        _check_api_key(headers.get(b"x-api-key", b"").decode("latin-1"), route)
+    except HTTPException as exc:
+        return JSONResponse(
+            {"detail": exc.detail},
+            status_code=exc.status_code,
+            headers=exc.headers,
+        )
+    return None
+
+
+# Stored responses are only replayed to keys that pass the same checks
+app.add_middleware(IdempotencyMiddleware, authorize=_authorize_request)
+# Outside the idempotency cache so replays are encoded per request
+app.add_middleware(CompressionMiddleware)
+app.add_middleware(LoadSheddingMiddleware)
+app.add_middleware(MetricsMiddleware)
+
 
 @app.get("/health")
 async def health() -> dict[str, str]:
     return {"status": "ok"}
 
 
+@app.get("/metrics")
+async def metrics_endpoint() -> Response:
+    return Response(content=metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+
 @app.get("/incidents", dependencies=[Depends(require_api_key)])
-async def list_incidents():
-    return [
+async def list_incidents(request: Request):
+    incidents = [
         {
             "id": inc.id,
             "title": inc.title,
@@ -37,6 +204,7 @@ async def list_incidents():
         }
         for inc in incident_store.list_incidents()
     ]
+    return negotiated_response(request, incidents)
 
 
 @app.post("/incidents", dependencies=[Depends(require_api_key)])
@@ -50,10 +218,7 @@ async def create_incident(payload: dict):
         incident.id, "created", f"Incident {incident.id} created"
     )
     try:
-        from judicor.domain.state import transition_incident_state
-
-        transition_incident_state(incident, IncidentState.ACTIVE)
-        incident_store.save_incident(incident)
+        incident_store.update_state(incident, IncidentState.ACTIVE)
         timeline_store.append_event(
             incident.id, "state_change", "Incident moved to active"
         )
@@ -67,53 +232,123 @@ async def create_incident(payload: dict):
     }
 
 
+@app.post("/incidents/triage", dependencies=[Depends(require_api_key)])
+async def triage_incidents(payload: dict | None = None):
+    incident_ids = (payload or {}).get("incident_ids")
+    if incident_ids is not None:
+        try:
+            incident_ids = [int(incident_id) for incident_id in incident_ids]
+        except (TypeError, ValueError):
+            raise HTTPException(
+                status_code=400, detail="incident_ids must be integers"
+            )
+    try:
+        incidents = triage_candidates(incident_ids)
+    except LookupError as exc:
+        raise HTTPException(status_code=404, detail=str(exc))
+
+    # Model round trips must not block the event loop
+    results = await asyncio.to_thread(job_runner.pipeline.triage, incidents)
+    analyses = {
+        str(incident.id): result.answer or None if result.success else None
+        for incident, result in zip(incidents, results)
+    }
+    analyzed = sum(answer is not None for answer in analyses.values())
+    return {
+        "analyses": analyses,
+        "analyzed": analyzed,
+        "failed": len(incidents) - analyzed,
+        "message": TRIAGED.format(analyzed=analyzed, total=len(incidents)),
+    }
+
+
+@app.head("/incidents/{incident_id}", dependencies=[Depends(require_api_key)])
+async def head_incident(incident_id: int):
+    # Existence check: only the incident record's path is consulted
+    if not incident_store.incident_exists(incident_id):
+        raise HTTPException(status_code=404, detail="Incident not found")
+    return Response(status_code=200)
+
+
 @app.get("/incidents/{incident_id}", dependencies=[Depends(require_api_key)])
-async def get_incident(incident_id: int):
+async def get_incident(
+    request: Request, incident_id: int, fields: Optional[str] = None
+):
+    """
+    Incident detail. ``fields`` is a comma-separated projection of
+    DETAIL_FIELDS; by default everything but the timeline is returned.
+    The summary and timeline files are only read when requested.
+    """
+    if fields is None:
+        selected = DEFAULT_DETAIL_FIELDS
+    else:
+        selected = tuple(
+            name.strip() for name in fields.split(",") if name.strip()
+        )
+        unknown = [name for name in selected if name not in DETAIL_FIELDS]
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown fields: {', '.join(unknown)}",
+            )
+
     incident = incident_store.load_incident(incident_id)
     if not incident:
         raise HTTPException(status_code=404, detail="Incident not found")
 
-    summary = history_store.load_summary(incident_id) or ""
-    timeline = [e.to_json() for e in timeline_store.load_timeline(incident_id)]
-
-    return {
-        "id": incident.id,
-        "title": incident.title,
-        "state": incident.state.value,
-        "created_at": incident.created_at.isoformat(),
-        "updated_at": incident.updated_at.isoformat(),
-        "summary": summary,
-        "timeline": timeline,
-    }
+    data = {}
+    for name in selected:
+        if name == "id":
+            data["id"] = incident.id
+        elif name == "title":
+            data["title"] = incident.title
+        elif name == "state":
+            data["state"] = incident.state.value
+        elif name == "created_at":
+            data["created_at"] = incident.created_at.isoformat()
+        elif name == "updated_at":
+            data["updated_at"] = incident.updated_at.isoformat()
+        elif name == "summary":
+            data["summary"] = history_store.load_summary(incident_id) or ""
+        elif name == "timeline":
+            data["timeline"] = [
+                e.to_json() for e in timeline_store.load_timeline(incident_id)
+            ]
+    return negotiated_response(request, data)
 
 
 @app.post(
     "/incidents/{incident_id}/resolve", dependencies=[Depends(require_api_key)]
 )
 async def resolve_incident(incident_id: int, payload: dict | None = None):
-    from judicor.domain.state import transition_incident_state
-
     incident = incident_store.load_incident(incident_id)
     if not incident:
         raise HTTPException(status_code=404, detail="Incident not found")
 
     try:
-        transition_incident_state(incident, IncidentState.RESOLVED)
-        incident_store.save_incident(incident)
+        incident_store.update_state(incident, IncidentState.RESOLVED)
         timeline_store.append_event(
             incident_id, "state_change", "Incident resolved via control plane"
         )
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc))
 
+    await asyncio.to_thread(alert_index.discard_incident, incident_id)
+    # Let deferred summaries of earlier asks land first so they cannot
+    # be mistaken for newer than the resolution (off the event loop)
+    await asyncio.to_thread(job_runner.pipeline.flush)
+
     resolution = (payload or {}).get("resolution")
     if resolution:
-        history_store.append_entry(
+        covered = history_store.append_entry(
             incident_id,
             role=AgentRole.RESOLVER,
             content=str(resolution),
         )
-        history_store.set_summary(incident_id, str(resolution))
+        history_store.set_summary(
+            incident_id, str(resolution), covered=covered
+        )
+    similar.index_incident(incident_id)
 
     return {
         "id": incident.id,
@@ -135,3 +370,125 @@ async def append_timeline(incident_id: int, payload: dict):
     message = payload.get("message", "")
     timeline_store.append_event(incident_id, event_type, message)
     return {"status": "ok"}
+
+
+@app.post("/alerts", dependencies=[Depends(require_api_key)])
+async def ingest_alert(payload: dict):
+    # Index and store access block on file locks; keep it off the loop
+    return await asyncio.to_thread(_ingest_alert, payload)
+
+
+def _ingest_alert(payload: dict) -> dict:
+    fingerprint = compute_fingerprint(payload)
+    message = str(
+        payload.get("message")
+        or payload.get("summary")
+        or payload.get("title")
+        or f"Alert {fingerprint}"
+    )
+
+    # Match and create under the shared index lock so concurrent workers
+    # cannot both open an incident for the same fingerprint
+    with alert_index.locked():
+        incident_id = alert_index.match(fingerprint, get_dedup_window())
+        if incident_id is not None:
+            alert_index.record(fingerprint, incident_id)
+        else:
+            incident = incident_store.create_incident(
+                title=str(payload.get("title") or message),
+                initial_state=IncidentState.CREATED,
+                fingerprint=fingerprint,
+            )
+            alert_index.record(fingerprint, incident.id)
+
+    if incident_id is not None:
+        timeline_store.append_event(incident_id, "alert", message)
+        return {
+            "id": incident_id,
+            "fingerprint": fingerprint,
+            "deduplicated": True,
+        }
+
+    timeline_store.append_event(
+        incident.id, "created", f"Incident {incident.id} created from alert"
+    )
+    try:
+        incident_store.update_state(incident, IncidentState.ACTIVE)
+        timeline_store.append_event(
+            incident.id, "state_change", "Incident moved to active"
+        )
+    except Exception:
+        pass
+    timeline_store.append_event(incident.id, "alert", message)
+
+    return {
+        "id": incident.id,
+        "fingerprint": fingerprint,
+        "deduplicated": False,
+    }
+
+
+@app.post(
+    "/incidents/{incident_id}/ask",
+    status_code=status.HTTP_202_ACCEPTED,
+    dependencies=[Depends(require_api_key)],
+)
+async def ask_incident(incident_id: int, payload: dict):
+    incident = incident_store.load_incident(incident_id)
+    if not incident:
+        raise HTTPException(status_code=404, detail="Incident not found")
+
+    question = str(payload.get("question") or "").strip()
+    if not question:
+        raise HTTPException(status_code=400, detail="question is required")
+
+    try:
+        job = job_runner.submit(incident_id, question)
+    except QueueFullError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(exc),
+            headers={"Retry-After": "1"},
+        )
+
+    return {"job_id": job.id, "status": job.status}
+
+
+@app.get("/jobs/{job_id}", dependencies=[Depends(require_api_key)])
+async def get_job(job_id: str):
+    job = job_store.load_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job_store.fail_if_abandoned(job, get_job_lease_seconds()).to_json()
+
+
+@app.get("/jobs/{job_id}/stream", dependencies=[Depends(require_api_key)])
+async def stream_job(job_id: str):
+    if job_store.load_job(job_id) is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    lease = get_job_lease_seconds()
+
+    async def events():
+        last_status = None
+        sent = 0
+        while True:
+            job = job_store.load_job(job_id)
+            if job is None:
+                return
+            job = job_store.fail_if_abandoned(job, lease)
+            if job.status != last_status and not job.finished:
+                last_status = job.status
+                data = json.dumps({"status": job.status})
+                yield f"event: status\ndata: {data}\n\n"
+            if len(job.partial) > sent:
+                data = json.dumps({"text": job.partial[sent:]})
+                sent = len(job.partial)
+                yield f"event: token\ndata: {data}\n\n"
+            if job.finished:
+                data = json.dumps(job.to_json())
+                yield f"event: result\ndata: {data}\n\n"
+                return
+            await asyncio.sleep(STREAM_POLL_INTERVAL)
+
+    return StreamingResponse(events(), media_type="text/event-stream")
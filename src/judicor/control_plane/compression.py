@@ -0,0 +1,144 @@
+# src/judicor/control_plane/compression.py
+
+import gzip
+import importlib.util
+import os
+from typing import Optional
+
+from judicor.observability.metrics import REGISTRY
+
+DEFAULT_MIN_BYTES = 1024
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+
+COMPRESSION_BYTES = REGISTRY.counter(
+    "judicor_http_compression_bytes_total",
+    "Response bytes before (raw) and after (encoded) compression.",
+    ["encoding", "stage"],
+)
+
+
+def zstd_available() -> bool:
+    return importlib.util.find_spec("zstandard") is not None
+
+
+def get_min_bytes() -> int:
+    raw = os.getenv("JUDICOR_COMPRESSION_MIN_BYTES")
+    try:
+        return int(raw) if raw else DEFAULT_MIN_BYTES
+    except ValueError:
+        return DEFAULT_MIN_BYTES
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Prefer zstd (when installed) over gzip; honour ``q=0``."""
+    accepted = {}
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        name, _, value = params.strip().partition("=")
+        if name == "q":
+            try:
+                quality = float(value)
+            except ValueError:
+                quality = 0.0
+        if coding:
+            accepted[coding.strip()] = quality
+    if accepted.get("zstd", 0) > 0 and zstd_available():
+        return "zstd"
+    if accepted.get("gzip", 0) > 0:
+        return "gzip"
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "zstd":
+        import zstandard
+
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(body)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+class CompressionMiddleware:
+    """
+    Plain ASGI middleware compressing single-chunk responses.
+
+    Only bodies of at least `JUDICOR_COMPRESSION_MIN_BYTES` are encoded;
+    streamed responses (more than one body message) pass through as-is
+    so job streams keep flushing chunk by chunk.
+    `JUDICOR_COMPRESSION=0` disables it.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or os.getenv(
+            "JUDICOR_COMPRESSION", "1"
+        ).lower() in ("0", "false", "off"):
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = ""
+        for name, value in scope.get("headers", []):
+            if name == b"accept-encoding":
+                accept_encoding = value.decode("latin-1")
+                break
+        encoding = choose_encoding(accept_encoding)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        min_bytes = get_min_bytes()
+        start_message = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start_message, passthrough
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            headers = list(start_message.get("headers", []))
+            already_encoded = any(
+                name == b"content-encoding" for name, _ in headers
+            )
+            if (
+                message.get("more_body", False)
+                or already_encoded
+                or len(body) < min_bytes
+            ):
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+
+            encoded = compress(body, encoding)
+            COMPRESSION_BYTES.inc(len(body), encoding=encoding, stage="raw")
+            COMPRESSION_BYTES.inc(
+                len(encoded), encoding=encoding, stage="encoded"
+            )
+            headers = [
+                (name, value)
+                for name, value in headers
+                if name not in (b"content-length", b"vary")
+            ]
+            vary = [
+                value
+                for name, value in start_message.get("headers", [])
+                if name == b"vary"
+            ]
+            vary.append(b"Accept-Encoding")
+            headers += [
+                (b"content-encoding", encoding.encode("latin-1")),
+                (b"content-length", str(len(encoded)).encode("latin-1")),
+                (b"vary", b", ".join(vary)),
+            ]
+            await send({**start_message, "headers": headers})
+            await send({**message, "body": encoded})
+
+        await self.app(scope, receive, send_wrapper)
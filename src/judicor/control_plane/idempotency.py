@@ -0,0 +1,153 @@
+# src/judicor/control_plane/idempotency.py
+
+import hashlib
+
+from starlette.responses import JSONResponse, Response
+
+from judicor.observability.metrics import REGISTRY
+from judicor.session import idempotency_store
+
+HEADER = b"idempotency-key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+# Scope flag telling the app its auth and rate-limit check already ran
+AUTHORIZED = "judicor.authorized"
+
+IDEMPOTENCY_LOOKUPS = REGISTRY.counter(
+    "judicor_idempotency_lookups_total",
+    "Idempotency-Key lookups by outcome (miss, replay, conflict, mismatch).",
+    ["outcome"],
+)
+
+
+class IdempotencyMiddleware:
+    """
+    Replay stored responses for retried POSTs carrying `Idempotency-Key`.
+
+    The key is scoped by API key, method and path. Successful (2xx)
+    responses are persisted through ``idempotency_store``, so a retry
+    after a client timeout costs one file lookup instead of re-running the
+    handler. Reusing a key with a different body yields 422; a retry that
+    arrives while the original is still running yields 409.
+
+    ``authorize(scope)`` runs before any lookup and returns a rejection
+    response or None, so a revoked or rate-limited key cannot read stored
+    responses; requests it lets through are flagged with `AUTHORIZED`.
+    """
+
+    def __init__(self, app, authorize=None) -> None:
+        self.app = app
+        self.authorize = authorize
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope.get("method") != "POST":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        raw_key = headers.get(HEADER)
+        if not raw_key:
+            await self.app(scope, receive, send)
+            return
+
+        if self.authorize is not None:
+            denied = self.authorize(scope)
+            if denied is not None:
+                await denied(scope, receive, send)
+                return
+            scope = dict(scope, **{AUTHORIZED: True})
+
+        body = await _read_body(receive)
+        request_hash = hashlib.sha256(body).hexdigest()
+        key = idempotency_store.make_key(
+            headers.get(b"x-api-key", b"").decode("latin-1"),
+            scope["method"],
+            scope.get("path", ""),
+            raw_key.decode("latin-1"),
+        )
+
+        try:
+            with idempotency_store.try_lock(key):
+                stored = idempotency_store.load_response(key)
+                if stored is not None:
+                    await self._replay(stored, request_hash, scope, send)
+                    return
+
+                IDEMPOTENCY_LOOKUPS.inc(outcome="miss")
+                status, content_type, chunks = await self._forward(
+                    scope, body, send
+                )
+                if 200 <= status < 300:
+                    idempotency_store.save_response(
+                        key,
+                        request_hash,
+                        {
+                            "status": status,
+                            "content_type": content_type,
+                            "body": b"".join(chunks).decode("utf-8"),
+                        },
+                    )
+        except BlockingIOError:
+            IDEMPOTENCY_LOOKUPS.inc(outcome="conflict")
+            response = JSONResponse(
+                {"detail": "A request with this Idempotency-Key is running"},
+                status_code=409,
+                headers={"Retry-After": "1"},
+            )
+            await response(scope, _empty_receive, send)
+
+    async def _replay(self, stored, request_hash, scope, send) -> None:
+        if stored.get("request_hash") != request_hash:
+            IDEMPOTENCY_LOOKUPS.inc(outcome="mismatch")
+            response = JSONResponse(
+                {"detail": "Idempotency-Key reused with a different payload"},
+                status_code=422,
+            )
+        else:
+            IDEMPOTENCY_LOOKUPS.inc(outcome="replay")
+            cached = stored["response"]
+            response = Response(
+                content=cached["body"],
+                status_code=cached["status"],
+                media_type=cached.get("content_type") or "application/json",
+                headers={REPLAYED_HEADER: "true"},
+            )
+        await response(scope, _empty_receive, send)
+
+    async def _forward(self, scope, body: bytes, send):
+        sent_body = False
+        captured = {"status": 500, "content_type": None}
+        chunks = []
+
+        async def receive():
+            nonlocal sent_body
+            if sent_body:
+                return {"type": "http.disconnect"}
+            sent_body = True
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        async def capture(message):
+            if message["type"] == "http.response.start":
+                captured["status"] = message["status"]
+                for name, value in message.get("headers", []):
+                    if name.lower() == b"content-type":
+                        captured["content_type"] = value.decode("latin-1")
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+            await send(message)
+
+        await self.app(scope, receive, capture)
+        return captured["status"], captured["content_type"], chunks
+
+
+async def _read_body(receive) -> bytes:
+    body = b""
+    more = True
+    while more:
+        message = await receive()
+        body += message.get("body", b"")
+        more = message.get("more_body", False)
+    return body
+
+
+async def _empty_receive():
+    return {"type": "http.disconnect"}
@@ -0,0 +1,71 @@
+# src/judicor/control_plane/instrumentation.py
+
+import time
+from typing import Dict, Tuple
+
+from judicor.domain.models import IncidentState
+from judicor.observability.metrics import REGISTRY
+from judicor.session import incident_store
+
+REQUESTS = REGISTRY.counter(
+    "judicor_http_requests_total",
+    "Control-plane requests by method, route template and status.",
+    ["method", "route", "status"],
+)
+REQUEST_DURATION = REGISTRY.histogram(
+    "judicor_http_request_duration_seconds",
+    "Control-plane request latency in seconds by route template.",
+    ["method", "route"],
+)
+
+
+def _incident_counts() -> Dict[Tuple[str, ...], float]:
+    counts = incident_store.count_by_state()
+    return {
+        (state.value,): float(counts.get(state.value, 0))
+        for state in IncidentState
+    }
+
+
+INCIDENTS_BY_STATE = REGISTRY.gauge(
+    "judicor_incidents",
+    "Incidents currently stored, by state.",
+    ["state"],
+    callback=_incident_counts,
+)
+
+
+class MetricsMiddleware:
+    """
+    Plain ASGI middleware timing every HTTP request.
+
+    Labels use the matched route template (``/incidents/{incident_id}``)
+    rather than the raw path so label cardinality stays bounded.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = getattr(scope.get("route"), "path", "unmatched")
+            method = scope.get("method", "")
+            REQUEST_DURATION.observe(
+                time.perf_counter() - start, method=method, route=route
+            )
+            REQUESTS.inc(method=method, route=route, status=str(status_code))
@@ -0,0 +1,169 @@
+# src/judicor/control_plane/jobs.py
+
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+from datetime import datetime, timezone
+from typing import Callable, Optional
+
+from judicor.ai.pipeline import ReasoningPipeline, build_reasoners
+from judicor.observability.metrics import REGISTRY
+from judicor.session import incident_store, job_store
+
+DEFAULT_WORKERS = 4
+# Minimum seconds between persisting streamed partial answers
+PARTIAL_FLUSH_INTERVAL = 0.1
+DEFAULT_QUEUE_SIZE = 100
+JOB_RETENTION_SECONDS = 24 * 3600
+# Unfinished jobs not saved for this long are failed as abandoned
+DEFAULT_JOB_LEASE_SECONDS = 3600
+
+JOBS = REGISTRY.counter(
+    "judicor_ask_jobs_total",
+    "Server-side ask jobs by final status.",
+    ["status"],
+)
+JOB_QUEUE_WAIT = REGISTRY.histogram(
+    "judicor_ask_job_queue_wait_seconds",
+    "Time ask jobs spend queued before a worker picks them up.",
+)
+JOB_DURATION = REGISTRY.histogram(
+    "judicor_ask_job_duration_seconds",
+    "End-to-end ask job latency (queue wait + execution).",
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0),
+)
+
+
+class QueueFullError(RuntimeError):
+    """Raised when the ask queue is at capacity."""
+
+
+def _env_int(name: str, default: int) -> int:
+    raw = os.getenv(name)
+    try:
+        return int(raw) if raw else default
+    except ValueError:
+        return default
+
+
+def get_job_lease_seconds() -> int:
+    return _env_int("JUDICOR_JOB_LEASE_SECONDS", DEFAULT_JOB_LEASE_SECONDS)
+
+
+class JobRunner:
+    """
+    Bounded worker pool executing ask jobs in the background.
+
+    Job state is persisted through ``job_store`` on every transition, so
+    any control-plane worker process can answer polls for any job.
+    """
+
+    def __init__(
+        self,
+        pipeline_factory: Optional[Callable[[], ReasoningPipeline]] = None,
+        workers: Optional[int] = None,
+        queue_size: Optional[int] = None,
+    ) -> None:
+        self.pipeline_factory = pipeline_factory or (
+            lambda: ReasoningPipeline(build_reasoners())
+        )
+        self.workers = workers or _env_int(
+            "JUDICOR_ASK_WORKERS", DEFAULT_WORKERS
+        )
+        self.queue_size = queue_size or _env_int(
+            "JUDICOR_ASK_QUEUE_SIZE", DEFAULT_QUEUE_SIZE
+        )
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pipeline: Optional[ReasoningPipeline] = None
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    @property
+    def depth(self) -> int:
+        with self._lock:
+            return self._pending
+
+    def submit(self, incident_id: int, question: str) -> job_store.Job:
+        with self._lock:
+            if self._pending >= self.queue_size:
+                raise QueueFullError("Ask queue is full")
+            self._pending += 1
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers,
+                    thread_name_prefix="judicor-ask",
+                )
+            executor = self._executor
+
+        job = job_store.Job(
+            id=uuid.uuid4().hex, incident_id=incident_id, question=question
+        )
+        job_store.save_job(job)
+        executor.submit(self._run, job)
+        return job
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+    @property
+    def pipeline(self) -> ReasoningPipeline:
+        """The pipeline shared by ask jobs, created on first use."""
+        return self._get_pipeline()
+
+    def _get_pipeline(self) -> ReasoningPipeline:
+        with self._lock:
+            if self._pipeline is None:
+                self._pipeline = self.pipeline_factory()
+            return self._pipeline
+
+    def _partial_writer(self, job: job_store.Job):
+        last_flush = 0.0
+
+        def on_chunk(text: str) -> None:
+            nonlocal last_flush
+            job.partial += text
+            now = time.monotonic()
+            if now - last_flush >= PARTIAL_FLUSH_INTERVAL:
+                last_flush = now
+                job_store.save_job(job)
+
+        return on_chunk
+
+    def _run(self, job: job_store.Job) -> None:
+        job.status = job_store.RUNNING
+        job.started_at = datetime.now(timezone.utc)
+        JOB_QUEUE_WAIT.observe(
+            (job.started_at - job.created_at).total_seconds()
+        )
+        job_store.save_job(job)
+
+        try:
+            incident = incident_store.load_incident(job.incident_id)
+            if incident is None:
+                raise LookupError("Incident not found")
+            result = self._get_pipeline().ask(
+                incident, job.question, on_chunk=self._partial_writer(job)
+            )
+            job.result = asdict(result)
+            job.status = job_store.SUCCEEDED
+            if not result.success:
+                # Rejected by the policy: later polls must not show it
+                job.partial = ""
+        except Exception as exc:
+            job.error = str(exc)
+            job.status = job_store.FAILED
+        finally:
+            job.finished_at = datetime.now(timezone.utc)
+            job_store.save_job(job)
+            JOBS.inc(status=job.status)
+            JOB_DURATION.observe(
+                (job.finished_at - job.created_at).total_seconds()
+            )
+            with self._lock:
+                self._pending -= 1
@@ -0,0 +1,328 @@
+# src/judicor/control_plane/limits.py
+
+import hashlib
+import json
+import math
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from starlette.responses import JSONResponse
+
+from judicor.observability.metrics import REGISTRY
+from judicor.session.utils import file_lock, secure_write_json
+
+BASE_DIR = Path.home() / ".judicor" / "ratelimits"
+
+DEFAULT_SYNC_SECONDS = 1.0
+DEFAULT_MAX_IN_FLIGHT = 64
+SHED_RETRY_AFTER_SECONDS = 1
+UNLIMITED_PATHS = ("/health", "/metrics")
+
+RATE_LIMITED = REGISTRY.counter(
+    "judicor_rate_limited_total",
+    "Requests rejected with 429 by API client and route.",
+    ["client", "route"],
+)
+LOAD_SHED = REGISTRY.counter(
+    "judicor_load_shed_total",
+    "Requests rejected with 503 because too many were in flight.",
+)
+IN_FLIGHT = REGISTRY.gauge(
+    "judicor_in_flight_requests",
+    "Requests currently being processed by this worker.",
+)
+
+
+@dataclass(frozen=True)
+class ApiKeyQuota:
+    """A known API key, the client name used in metrics and its quota."""
+
+    name: str
+    key: str
+    rate: float
+    burst: float
+
+
+def parse_api_keys(
+    raw: Optional[str], legacy_key: Optional[str]
+) -> Dict[str, ApiKeyQuota]:
+    """
+    Parse `JUDICOR_API_KEYS` into ``{key: ApiKeyQuota}``.
+
+    Format: comma-separated ``name=key[:rate[:burst]]`` entries, e.g.
+    ``ci=abc123:5:10,pager=def456``. Keys without a rate, a rate of 0 and
+    the legacy single `JUDICOR_API_KEY` (kept as ``default``) are not
+    limited. Rates apply to the control plane as a whole: workers sync
+    their buckets (see `RateLimiter`), so they are not divided by the
+    worker count.
+    """
+    quotas: Dict[str, ApiKeyQuota] = {}
+    if legacy_key:
+        quotas[legacy_key] = ApiKeyQuota("default", legacy_key, 0.0, 0.0)
+
+    for entry in (raw or "").split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        name, sep, spec = entry.partition("=")
+        if not sep or not spec:
+            raise ValueError(f"Invalid JUDICOR_API_KEYS entry: {entry!r}")
+        parts = spec.split(":")
+        key = parts[0]
+        rate, burst = 0.0, 0.0
+        if len(parts) > 1:
+            rate = float(parts[1])
+            burst = float(parts[2]) if len(parts) > 2 else max(rate, 1.0)
+        quotas[key] = ApiKeyQuota(name.strip(), key, rate, burst)
+    return quotas
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: float, now: float) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = now
+
+    def _refill(self, now: float) -> None:
+        elapsed = max(0.0, now - self.updated)
+        self.tokens = min(self.burst, self.tokens + elapsed * self.rate)
+        self.updated = now
+
+    def take(self, now: float) -> float:
+        """Consume one token; return 0 or the seconds until one is free."""
+        self._refill(now)
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return 0.0
+        return (1.0 - self.tokens) / self.rate
+
+
+class RateLimiter:
+    """
+    Token buckets keyed by (client name, route template).
+
+    `check` runs on the event loop, so it only touches this worker's
+    in-memory buckets. `sync` (run from a background thread, see
+    `start_sync`) merges them with the other workers' through one JSON
+    file per client under ``BASE_DIR``: it refills the shared bucket,
+    takes out what this worker spent since the last sync and adopts the
+    result. Between syncs each worker can overshoot by what it spends in
+    one interval, so quotas hold for the whole control plane to within
+    that.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._buckets: Dict[Tuple[str, str], TokenBucket] = {}
+        self._spent: Dict[Tuple[str, str], float] = {}
+
+    def check(
+        self, quota: ApiKeyQuota, route: str, now: Optional[float] = None
+    ) -> float:
+        """Return 0 if the request may proceed, else seconds to wait."""
+        if quota.rate <= 0:
+            return 0.0
+        # Wall clock: buckets are compared across processes
+        now = time.time() if now is None else now
+        key = (quota.name, route)
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if (
+                bucket is None
+                or bucket.rate != quota.rate
+                or bucket.burst != quota.burst
+            ):
+                bucket = TokenBucket(quota.rate, quota.burst, now)
+                self._buckets[key] = bucket
+            wait = bucket.take(now)
+            if not wait:
+                self._spent[key] = self._spent.get(key, 0.0) + 1.0
+        if wait:
+            RATE_LIMITED.inc(client=quota.name, route=route)
+        return wait
+
+    def sync(self, now: Optional[float] = None) -> None:
+        """Merge local buckets with the shared files (blocking file I/O)."""
+        now = time.time() if now is None else now
+        with self._lock:
+            spent, self._spent = self._spent, {}
+            by_client: Dict[str, List[Tuple[str, TokenBucket]]] = {}
+            for (client, route), bucket in self._buckets.items():
+                by_client.setdefault(client, []).append((route, bucket))
+
+        merged: Dict[Tuple[str, str], TokenBucket] = {}
+        for client, buckets in by_client.items():
+            path = _bucket_path(client)
+            with file_lock(path):
+                state = _load(path, client)
+                changed = False
+                for route, local in buckets:
+                    entry = state["routes"].get(route)
+                    if (
+                        entry is None
+                        or entry["rate"] != local.rate
+                        or entry["burst"] != local.burst
+                    ):
+                        shared = TokenBucket(local.rate, local.burst, now)
+                    else:
+                        shared = TokenBucket(
+                            local.rate, local.burst, entry["updated"]
+                        )
+                        shared.tokens = entry["tokens"]
+                        shared._refill(now)
+                    used = spent.get((client, route), 0.0)
+                    if used or entry is None:
+                        shared.tokens -= used
+                        state["routes"][route] = {
+                            "rate": shared.rate,
+                            "burst": shared.burst,
+                            "tokens": shared.tokens,
+                            "updated": shared.updated,
+                        }
+                        changed = True
+                    merged[(client, route)] = shared
+                if changed:
+                    secure_write_json(path, state)
+
+        with self._lock:
+            for key, shared in merged.items():
+                local = self._buckets.get(key)
+                if local is None or (local.rate, local.burst) != (
+                    shared.rate,
+                    shared.burst,
+                ):
+                    continue
+                # Requests admitted while the files were being merged
+                local.tokens = shared.tokens - self._spent.get(key, 0.0)
+                local.updated = shared.updated
+
+    def snapshot(self) -> Dict[Tuple[str, ...], float]:
+        """Tokens left in this worker's view of each bucket."""
+        now = time.time()
+        with self._lock:
+            buckets = list(self._buckets.items())
+        tokens: Dict[Tuple[str, ...], float] = {}
+        for key, bucket in buckets:
+            elapsed = max(0.0, now - bucket.updated)
+            tokens[key] = min(
+                bucket.burst, bucket.tokens + elapsed * bucket.rate
+            )
+        return tokens
+
+    def reset(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+            self._spent.clear()
+            if BASE_DIR.exists():
+                for path in BASE_DIR.glob("*.json"):
+                    path.unlink(missing_ok=True)
+
+
+class BucketSync:
+    """Background thread running `RateLimiter.sync` periodically."""
+
+    def __init__(self, limiter: RateLimiter, interval: float) -> None:
+        self.limiter = limiter
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="judicor-ratelimit-sync", daemon=True
+        )
+
+    def start(self) -> "BucketSync":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.limiter.sync()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.limiter.sync()
+            except OSError:
+                pass
+
+
+def start_sync(limiter: RateLimiter) -> BucketSync:
+    """Sync every `JUDICOR_RATE_LIMIT_SYNC_SECONDS` (default 1)."""
+    raw = os.getenv("JUDICOR_RATE_LIMIT_SYNC_SECONDS")
+    try:
+        interval = float(raw) if raw else DEFAULT_SYNC_SECONDS
+    except ValueError:
+        interval = DEFAULT_SYNC_SECONDS
+    return BucketSync(limiter, max(interval, 0.1)).start()
+
+
+def _bucket_path(client: str) -> Path:
+    # Client names come from configuration; keep them out of file names
+    digest = hashlib.sha256(client.encode("utf-8")).hexdigest()[:16]
+    return BASE_DIR / f"{digest}.json"
+
+
+def _load(path: Path, client: str) -> dict:
+    try:
+        with open(path, encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        state = None
+    if not isinstance(state, dict):
+        state = {}
+    state.setdefault("client", client)
+    state.setdefault("routes", {})
+    return state
+
+
+def retry_after(seconds: float) -> str:
+    return str(max(1, math.ceil(seconds)))
+
+
+def get_max_in_flight() -> int:
+    raw = os.getenv("JUDICOR_MAX_IN_FLIGHT")
+    try:
+        return int(raw) if raw else DEFAULT_MAX_IN_FLIGHT
+    except ValueError:
+        return DEFAULT_MAX_IN_FLIGHT
+
+
+class LoadSheddingMiddleware:
+    """
+    Reject requests with 503 once too many are in flight on this worker.
+
+    Health and metrics stay reachable so a saturated worker can still be
+    observed and load-balanced away from.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+        self.in_flight = 0
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope.get("path") in UNLIMITED_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        if self.in_flight >= get_max_in_flight():
+            LOAD_SHED.inc()
+            response = JSONResponse(
+                {"detail": "Server overloaded, retry later"},
+                status_code=503,
+                headers={"Retry-After": str(SHED_RETRY_AFTER_SECONDS)},
+            )
+            await response(scope, receive, send)
+            return
+
+        self.in_flight += 1
+        IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.in_flight -= 1
+            IN_FLIGHT.dec()
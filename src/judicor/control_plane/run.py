@@ -1,13 +1,110 @@
+import importlib
+import os
+from pathlib import Path
+from typing import Any, Dict
+
 import uvicorn
 
+from judicor.observability import metrics
 
-def main():
-    uvicorn.run(
-        "judicor.control_plane.app:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True,
+APP_PATH = "judicor.control_plane.app:app"
+
+DEFAULT_MODE = "dev"
+DEFAULT_HOST = "0.0.0.0"
+DEFAULT_PORT = 8000
+DEFAULT_KEEP_ALIVE = 5
+DEFAULT_BACKLOG = 2048
+DEFAULT_GRACEFUL_TIMEOUT = 30
+DEFAULT_METRICS_DIR = Path.home() / ".judicor" / "metrics"
+
+
+def _env_int(name: str, default: int) -> int:
+    raw = os.getenv(name)
+    if not raw:
+        return default
+    try:
+        return int(raw)
+    except ValueError:
+        raise ValueError(f"{name} must be an integer, got {raw!r}")
+
+
+def _default_workers() -> int:
+    return max(1, (os.cpu_count() or 1))
+
+
+def build_server_config() -> Dict[str, Any]:
+    """
+    Build uvicorn keyword arguments from `JUDICOR_PLANE_*` env variables.
+
+    `dev` mode keeps the single auto-reloading process. `prod` mode runs
+    several worker processes with tuned keep-alive / backlog settings and
+    a graceful-shutdown window so in-flight writes are drained. Workers
+    share incidents, the alert dedup index and rate-limit buckets through
+    the locked stores under ``~/.judicor``.
+    """
+    mode = os.getenv("JUDICOR_PLANE_MODE", DEFAULT_MODE).lower()
+    config: Dict[str, Any] = {
+        "host": os.getenv("JUDICOR_PLANE_HOST", DEFAULT_HOST),
+        "port": _env_int("JUDICOR_PLANE_PORT", DEFAULT_PORT),
+    }
+
+    if mode == "dev":
+        config["reload"] = True
+        return config
+
+    if mode != "prod":
+        raise ValueError(f"Unknown control plane mode: {mode}")
+
+    config.update(
+        {
+            "workers": _env_int("JUDICOR_PLANE_WORKERS", _default_workers()),
+            "timeout_keep_alive": _env_int(
+                "JUDICOR_PLANE_KEEP_ALIVE", DEFAULT_KEEP_ALIVE
+            ),
+            "backlog": _env_int("JUDICOR_PLANE_BACKLOG", DEFAULT_BACKLOG),
+            "timeout_graceful_shutdown": _env_int(
+                "JUDICOR_PLANE_GRACEFUL_TIMEOUT", DEFAULT_GRACEFUL_TIMEOUT
+            ),
+            "access_log": False,
+            "reload": False,
+        }
     )
+    return config
+
+
+def preload_app() -> None:
+    """
+    Import the ASGI app once in the supervisor before workers start.
+
+    uvicorn spawns workers from an import string, so this cannot share
+    memory like a fork-based preload; it makes configuration or import
+    errors fail fast in the parent instead of in every worker.
+    """
+    module_name, _, attr = APP_PATH.partition(":")
+    module = importlib.import_module(module_name)
+    getattr(module, attr)
+
+
+def share_metrics() -> Path:
+    """
+    Point every worker at one metrics snapshot directory so ``/metrics``
+    sums counters and histograms across workers; stale snapshots from a
+    previous run are dropped. Workers inherit the environment.
+    """
+    directory = Path(
+        os.environ.setdefault("JUDICOR_METRICS_DIR", str(DEFAULT_METRICS_DIR))
+    )
+    metrics.clear_snapshots(directory)
+    return directory
+
+
+def main():
+    config = build_server_config()
+    if config.get("workers", 1) > 1:
+        share_metrics()
+    if not config.get("reload"):
+        preload_app()
+    uvicorn.run(APP_PATH, **config)
 
 
 if __name__ == "__main__":
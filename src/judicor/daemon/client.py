@@ -0,0 +1,178 @@
+# src/judicor/daemon/client.py
+
+import os
+import socket
+from pathlib import Path
+from typing import Callable, List, Optional, Sequence
+
+from judicor.client.interface import JudicorClient
+from judicor.daemon.protocol import (
+    decode,
+    encode,
+    from_wire,
+    get_socket_path,
+)
+from judicor.domain.models import Incident
+from judicor.domain.results import (
+    AskResult,
+    AttachResult,
+    Result,
+    StatusResult,
+    TriageResult,
+    TriggerResult,
+)
+
+CONNECT_TIMEOUT_SECONDS = 1.0
+# Longest silence on the socket before a call is abandoned; streamed
+# chunks reset it, so it only has to cover the slowest provider reply
+DEFAULT_CALL_TIMEOUT_SECONDS = 300.0
+
+
+class DaemonError(RuntimeError):
+    pass
+
+
+class DaemonConfigMismatch(DaemonError):
+    pass
+
+
+class DaemonUnavailable(DaemonError):
+    """The request never reached the daemon, so it is safe to re-run."""
+
+
+def get_call_timeout() -> float:
+    """Seconds to wait on the daemon (`JUDICOR_DAEMON_TIMEOUT_SECONDS`)."""
+    raw = os.getenv("JUDICOR_DAEMON_TIMEOUT_SECONDS")
+    try:
+        timeout = float(raw) if raw else DEFAULT_CALL_TIMEOUT_SECONDS
+    except ValueError:
+        timeout = DEFAULT_CALL_TIMEOUT_SECONDS
+    return timeout if timeout > 0 else DEFAULT_CALL_TIMEOUT_SECONDS
+
+
+class DaemonJudicorClient(JudicorClient):
+    """
+    JudicorClient forwarding every call to a running `judicor daemon`.
+
+    Holds one connection for the life of the object, so a shell session
+    pays the connect cost once.
+    """
+
+    def __init__(self, sock: socket.socket) -> None:
+        self._sock = sock
+        self._file = sock.makefile("rwb")
+
+    def close(self) -> None:
+        try:
+            self._file.close()
+        except OSError:
+            # An unsent request is still buffered for a peer that is gone
+            pass
+        self._sock.close()
+
+    def _call(
+        self,
+        method: str,
+        on_chunk: Optional[Callable[[str], None]] = None,
+        **params,
+    ):
+        try:
+            self._file.write(encode({"method": method, "params": params}))
+            self._file.flush()
+        except OSError as exc:
+            raise DaemonUnavailable(
+                f"Could not reach daemon: {exc}"
+            ) from exc
+        # From here on the daemon may have acted on the request
+        try:
+            for line in self._file:
+                message = decode(line)
+                if "chunk" in message:
+                    if on_chunk is not None:
+                        on_chunk(message["chunk"])
+                    continue
+                if "error" in message:
+                    raise DaemonError(message["error"])
+                return from_wire(message.get("result"))
+        except OSError as exc:
+            raise DaemonError(f"Lost connection to daemon: {exc}") from exc
+        raise DaemonError("Daemon closed the connection")
+
+    def ping(self) -> bool:
+        return self._call("ping") == "pong"
+
+    def config(self) -> str:
+        return self._call("config")
+
+    def stop_daemon(self) -> None:
+        self._call("shutdown")
+
+    def list_incidents(self) -> List[Incident]:
+        return self._call("list_incidents")
+
+    def attach_incident(self, incident_id: int) -> AttachResult:
+        return self._call("attach_incident", incident_id=incident_id)
+
+    def detach_incident(self) -> Result:
+        return self._call("detach_incident")
+
+    def ask_ai(self, question: str) -> AskResult:
+        return self._call("ask_ai", question=question)
+
+    def ask_ai_stream(
+        self, question: str, on_chunk: Callable[[str], None]
+    ) -> AskResult:
+        return self._call("ask_ai_stream", on_chunk, question=question)
+
+    def status_incident(self) -> StatusResult:
+        return self._call("status_incident")
+
+    def resolve_incident(self) -> Result:
+        return self._call("resolve_incident")
+
+    def trigger(self) -> TriggerResult:
+        return self._call("trigger")
+
+    def triage(
+        self, incident_ids: Optional[Sequence[int]] = None
+    ) -> TriageResult:
+        if incident_ids is not None:
+            incident_ids = list(incident_ids)
+        return self._call("triage", incident_ids=incident_ids)
+
+
+def connect(
+    path: Optional[Path] = None, config: Optional[str] = None
+) -> Optional[DaemonJudicorClient]:
+    """
+    Return a client for the running daemon, or None if there is none.
+
+    With ``config`` (a `config_fingerprint`), raise `DaemonConfigMismatch`
+    unless the daemon was started with the same settings.
+    """
+    path = Path(path) if path else get_socket_path()
+    if not path.exists():
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(CONNECT_TIMEOUT_SECONDS)
+    try:
+        sock.connect(str(path))
+    except OSError:
+        sock.close()
+        return None
+    sock.settimeout(get_call_timeout())
+    client = DaemonJudicorClient(sock)
+    if config is None:
+        return client
+    try:
+        running = client.config()
+    except DaemonError:
+        # A daemon too old to report its settings cannot be trusted
+        running = None
+    if running != config:
+        client.close()
+        raise DaemonConfigMismatch(
+            "Judicor daemon was started with different settings; "
+            "restart it with `judicor daemon --stop`"
+        )
+    return client
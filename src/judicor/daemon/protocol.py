@@ -0,0 +1,135 @@
+# src/judicor/daemon/protocol.py
+
+"""
+Wire format between the CLI and `judicor daemon`.
+
+Newline-delimited JSON over a Unix domain socket. A request is
+``{"method": ..., "params": {...}}``; the daemon answers with zero or
+more ``{"chunk": text}`` lines (streaming asks) followed by exactly one
+``{"result": ...}`` or ``{"error": message}`` line.
+"""
+
+import hashlib
+import json
+import os
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any
+
+from judicor.domain.models import Incident, IncidentState
+from judicor.domain.results import (
+    AskResult,
+    AttachResult,
+    Result,
+    StatusResult,
+    TriageResult,
+    TriggerResult,
+)
+from judicor.session.utils import parse_dt
+
+BASE_DIR = Path.home() / ".judicor"
+
+# JudicorClient methods the daemon serves
+COMMANDS = (
+    "list_incidents",
+    "attach_incident",
+    "detach_incident",
+    "ask_ai",
+    "ask_ai_stream",
+    "status_incident",
+    "resolve_incident",
+    "trigger",
+    "triage",
+)
+
+# Settings that only steer the CLI side of the socket, and so may differ
+# between the daemon and the processes forwarding to it
+LOCAL_SETTINGS = frozenset(
+    {
+        "JUDICOR_DAEMON",
+        "JUDICOR_DAEMON_SOCKET",
+        "JUDICOR_DAEMON_TIMEOUT_SECONDS",
+        "JUDICOR_DEBUG",
+    }
+)
+
+_RESULT_TYPES = {
+    cls.__name__: cls
+    for cls in (
+        Result,
+        AttachResult,
+        AskResult,
+        TriggerResult,
+        TriageResult,
+        StatusResult,
+    )
+}
+
+
+def get_socket_path() -> Path:
+    raw = os.getenv("JUDICOR_DAEMON_SOCKET")
+    return Path(raw) if raw else BASE_DIR / "daemon.sock"
+
+
+def config_fingerprint() -> str:
+    """
+    Digest of the environment that decides how a client behaves (client
+    type, control plane, providers and their keys, store location).
+
+    The CLI compares it with the daemon's before forwarding, so a daemon
+    started under other settings is never used silently. Only the digest
+    crosses the socket, never the keys themselves.
+    """
+    settings = sorted(
+        (name, value)
+        for name, value in os.environ.items()
+        if (name.startswith("JUDICOR_") and name not in LOCAL_SETTINGS)
+        or name in ("GOOGLE_API_KEY", "HOME")
+    )
+    return hashlib.sha256(json.dumps(settings).encode("utf-8")).hexdigest()
+
+
+def encode(message: dict) -> bytes:
+    return json.dumps(message, default=str).encode("utf-8") + b"\n"
+
+
+def decode(line: bytes) -> dict:
+    return json.loads(line.decode("utf-8"))
+
+
+def to_wire(value: Any) -> Any:
+    if isinstance(value, list):
+        return [to_wire(item) for item in value]
+    if isinstance(value, Incident):
+        return {
+            "type": "Incident",
+            "data": {
+                "id": value.id,
+                "title": value.title,
+                "state": value.state.value,
+                "created_at": value.created_at.isoformat(),
+                "updated_at": value.updated_at.isoformat(),
+                "fingerprint": value.fingerprint,
+            },
+        }
+    if type(value).__name__ in _RESULT_TYPES:
+        return {"type": type(value).__name__, "data": asdict(value)}
+    return value
+
+
+def from_wire(value: Any) -> Any:
+    if isinstance(value, list):
+        return [from_wire(item) for item in value]
+    if not isinstance(value, dict) or "type" not in value:
+        return value
+    data = value["data"]
+    if value["type"] == "Incident":
+        return Incident(
+            id=int(data["id"]),
+            title=data["title"],
+            state=IncidentState(data["state"]),
+            created_at=parse_dt(data.get("created_at")),
+            updated_at=parse_dt(data.get("updated_at")),
+            fingerprint=data.get("fingerprint"),
+        )
+    return _RESULT_TYPES[value["type"]](**data)
@@ -0,0 +1,178 @@
+# src/judicor/daemon/server.py
+
+import os
+import socket
+import socketserver
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+from judicor.client.interface import JudicorClient
+from judicor.daemon.protocol import (
+    COMMANDS,
+    config_fingerprint,
+    decode,
+    encode,
+    from_wire,
+    get_socket_path,
+    to_wire,
+)
+from judicor.observability.metrics import REGISTRY
+from judicor.session.utils import ensure_dir
+
+DAEMON_REQUESTS = REGISTRY.counter(
+    "judicor_daemon_requests_total",
+    "Commands served by the local daemon by method and outcome.",
+    ["method", "outcome"],
+)
+DAEMON_DURATION = REGISTRY.histogram(
+    "judicor_daemon_request_duration_seconds",
+    "Time the local daemon spent serving a command.",
+    ["method"],
+)
+
+Send = Callable[[dict], None]
+
+
+class DaemonAlreadyRunning(RuntimeError):
+    pass
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        # One connection carries any number of requests (e.g. a shell)
+        for line in self.rfile:
+            if not line.strip():
+                continue
+
+            def send(message: dict) -> None:
+                self.wfile.write(encode(message))
+                self.wfile.flush()
+
+            try:
+                request = decode(line)
+            except ValueError:
+                send({"error": "malformed request"})
+                continue
+            try:
+                self.server.judicor_daemon.dispatch(request, send)
+            except (BrokenPipeError, ConnectionResetError):
+                return
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class JudicorDaemon:
+    """
+    Serves JudicorClient calls for CLI processes over a Unix socket.
+
+    Keeps one warm client (stores, reasoners, caches, provider
+    connections) for the lifetime of the process. Calls are serialized,
+    matching the single-user CLI they stand in for, and the session is
+    re-read before each command so it never acts on a stale attachment.
+    """
+
+    def __init__(
+        self, client: JudicorClient, path: Optional[Path] = None
+    ) -> None:
+        self.client = client
+        # Fixed at start; the client was built from this environment
+        self.config = config_fingerprint()
+        self.path = Path(path) if path else get_socket_path()
+        self._lock = threading.Lock()
+        self._server: Optional[_Server] = None
+
+    def start(self) -> None:
+        """Bind the socket (replacing a stale one) without serving yet."""
+        if self.path.exists():
+            if is_running(self.path):
+                raise DaemonAlreadyRunning(
+                    f"Judicor daemon already listening on {self.path}"
+                )
+            self.path.unlink()
+        ensure_dir(self.path.parent)
+        old_umask = os.umask(0o177)
+        try:
+            self._server = _Server(str(self.path), _Handler)
+        finally:
+            os.umask(old_umask)
+        self._server.judicor_daemon = self
+
+    def serve_forever(self) -> None:
+        if self._server is None:
+            self.start()
+        try:
+            self._server.serve_forever(poll_interval=0.5)
+        finally:
+            self._server.server_close()
+            try:
+                self.path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def shutdown(self) -> None:
+        if self._server is not None:
+            # serve_forever must be left from another thread
+            threading.Thread(target=self._server.shutdown).start()
+
+    def dispatch(self, request: dict, send: Send) -> None:
+        method = request.get("method")
+        params = request.get("params") or {}
+        if method == "ping":
+            send({"result": "pong"})
+            return
+        if method == "config":
+            send({"result": self.config})
+            return
+        if method == "shutdown":
+            send({"result": "stopping"})
+            self.shutdown()
+            return
+        if method not in COMMANDS:
+            send({"error": f"Unknown daemon method: {method}"})
+            return
+
+        start = time.perf_counter()
+        try:
+            with self._lock:
+                reload_session = getattr(self.client, "reload_session", None)
+                if reload_session is not None:
+                    reload_session()
+                if method == "ask_ai_stream":
+                    result = self.client.ask_ai_stream(
+                        params["question"],
+                        lambda text: send({"chunk": text}),
+                    )
+                else:
+                    args = {k: from_wire(v) for k, v in params.items()}
+                    result = getattr(self.client, method)(**args)
+            outcome = "ok"
+            response = {"result": to_wire(result)}
+        except (BrokenPipeError, ConnectionResetError):
+            raise
+        except Exception as exc:
+            outcome = "error"
+            response = {"error": f"{type(exc).__name__}: {exc}"}
+
+        # Recorded before replying so the caller observes the update
+        DAEMON_DURATION.observe(time.perf_counter() - start, method=method)
+        DAEMON_REQUESTS.inc(method=method, outcome=outcome)
+        send(response)
+
+
+def is_running(path: Optional[Path] = None) -> bool:
+    path = Path(path) if path else get_socket_path()
+    if not path.exists():
+        return False
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(1.0)
+    try:
+        sock.connect(str(path))
+        return True
+    except OSError:
+        return False
+    finally:
+        sock.close()
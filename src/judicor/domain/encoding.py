@@ -0,0 +1,94 @@
+# src/judicor/domain/encoding.py
+
+"""
+Wire formats shared by the control plane and the HTTP clients.
+
+JSON is always available. MessagePack is used only when both sides have
+the optional ``msgpack`` package and the client asks for it through
+``Accept``.
+"""
+
+import importlib.util
+import json
+import os
+from typing import Any, List, Optional, Tuple
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+MSGPACK_MEDIA_TYPES = (MSGPACK_MEDIA_TYPE, "application/x-msgpack")
+
+WIRE_FORMATS = ("json", "msgpack")
+DEFAULT_WIRE_FORMAT = "json"
+
+
+def msgpack_available() -> bool:
+    return importlib.util.find_spec("msgpack") is not None
+
+
+def get_wire_format() -> str:
+    """Client-side preference from `JUDICOR_WIRE_FORMAT`."""
+    wire_format = os.getenv(
+        "JUDICOR_WIRE_FORMAT", DEFAULT_WIRE_FORMAT
+    ).lower()
+    if wire_format not in WIRE_FORMATS:
+        raise ValueError(f"Unknown wire format: {wire_format}")
+    return wire_format
+
+
+def accept_header(wire_format: str) -> str:
+    """``Accept`` value for ``wire_format``, keeping JSON as fallback."""
+    if wire_format == "msgpack" and msgpack_available():
+        return f"{MSGPACK_MEDIA_TYPE}, {JSON_MEDIA_TYPE};q=0.5"
+    return JSON_MEDIA_TYPE
+
+
+def _parse_accept(accept: str) -> List[Tuple[float, str]]:
+    ranges = []
+    for part in accept.split(","):
+        media_type, _, params = part.strip().partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if media_type:
+            ranges.append((quality, media_type.strip().lower()))
+    return ranges
+
+
+def negotiate(accept: Optional[str]) -> str:
+    """Pick the response media type for an ``Accept`` header."""
+    if not accept or not msgpack_available():
+        return JSON_MEDIA_TYPE
+    best_json = best_msgpack = 0.0
+    for quality, media_type in _parse_accept(accept):
+        if media_type in MSGPACK_MEDIA_TYPES:
+            best_msgpack = max(best_msgpack, quality)
+        elif media_type in (JSON_MEDIA_TYPE, "application/*", "*/*"):
+            best_json = max(best_json, quality)
+    if best_msgpack > 0 and best_msgpack >= best_json:
+        return MSGPACK_MEDIA_TYPE
+    return JSON_MEDIA_TYPE
+
+
+def encode(data: Any, media_type: str = JSON_MEDIA_TYPE) -> bytes:
+    if media_type in MSGPACK_MEDIA_TYPES:
+        import msgpack
+
+        return msgpack.packb(data, use_bin_type=True)
+    # Same compact form FastAPI's JSONResponse renders
+    return json.dumps(
+        data, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def decode(body: bytes, content_type: Optional[str] = None) -> Any:
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    if media_type in MSGPACK_MEDIA_TYPES:
+        import msgpack
+
+        return msgpack.unpackb(body, raw=False)
+    return json.loads(body)
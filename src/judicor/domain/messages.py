@@ -1,3 +1,10 @@
 # src/judicor/domain/messages.py
 
 NO_INCIDENT_ATTACHED = "No incident attached"
+TRIAGED = "Analyzed {analyzed} of {total} incidents"
+QUEUED_OFFLINE = (
+    "Control plane unreachable; queued for delivery ({pending} pending). "
+    "Run `judicor sync` once it is back."
+)
+# Streamed answer text the reasoning policy rejected once complete
+ANSWER_WITHDRAWN = "Answer above withdrawn: {message}"
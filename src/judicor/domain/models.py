@@ -3,6 +3,7 @@
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from enum import Enum
+from typing import Optional
 
 
 class IncidentState(str, Enum):
@@ -24,6 +25,7 @@ class Incident:
     updated_at: datetime = field(
         default_factory=lambda: datetime.now(timezone.utc)
     )
+    fingerprint: Optional[str] = None
 
     @property
     def status(self) -> str:
@@ -1,7 +1,7 @@
 # src/judicor/domain/results.py
 
-from dataclasses import dataclass
-from typing import Optional, Any
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Any
 
 
 @dataclass
@@ -71,6 +71,23 @@ class TriggerResult(Result):
     incident_id: Optional[int] = None
 
 
+@dataclass
+class TriageResult(Result):
+    """
+    Result of analyzing a batch of incidents.
+
+    Attributes:
+        analyses (Dict[int, Optional[str]]): Initial analysis per
+            triaged incident ID; None where the analyzer failed.
+    """
+
+    analyses: Dict[int, Optional[str]] = field(default_factory=dict)
+
+    def __post_init__(self):
+        # JSON transports turn the incident IDs into strings
+        self.analyses = {int(k): v for k, v in self.analyses.items()}
+
+
 @dataclass
 class StatusResult(Result):
     """
@@ -0,0 +1,532 @@
+# src/judicor/observability/metrics.py
+
+"""
+Minimal in-process metrics registry rendered in Prometheus text format.
+
+Deliberately dependency-free: recording a sample is a dict update under a
+lock, so instrumentation stays cheap enough for hot store paths.
+
+With `JUDICOR_METRICS_DIR` set (the multi-worker control plane sets it),
+each process also writes its counters and histograms to
+``<dir>/<pid>.json`` every `JUDICOR_METRICS_SNAPSHOT_SECONDS` and a scrape
+sums every process's snapshot, so ``/metrics`` covers all workers
+whichever one answers. Gauges stay per process.
+"""
+
+import abc
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from judicor.session.utils import ensure_dir, secure_write_json
+
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+DEFAULT_SNAPSHOT_SECONDS = 5.0
+
+LabelValues = Tuple[str, ...]
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return (
+        value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+    )
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(
+        f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)
+    )
+    return "{" + pairs + "}"
+
+
+class _Metric(abc.ABC):
+    type_name = "untyped"
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, object]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(
+                f"{self.name} expects labels {self.labelnames}, "
+                f"got {tuple(labels)}"
+            )
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def header(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+
+    @abc.abstractmethod
+    def render(self) -> List[str]:
+        """Exposition lines for this metric, header included."""
+
+    @abc.abstractmethod
+    def reset(self) -> None:
+        """Drop every recorded sample."""
+
+
+class Counter(_Metric):
+    type_name = "counter"
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> Dict[LabelValues, float]:
+        with self._lock:
+            return dict(self._values)
+
+    def merge(self, total: Dict[LabelValues, Any], other: Any) -> None:
+        for key, value in other:
+            key = tuple(key)
+            total[key] = total.get(key, 0.0) + value
+
+    def render(
+        self, samples: Optional[Dict[LabelValues, float]] = None
+    ) -> List[str]:
+        if samples is None:
+            samples = self.samples()
+        items = sorted(samples.items())
+        lines = self.header()
+        for key, value in items:
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}{labels} {_format_value(value)}")
+        return lines
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Gauge(_Metric):
+    """
+    Gauge with optional scrape-time callback.
+
+    The callback returns ``{label_values_tuple: value}`` and replaces the
+    stored samples whenever the registry is rendered.
+    """
+
+    type_name = "gauge"
+
+    def __init__(
+        self,
+        *args,
+        callback: Optional[Callable[[], Dict[LabelValues, float]]] = None,
+        **kwargs,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self._values: Dict[LabelValues, float] = {}
+        self.callback = callback
+
+    def set(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def render(self) -> List[str]:
+        if self.callback is not None:
+            try:
+                samples = dict(self.callback())
+            except Exception:
+                samples = {}
+            with self._lock:
+                self._values = samples
+        with self._lock:
+            items = sorted(self._values.items())
+        lines = self.header()
+        for key, value in items:
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}{labels} {_format_value(value)}")
+        return lines
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Histogram(_Metric):
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        *args,
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+        **kwargs,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts..., sum, count]
+        self._values: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = [0.0] * (len(self.buckets) + 2)
+                self._values[key] = state
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[i] += 1
+                    break
+            state[-2] += value
+            state[-1] += 1
+
+    @contextmanager
+    def time(self, **labels) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels) -> float:
+        with self._lock:
+            state = self._values.get(self._key(labels))
+            return state[-1] if state else 0.0
+
+    def total(self, **labels) -> float:
+        with self._lock:
+            state = self._values.get(self._key(labels))
+            return state[-2] if state else 0.0
+
+    def samples(self) -> Dict[LabelValues, List[float]]:
+        with self._lock:
+            return {key: list(state) for key, state in self._values.items()}
+
+    def merge(self, total: Dict[LabelValues, Any], other: Any) -> None:
+        for key, state in other:
+            key = tuple(key)
+            current = total.get(key)
+            if current is None:
+                total[key] = list(state)
+            elif len(current) == len(state):
+                total[key] = [a + b for a, b in zip(current, state)]
+
+    def render(
+        self, samples: Optional[Dict[LabelValues, List[float]]] = None
+    ) -> List[str]:
+        if samples is None:
+            samples = self.samples()
+        items = sorted(samples.items())
+        lines = self.header()
+        names = self.labelnames + ("le",)
+        for key, state in items:
+            cumulative = 0.0
+            for bound, bucket_count in zip(self.buckets, state):
+                cumulative += bucket_count
+                labels = _format_labels(names, key + (_format_value(bound),))
+                lines.append(
+                    f"{self.name}_bucket{labels} {_format_value(cumulative)}"
+                )
+            labels = _format_labels(names, key + ("+Inf",))
+            lines.append(
+                f"{self.name}_bucket{labels} {_format_value(state[-1])}"
+            )
+            base = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{base} {_format_value(state[-2])}")
+            lines.append(
+                f"{self.name}_count{base} {_format_value(state[-1])}"
+            )
+        return lines
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Registry:
+    """Get-or-create registry so module reloads do not duplicate metrics."""
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name: str, *args, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = cls(name, *args, **kwargs)
+                self._metrics[name] = metric
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric {name} already registered")
+            return metric
+
+    def counter(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> Counter:
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        callback: Optional[Callable[[], Dict[LabelValues, float]]] = None,
+    ) -> Gauge:
+        gauge = self._get_or_create(Gauge, name, documentation, labelnames)
+        if callback is not None:
+            gauge.callback = callback
+        return gauge
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._get_or_create(
+            Histogram, name, documentation, labelnames, buckets=buckets
+        )
+
+    def get(self, name: str) -> Optional[_Metric]:
+        with self._lock:
+            return self._metrics.get(name)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+        directory = get_snapshot_dir()
+        merged = self._merge_snapshots(directory) if directory else {}
+        lines: List[str] = []
+        for metric in metrics:
+            if isinstance(metric, (Counter, Histogram)) and directory:
+                lines.extend(metric.render(merged.get(metric.name, {})))
+            else:
+                lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self) -> Dict[str, list]:
+        """This process's counters and histograms, JSON-ready."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return {
+            metric.name: [
+                [list(key), value] for key, value in metric.samples().items()
+            ]
+            for metric in metrics
+            if isinstance(metric, (Counter, Histogram))
+        }
+
+    def write_snapshot(self, directory: Path) -> None:
+        secure_write_json(directory / f"{os.getpid()}.json", self.snapshot())
+
+    def _merge_snapshots(self, directory: Path) -> Dict[str, Dict]:
+        # Include this process's latest samples, not its last snapshot
+        self.write_snapshot(directory)
+        merged: Dict[str, Dict] = {}
+        for path in directory.glob("*.json"):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                continue
+            for name, samples in data.items():
+                metric = self.get(name)
+                if isinstance(metric, (Counter, Histogram)):
+                    metric.merge(merged.setdefault(name, {}), samples)
+        return merged
+
+    def reset(self) -> None:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            metric.reset()
+
+
+REGISTRY = Registry()
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+STORE_OPERATIONS = REGISTRY.counter(
+    "judicor_store_operations_total",
+    "Store operations by store, operation and outcome.",
+    ["store", "operation", "outcome"],
+)
+STORE_DURATION = REGISTRY.histogram(
+    "judicor_store_operation_duration_seconds",
+    "Store operation latency in seconds.",
+    ["store", "operation"],
+)
+TIMELINE_SIZE = REGISTRY.histogram(
+    "judicor_timeline_events",
+    "Number of events in a timeline after each append.",
+    buckets=(1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000),
+)
+AI_REQUESTS = REGISTRY.counter(
+    "judicor_ai_requests_total",
+    "Reasoner calls by agent role and outcome.",
+    ["role", "outcome"],
+)
+AI_DURATION = REGISTRY.histogram(
+    "judicor_ai_request_duration_seconds",
+    "Reasoner call latency in seconds by agent role.",
+    ["role"],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0),
+)
+AI_BATCH_SIZE = REGISTRY.histogram(
+    "judicor_ai_batch_items",
+    "Items answered per batched reasoner call, by role.",
+    ["role"],
+    buckets=(1, 2, 5, 10, 20, 50, 100),
+)
+AI_TIME_TO_FIRST_TOKEN = REGISTRY.histogram(
+    "judicor_ai_time_to_first_token_seconds",
+    "Latency until a streaming reasoner emits its first chunk, by role.",
+    ["role"],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+
+
+def instrument_store(store: str, operation: str):
+    """Decorator counting and timing a store function."""
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            outcome = "error"
+            try:
+                result = func(*args, **kwargs)
+                outcome = "ok"
+                return result
+            finally:
+                STORE_DURATION.observe(
+                    time.perf_counter() - start,
+                    store=store,
+                    operation=operation,
+                )
+                STORE_OPERATIONS.inc(
+                    store=store, operation=operation, outcome=outcome
+                )
+
+        return wrapper
+
+    return decorator
+
+
+def render() -> str:
+    return REGISTRY.render()
+
+
+def get_snapshot_dir() -> Optional[Path]:
+    raw = os.getenv("JUDICOR_METRICS_DIR")
+    return Path(raw) if raw else None
+
+
+def clear_snapshots(directory: Path) -> None:
+    """Drop snapshots left by a previous run (call before workers start)."""
+    if directory.exists():
+        for path in directory.glob("*.json"):
+            path.unlink(missing_ok=True)
+
+
+class SnapshotWriter:
+    """Background thread writing ``REGISTRY`` snapshots periodically."""
+
+    def __init__(self, directory: Path, interval: float) -> None:
+        self.directory = directory
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="judicor-metrics-snapshot", daemon=True
+        )
+
+    def start(self) -> "SnapshotWriter":
+        ensure_dir(self.directory)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+        REGISTRY.write_snapshot(self.directory)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                REGISTRY.write_snapshot(self.directory)
+            except OSError:
+                pass
+
+
+def start_snapshots() -> Optional[SnapshotWriter]:
+    """Start snapshotting if `JUDICOR_METRICS_DIR` is set."""
+    directory = get_snapshot_dir()
+    if directory is None:
+        return None
+    raw = os.getenv("JUDICOR_METRICS_SNAPSHOT_SECONDS")
+    try:
+        interval = float(raw) if raw else DEFAULT_SNAPSHOT_SECONDS
+    except ValueError:
+        interval = DEFAULT_SNAPSHOT_SECONDS
+    return SnapshotWriter(directory, max(interval, 0.1)).start()
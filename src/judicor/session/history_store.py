@@ -1,11 +1,18 @@
 import json
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from judicor.ai.roles import AgentRole
-from judicor.session.utils import ensure_dir, parse_dt, secure_write_json
+from judicor.observability.metrics import instrument_store
+from judicor.session.utils import (
+    ensure_dir,
+    file_lock,
+    file_version,
+    parse_dt,
+    secure_write_json,
+)
 
 BASE_DIR = Path.home() / ".judicor" / "incidents"
 
@@ -37,21 +44,37 @@ def _history_path(incident_id: int) -> Path:
     return BASE_DIR / str(incident_id) / "history.json"
 
 
-def append_entry(incident_id: int, role: AgentRole, content: str) -> None:
-    entries = load_history(incident_id)
-    entry = HistoryEntry(
-        incident_id=incident_id,
-        role=role,
-        content=content,
-        timestamp=datetime.now(timezone.utc),
+@dataclass
+class SummaryCheckpoint:
+    summary: str
+    # Number of history entries, from the start, the summary covers
+    covered: int = 0
+    updated_at: datetime = field(
+        default_factory=lambda: datetime.now(timezone.utc)
     )
-    entries.append(entry)
 
+
+@instrument_store("history", "append_entry")
+def append_entry(incident_id: int, role: AgentRole, content: str) -> int:
+    """Append an entry and return the number of entries now stored."""
     path = _history_path(incident_id)
     ensure_dir(path.parent)
-    secure_write_json(path, [e.to_json() for e in entries])
 
+    with file_lock(path):
+        entries = load_history(incident_id)
+        entry = HistoryEntry(
+            incident_id=incident_id,
+            role=role,
+            content=content,
+            timestamp=datetime.now(timezone.utc),
+        )
+        entries.append(entry)
+
+        secure_write_json(path, [e.to_json() for e in entries])
+    return len(entries)
 
+
+@instrument_store("history", "load_history")
 def load_history(incident_id: int) -> List[HistoryEntry]:
     path = _history_path(incident_id)
     if not path.exists():
@@ -64,23 +87,73 @@ def load_history(incident_id: int) -> List[HistoryEntry]:
         return []
 
 
-def set_summary(incident_id: int, summary: str) -> None:
+def history_version(incident_id: int) -> Optional[Tuple[int, int, int]]:
+    return file_version(_history_path(incident_id))
+
+
+@instrument_store("history", "set_summary")
+def set_summary(
+    incident_id: int, summary: str, covered: Optional[int] = None
+) -> bool:
+    """
+    Store the summary and its checkpoint: ``covered`` is the number of
+    history entries it accounts for (``None`` keeps the previous one).
+
+    The checkpoint never moves backwards: a write covering fewer entries
+    than the stored summary (e.g. a background summarizer finishing after
+    a resolution was recorded) is refused and False is returned.
+    """
     path = _summary_path(incident_id)
     ensure_dir(path.parent)
-    secure_write_json(path, {"summary": summary})
+    with file_lock(path):
+        previous = load_checkpoint(incident_id)
+        stored = previous.covered if previous else 0
+        if covered is None:
+            covered = stored
+        elif covered < stored:
+            return False
+        secure_write_json(
+            path,
+            {
+                "summary": summary,
+                "covered": covered,
+                "updated_at": datetime.now(timezone.utc).isoformat(),
+            },
+        )
+    return True
 
 
+@instrument_store("history", "load_summary")
 def load_summary(incident_id: int) -> Optional[str]:
+    checkpoint = load_checkpoint(incident_id)
+    return checkpoint.summary if checkpoint else None
+
+
+def load_checkpoint(incident_id: int) -> Optional[SummaryCheckpoint]:
     path = _summary_path(incident_id)
     if not path.exists():
         return None
     try:
         with open(path, encoding="utf-8") as f:
             data = json.load(f)
-        return data.get("summary")
+        return SummaryCheckpoint(
+            summary=data["summary"],
+            # Summaries written before checkpoints cover nothing yet
+            covered=int(data.get("covered", 0)),
+            updated_at=parse_dt(data.get("updated_at")),
+        )
     except Exception:
         return None
 
 
+def entries_since(incident_id: int, covered: int) -> List[HistoryEntry]:
+    """History entries not yet covered by a checkpoint at ``covered``."""
+    return load_history(incident_id)[covered:]
+
+
+def summary_version(incident_id: int) -> Optional[Tuple[int, int, int]]:
+    return file_version(_summary_path(incident_id))
+
+
 def _summary_path(incident_id: int) -> Path:
     return BASE_DIR / str(incident_id) / "summary.json"
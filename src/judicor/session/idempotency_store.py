@@ -0,0 +1,151 @@
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from judicor.observability.metrics import instrument_store
+from judicor.session.utils import (
+    ensure_dir,
+    file_lock,
+    lock_path_for,
+    secure_write_json,
+)
+
+BASE_DIR = Path.home() / ".judicor" / "idempotency"
+
+DEFAULT_TTL_SECONDS = 24 * 3600
+DEFAULT_MAX_ENTRIES = 10_000
+PRUNE_EVERY = 100
+
+_saves_since_prune = 0
+
+
+def get_ttl_seconds() -> int:
+    raw = os.getenv("JUDICOR_IDEMPOTENCY_TTL_SECONDS")
+    try:
+        return int(raw) if raw else DEFAULT_TTL_SECONDS
+    except ValueError:
+        return DEFAULT_TTL_SECONDS
+
+
+def get_max_entries() -> int:
+    raw = os.getenv("JUDICOR_IDEMPOTENCY_MAX_ENTRIES")
+    try:
+        return int(raw) if raw else DEFAULT_MAX_ENTRIES
+    except ValueError:
+        return DEFAULT_MAX_ENTRIES
+
+
+def make_key(*parts: str) -> str:
+    """Hash the scoping parts (client, route, header value) to a file key."""
+    raw = "\x1f".join(parts)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _entry_path(key: str) -> Path:
+    return BASE_DIR / f"{key}.json"
+
+
+def try_lock(key: str):
+    """
+    Claim a key for the duration of a request.
+
+    Non-blocking: raises ``BlockingIOError`` while another request (in any
+    worker) is still processing the same key.
+    """
+    return file_lock(_entry_path(key), blocking=False)
+
+
+@instrument_store("idempotency", "load_response")
+def load_response(key: str) -> Optional[Dict[str, Any]]:
+    """Return the stored entry, or None if missing, corrupt or expired."""
+    path = _entry_path(key)
+    if not path.exists():
+        return None
+    try:
+        with open(path, encoding="utf-8") as f:
+            entry = json.load(f)
+    except Exception:
+        return None
+
+    if time.time() - float(entry.get("stored_at", 0)) > get_ttl_seconds():
+        # Callers hold the key's lock (`try_lock`)
+        _remove(path)
+        return None
+    return entry
+
+
+@instrument_store("idempotency", "save_response")
+def save_response(key: str, request_hash: str, response: Any) -> None:
+    global _saves_since_prune
+
+    ensure_dir(BASE_DIR)
+    secure_write_json(
+        _entry_path(key),
+        {
+            "request_hash": request_hash,
+            "response": response,
+            "stored_at": time.time(),
+        },
+    )
+
+    _saves_since_prune += 1
+    if _saves_since_prune >= PRUNE_EVERY:
+        _saves_since_prune = 0
+        prune()
+
+
+@instrument_store("idempotency", "prune")
+def prune() -> int:
+    """
+    Drop expired entries, then the oldest ones beyond the size bound.
+
+    Returns the number of entries removed.
+    """
+    if not BASE_DIR.exists():
+        return 0
+
+    ttl = get_ttl_seconds()
+    now = time.time()
+    entries = []
+    removed = 0
+    for path in BASE_DIR.glob("*.json"):
+        try:
+            mtime = path.stat().st_mtime
+        except FileNotFoundError:
+            continue
+        if now - mtime > ttl:
+            removed += _remove_unlocked(path)
+        else:
+            entries.append((mtime, path))
+
+    overflow = len(entries) - get_max_entries()
+    if overflow > 0:
+        entries.sort()
+        for _, path in entries[:overflow]:
+            removed += _remove_unlocked(path)
+    return removed
+
+
+def _remove_unlocked(path: Path) -> int:
+    """Remove an entry unless a request (in any worker) holds its key."""
+    try:
+        with file_lock(path, blocking=False):
+            return _remove(path)
+    except BlockingIOError:
+        return 0
+
+
+def _remove(path: Path) -> int:
+    """Remove an entry and its lock file; the caller holds the lock."""
+    try:
+        lock_path_for(path).unlink()
+    except FileNotFoundError:
+        pass
+    try:
+        path.unlink()
+        return 1
+    except FileNotFoundError:
+        return 0
@@ -5,7 +5,8 @@ from typing import Dict, List, Optional
 
 from judicor.domain.models import Incident, IncidentState
 from judicor.domain.state import transition_incident_state
-from judicor.session.utils import parse_dt, secure_write_json
+from judicor.observability.metrics import instrument_store
+from judicor.session.utils import file_lock, parse_dt, secure_write_json
 
 BASE_DIR = Path.home() / ".judicor" / "incidents"
 
@@ -14,14 +15,67 @@ def _incident_path(incident_id: int) -> Path:
     return BASE_DIR / str(incident_id) / "incident.json"
 
 
+def _counts_path() -> Path:
+    return BASE_DIR / "state_counts.json"
+
+
+@instrument_store("incident", "save_incident")
 def save_incident(incident: Incident) -> None:
     payload = asdict(incident)
     payload["state"] = incident.state.value
     payload["created_at"] = incident.created_at.isoformat()
     payload["updated_at"] = incident.updated_at.isoformat()
-    secure_write_json(_incident_path(incident.id), payload)
+    path = _incident_path(incident.id)
+    # The per-state counts move with the record they describe
+    with file_lock(_counts_path()):
+        try:
+            previous = _read_incident(path).state.value
+        except Exception:
+            previous = None
+        secure_write_json(path, payload)
+        counts = _read_counts()
+        if counts is not None and previous != payload["state"]:
+            if previous is not None:
+                counts[previous] = max(0, counts.get(previous, 0) - 1)
+            counts[payload["state"]] = counts.get(payload["state"], 0) + 1
+            secure_write_json(_counts_path(), counts)
+
+
+def count_by_state() -> Dict[str, int]:
+    """
+    Incidents per state value, kept current by `save_incident` so a
+    metrics scrape costs one small read rather than a full listing.
+    Rebuilt from the records when the counts file is missing or corrupt.
+    Left uninstrumented so scrapes do not show up as store traffic.
+    """
+    if not BASE_DIR.exists():
+        return {}
+    counts = _read_counts()
+    if counts is None:
+        with file_lock(_counts_path()):
+            counts = _read_counts()
+            if counts is None:
+                counts = {}
+                for path in BASE_DIR.glob("*/incident.json"):
+                    try:
+                        state = _read_incident(path).state.value
+                    except Exception:
+                        continue
+                    counts[state] = counts.get(state, 0) + 1
+                secure_write_json(_counts_path(), counts)
+    return counts
+
+
+def _read_counts() -> Optional[Dict[str, int]]:
+    try:
+        with open(_counts_path(), encoding="utf-8") as f:
+            data = json.load(f)
+        return {str(k): int(v) for k, v in data.items()}
+    except (OSError, ValueError, AttributeError, TypeError):
+        return None
 
 
+@instrument_store("incident", "load_incident")
 def load_incident(incident_id: int) -> Optional[Incident]:
     path = _incident_path(incident_id)
     if not path.exists():
@@ -32,6 +86,7 @@ def load_incident(incident_id: int) -> Optional[Incident]:
         return None
 
 
+@instrument_store("incident", "list_incidents")
 def list_incidents() -> List[Incident]:
     if not BASE_DIR.exists():
         return []
@@ -45,16 +100,56 @@ def list_incidents() -> List[Incident]:
     return incidents
 
 
-def create_incident(title: str, initial_state: IncidentState) -> Incident:
-    incident_id = _next_incident_id()
-    incident = Incident(id=incident_id, title=title, state=initial_state)
-    save_incident(incident)
+@instrument_store("incident", "incident_exists")
+def incident_exists(incident_id: int) -> bool:
+    return _incident_path(incident_id).exists()
+
+
+@instrument_store("incident", "has_incidents")
+def has_incidents() -> bool:
+    """Cheap emptiness check: stops at the first incident found."""
+    if not BASE_DIR.exists():
+        return False
+    return next(BASE_DIR.glob("*/incident.json"), None) is not None
+
+
+@instrument_store("incident", "create_incident")
+def create_incident(
+    title: str,
+    initial_state: IncidentState,
+    fingerprint: Optional[str] = None,
+) -> Incident:
+    # ID allocation and the first write happen under one lock so
+    # concurrent workers never hand out the same incident ID.
+    with file_lock(BASE_DIR / "incident_ids"):
+        incident_id = _next_incident_id()
+        incident = Incident(
+            id=incident_id,
+            title=title,
+            state=initial_state,
+            fingerprint=fingerprint,
+        )
+        save_incident(incident)
     return incident
 
 
+@instrument_store("incident", "update_state")
 def update_state(incident: Incident, target: IncidentState) -> Incident:
-    transition_incident_state(incident, target)
-    save_incident(incident)
+    """
+    Transition ``incident`` to ``target`` and save it.
+
+    The stored record is re-read under its lock and the transition is
+    validated against it, so a worker holding a stale copy cannot undo
+    another worker's change (e.g. re-open a resolved incident). Raises
+    ValueError for an illegal transition; ``incident`` is updated in
+    place to what was saved.
+    """
+    with file_lock(_incident_path(incident.id)):
+        current = load_incident(incident.id) or incident
+        transition_incident_state(current, target)
+        save_incident(current)
+    incident.state = current.state
+    incident.updated_at = current.updated_at
     return incident
 
 
@@ -70,6 +165,7 @@ def _deserialize_incident(data: Dict) -> Incident:
         state=IncidentState(data.get("state", IncidentState.CREATED.value)),
         created_at=parse_dt(data.get("created_at")),
         updated_at=parse_dt(data.get("updated_at")),
+        fingerprint=data.get("fingerprint"),
     )
 
 
@@ -0,0 +1,167 @@
+import json
+import os
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from judicor.observability.metrics import instrument_store
+from judicor.session.utils import ensure_dir, parse_dt, secure_write_json
+
+BASE_DIR = Path.home() / ".judicor" / "jobs"
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+FINISHED_STATUSES = (SUCCEEDED, FAILED)
+
+ABANDONED = "Job abandoned: the control-plane worker running it stopped"
+
+
+@dataclass
+class Job:
+    id: str
+    incident_id: int
+    question: str
+    status: str = QUEUED
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    # Answer text streamed so far while the job is running
+    partial: str = ""
+    created_at: datetime = field(
+        default_factory=lambda: datetime.now(timezone.utc)
+    )
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    # Process that queued and runs the job, and its last save
+    worker: Optional[int] = field(default_factory=os.getpid)
+    updated_at: Optional[datetime] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATUSES
+
+    def to_json(self) -> dict:
+        data = asdict(self)
+        for name in ("created_at", "started_at", "finished_at", "updated_at"):
+            value = getattr(self, name)
+            data[name] = value.isoformat() if value else None
+        return data
+
+    @staticmethod
+    def from_json(data: dict) -> "Job":
+        return Job(
+            id=data["id"],
+            incident_id=int(data["incident_id"]),
+            question=data["question"],
+            status=data.get("status", QUEUED),
+            result=data.get("result"),
+            error=data.get("error"),
+            partial=data.get("partial", ""),
+            created_at=parse_dt(data.get("created_at")),
+            started_at=(
+                parse_dt(data["started_at"])
+                if data.get("started_at")
+                else None
+            ),
+            finished_at=(
+                parse_dt(data["finished_at"])
+                if data.get("finished_at")
+                else None
+            ),
+            worker=data.get("worker"),
+            updated_at=(
+                parse_dt(data["updated_at"])
+                if data.get("updated_at")
+                else None
+            ),
+        )
+
+
+def _job_path(job_id: str) -> Path:
+    return BASE_DIR / f"{job_id}.json"
+
+
+@instrument_store("job", "save_job")
+def save_job(job: Job) -> None:
+    ensure_dir(BASE_DIR)
+    job.updated_at = datetime.now(timezone.utc)
+    secure_write_json(_job_path(job.id), job.to_json())
+
+
+@instrument_store("job", "load_job")
+def load_job(job_id: str) -> Optional[Job]:
+    path = _job_path(job_id)
+    if not path.exists():
+        return None
+    try:
+        with open(path, encoding="utf-8") as f:
+            return Job.from_json(json.load(f))
+    except Exception:
+        return None
+
+
+def _worker_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def is_abandoned(job: Job, lease_seconds: int) -> bool:
+    """
+    True for an unfinished job that nobody will finish: its worker process
+    is gone, or it has not been saved for ``lease_seconds``.
+    """
+    if job.finished:
+        return False
+    if job.worker is not None and not _worker_alive(job.worker):
+        return True
+    last = job.updated_at or job.created_at
+    age = (datetime.now(timezone.utc) - last).total_seconds()
+    return age > lease_seconds
+
+
+def fail_if_abandoned(job: Job, lease_seconds: int) -> Job:
+    """Persist an abandoned job as failed so pollers stop waiting."""
+    if is_abandoned(job, lease_seconds):
+        job.status = FAILED
+        job.error = ABANDONED
+        job.partial = ""
+        job.finished_at = datetime.now(timezone.utc)
+        save_job(job)
+    return job
+
+
+def fail_abandoned(lease_seconds: int) -> int:
+    """Fail every abandoned job on disk; return how many were failed."""
+    if not BASE_DIR.exists():
+        return 0
+    failed = 0
+    for path in BASE_DIR.glob("*.json"):
+        job = load_job(path.stem)
+        if job is not None and is_abandoned(job, lease_seconds):
+            fail_if_abandoned(job, lease_seconds)
+            failed += 1
+    return failed
+
+
+def prune(max_age_seconds: int) -> int:
+    """Remove job files older than ``max_age_seconds``."""
+    if not BASE_DIR.exists():
+        return 0
+    cutoff = time.time() - max_age_seconds
+    removed = 0
+    for path in BASE_DIR.glob("*.json"):
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+                removed += 1
+        except FileNotFoundError:
+            continue
+    return removed
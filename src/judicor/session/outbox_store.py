@@ -0,0 +1,155 @@
+# src/judicor/session/outbox_store.py
+
+import hashlib
+import json
+import os
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from judicor.observability.metrics import instrument_store
+from judicor.session.utils import ensure_dir, parse_dt, secure_write_json
+
+BASE_DIR = Path.home() / ".judicor" / "outbox"
+
+
+def key_id(api_key: str) -> str:
+    """Identity of an API key that is safe to store: a short hash."""
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+
+
+def target_id(base_url: str, api_key_id: str) -> str:
+    """Tag for one (control plane, API key) pair, used in entry names."""
+    material = f"{base_url.rstrip('/')}\n{api_key_id}"
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()[:12]
+
+
+@dataclass
+class OutboxEntry:
+    """
+    A control-plane mutation waiting to be sent.
+
+    ``base_url`` and ``key_id`` record where and as whom it was queued:
+    idempotency records are scoped per API key, so replaying an entry to
+    another plane or under another key could apply it twice.
+    """
+
+    id: str
+    path: str
+    payload: Dict[str, Any]
+    idempotency_key: str
+    base_url: str = ""
+    key_id: str = ""
+    created_at: datetime = field(
+        default_factory=lambda: datetime.now(timezone.utc)
+    )
+    attempts: int = 0
+    last_error: Optional[str] = None
+
+    @property
+    def target(self) -> str:
+        return target_id(self.base_url, self.key_id)
+
+    def to_json(self) -> dict:
+        data = asdict(self)
+        data["created_at"] = self.created_at.isoformat()
+        return data
+
+    @staticmethod
+    def from_json(data: dict) -> "OutboxEntry":
+        return OutboxEntry(
+            id=data["id"],
+            path=data["path"],
+            payload=data.get("payload") or {},
+            idempotency_key=data["idempotency_key"],
+            base_url=data.get("base_url", ""),
+            key_id=data.get("key_id", ""),
+            created_at=parse_dt(data.get("created_at")),
+            attempts=int(data.get("attempts", 0)),
+            last_error=data.get("last_error"),
+        )
+
+
+def _entry_path(entry_id: str) -> Path:
+    return BASE_DIR / f"{entry_id}.json"
+
+
+@instrument_store("outbox", "enqueue")
+def enqueue(
+    path: str,
+    payload: Dict[str, Any],
+    idempotency_key: str,
+    base_url: str,
+    api_key_id: str,
+) -> OutboxEntry:
+    # Time-ordered IDs keep file-name order equal to enqueue order; the
+    # target tag lets a flush pick its own entries from the listing.
+    target = target_id(base_url, api_key_id)
+    entry = OutboxEntry(
+        id=f"{time.time_ns():020d}-{target}-{uuid.uuid4().hex[:8]}",
+        path=path,
+        payload=payload,
+        idempotency_key=idempotency_key,
+        base_url=base_url,
+        key_id=api_key_id,
+    )
+    ensure_dir(BASE_DIR)
+    secure_write_json(_entry_path(entry.id), entry.to_json())
+    return entry
+
+
+@instrument_store("outbox", "pending")
+def pending(
+    limit: Optional[int] = None, target: Optional[str] = None
+) -> List[OutboxEntry]:
+    """Queued entries (only ``target``'s if given), oldest first."""
+    entries: List[OutboxEntry] = []
+    for name in _entry_names(target)[:limit]:
+        try:
+            with open(BASE_DIR / name, encoding="utf-8") as f:
+                entries.append(OutboxEntry.from_json(json.load(f)))
+        except (FileNotFoundError, ValueError, KeyError):
+            continue
+    return entries
+
+
+def size(target: Optional[str] = None) -> int:
+    return len(_entry_names(target))
+
+
+@instrument_store("outbox", "update")
+def update(entry: OutboxEntry) -> None:
+    secure_write_json(_entry_path(entry.id), entry.to_json())
+
+
+@instrument_store("outbox", "remove")
+def remove(entry_id: str) -> None:
+    try:
+        _entry_path(entry_id).unlink()
+    except FileNotFoundError:
+        pass
+
+
+@instrument_store("outbox", "dead_letter")
+def dead_letter(entry: OutboxEntry) -> None:
+    """Move an entry the server rejected to ``failed/`` for inspection."""
+    failed_dir = BASE_DIR / "failed"
+    ensure_dir(failed_dir)
+    secure_write_json(failed_dir / f"{entry.id}.json", entry.to_json())
+    remove(entry.id)
+
+
+def _entry_names(target: Optional[str] = None) -> List[str]:
+    if not BASE_DIR.exists():
+        return []
+    tag = f"-{target}-" if target else ""
+    return sorted(
+        name
+        for name in os.listdir(BASE_DIR)
+        if name.endswith(".json")
+        and not name.startswith(".")
+        and tag in name
+    )
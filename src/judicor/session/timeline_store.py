@@ -2,9 +2,15 @@ import json
 from dataclasses import asdict, dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import List
+from typing import List, Optional, Tuple
 
-from judicor.session.utils import ensure_dir, secure_write_json
+from judicor.observability.metrics import TIMELINE_SIZE, instrument_store
+from judicor.session.utils import (
+    ensure_dir,
+    file_lock,
+    file_version,
+    secure_write_json,
+)
 
 BASE_DIR = Path.home() / ".judicor" / "incidents"
 
@@ -35,23 +41,27 @@ def _timeline_path(incident_id: int) -> Path:
     return BASE_DIR / str(incident_id) / "timeline.json"
 
 
+@instrument_store("timeline", "append_event")
 def append_event(incident_id: int, event_type: str, message: str) -> None:
     ensure_dir(BASE_DIR)
     path = _timeline_path(incident_id)
     ensure_dir(path.parent)
 
-    events = load_timeline(incident_id)
-    event = TimelineEvent(
-        incident_id=incident_id,
-        event_type=event_type,
-        message=message,
-        timestamp=datetime.now(timezone.utc),
-    )
-    events.append(event)
+    with file_lock(path):
+        events = load_timeline(incident_id)
+        event = TimelineEvent(
+            incident_id=incident_id,
+            event_type=event_type,
+            message=message,
+            timestamp=datetime.now(timezone.utc),
+        )
+        events.append(event)
 
-    secure_write_json(path, [e.to_json() for e in events])
+        secure_write_json(path, [e.to_json() for e in events])
+    TIMELINE_SIZE.observe(len(events))
 
 
+@instrument_store("timeline", "load_timeline")
 def load_timeline(incident_id: int) -> List[TimelineEvent]:
     path = _timeline_path(incident_id)
     if not path.exists():
@@ -63,3 +73,7 @@ def load_timeline(incident_id: int) -> List[TimelineEvent]:
         return [TimelineEvent.from_json(item) for item in data]
     except Exception:
         return []
+
+
+def timeline_version(incident_id: int) -> Optional[Tuple[int, int, int]]:
+    return file_version(_timeline_path(incident_id))
@@ -1,7 +1,15 @@
 import json
+import os
+import tempfile
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator, Optional, Tuple
+
+try:  # POSIX only; locking degrades to a no-op elsewhere
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None
 
 
 def ensure_dir(path: Path, mode: int = 0o700) -> None:
@@ -13,13 +21,74 @@ def ensure_dir(path: Path, mode: int = 0o700) -> None:
 
 
 def secure_write_json(path: Path, data: Any, mode: int = 0o600) -> None:
+    """
+    Atomically replace ``path`` with the JSON encoding of ``data``.
+
+    The payload is written to a temp file in the same directory and then
+    renamed over the target, so concurrent readers (and other worker
+    processes) never observe a half-written file.
+    """
     ensure_dir(path.parent)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
+    fd, tmp_name = tempfile.mkstemp(
+        dir=path.parent, prefix=f".{path.name}.", suffix=".tmp"
+    )
     try:
-        path.chmod(mode)
-    except PermissionError:
-        pass
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        try:
+            os.chmod(tmp_name, mode)
+        except PermissionError:
+            pass
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def lock_path_for(path: Path) -> Path:
+    return path.parent / f".{path.name}.lock"
+
+
+@contextmanager
+def file_lock(path: Path, blocking: bool = True) -> Iterator[None]:
+    """
+    Hold an exclusive advisory lock guarding ``path``.
+
+    Used around read-modify-write cycles so several control-plane worker
+    processes can share the same store directory without losing updates.
+    With ``blocking=False`` a held lock raises ``BlockingIOError`` instead
+    of waiting.
+    """
+    lock_path = lock_path_for(path)
+    ensure_dir(lock_path.parent)
+    with open(lock_path, "a", encoding="utf-8") as handle:
+        if fcntl is not None:
+            flags = fcntl.LOCK_EX
+            if not blocking:
+                flags |= fcntl.LOCK_NB
+            fcntl.flock(handle.fileno(), flags)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+
+def file_version(path: Path) -> Optional[Tuple[int, int, int]]:
+    """
+    Cheap change marker (inode, mtime_ns, size) for caching data derived
+    from ``path``; ``None`` when it does not exist. Writes replace files
+    atomically, so the inode changes even when a rewrite lands within
+    the filesystem's mtime resolution with the same size.
+    """
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
 
 
 def parse_dt(value) -> datetime:
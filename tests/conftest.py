@@ -1,11 +1,55 @@
 import pytest
 
+import judicor.ai.fallback as fallback
+import judicor.ai.limiter as limiter
+import judicor.ai.providers as providers
+import judicor.ai.similar as similar
+import judicor.ai.summary as summary
 import judicor.session.store as session_store
 import judicor.identity.store as identity_store
 import judicor.session.timeline_store as timeline_store
 import judicor.session.incident_store as incident_store
 import judicor.session.history_store as history_store
+import judicor.session.idempotency_store as idempotency_store
+import judicor.session.job_store as job_store
+import judicor.session.outbox_store as outbox_store
+import judicor.control_plane.alerts as alerts
 import judicor.control_plane.app as control_plane_app
+import judicor.control_plane.limits as limits
+
+
+@pytest.fixture(autouse=True)
+def flush_background_summaries(monkeypatch):
+    # Depends on monkeypatch so deferred summaries are written while the
+    # temp store paths are still patched in.
+    yield
+    summary.flush_all(timeout=5)
+
+
+@pytest.fixture(autouse=True)
+def reset_shared_ai_clients():
+    # Stub SDK clients installed by one test must not leak into the next
+    providers.reset_shared_clients()
+    yield
+    providers.reset_shared_clients()
+
+
+@pytest.fixture(autouse=True)
+def reset_ai_breakers():
+    # Circuit breakers are process-wide, like the providers they guard
+    fallback.reset_breakers()
+    yield
+    fallback.reset_breakers()
+
+
+@pytest.fixture(autouse=True)
+def temp_similar_index(monkeypatch, tmp_path):
+    # Investigator and analyzer prompts query the index, and a missing
+    # index is backfilled on first use; keep it out of the home dir.
+    monkeypatch.setattr(similar, "BASE_DIR", tmp_path / ".judicor" / "index")
+    similar.reset()
+    yield similar
+    similar.reset()
 
 
 @pytest.fixture
@@ -49,6 +93,27 @@ def temp_history_store(monkeypatch, tmp_path):
     return history_store
 
 
+@pytest.fixture
+def temp_limits_store(monkeypatch, tmp_path):
+    base = tmp_path / ".judicor" / "limits"
+    monkeypatch.setattr(limiter, "BASE_DIR", base)
+    return limiter
+
+
+@pytest.fixture
+def temp_rate_limit_store(monkeypatch, tmp_path):
+    base = tmp_path / ".judicor" / "ratelimits"
+    monkeypatch.setattr(limits, "BASE_DIR", base)
+    return limits
+
+
+@pytest.fixture
+def temp_outbox_store(monkeypatch, tmp_path):
+    base = tmp_path / ".judicor" / "outbox"
+    monkeypatch.setattr(outbox_store, "BASE_DIR", base)
+    return outbox_store
+
+
 @pytest.fixture
 def temp_control_plane_storage(monkeypatch, tmp_path):
     base = tmp_path / ".judicor" / "incidents"
@@ -59,4 +124,13 @@ def temp_control_plane_storage(monkeypatch, tmp_path):
     monkeypatch.setattr(control_plane_app.incident_store, "BASE_DIR", base)
     monkeypatch.setattr(control_plane_app.timeline_store, "BASE_DIR", base)
     monkeypatch.setattr(control_plane_app.history_store, "BASE_DIR", base)
+    monkeypatch.setattr(
+        idempotency_store, "BASE_DIR", base.parent / "idempotency"
+    )
+    monkeypatch.setattr(job_store, "BASE_DIR", base.parent / "jobs")
+    monkeypatch.setattr(outbox_store, "BASE_DIR", base.parent / "outbox")
+    monkeypatch.setattr(alerts, "BASE_DIR", base.parent / "alerts")
+    monkeypatch.setattr(limits, "BASE_DIR", base.parent / "ratelimits")
+    control_plane_app.alert_index.clear()
+    control_plane_app.rate_limiter.reset()
     return base
@@ -0,0 +1,137 @@
+from types import SimpleNamespace
+
+from judicor.ai.batch import ITEM_MISSING, split_batch_answer
+from judicor.ai.interface import AIReasoner
+from judicor.ai.implementations import gemini
+from judicor.ai.pipeline import (
+    ReasoningPipeline,
+    build_reasoners,
+    needs_triage,
+    triage_candidates,
+)
+from judicor.ai.roles import AgentRole
+from judicor.domain.models import Incident, IncidentState
+from judicor.domain.results import AskResult
+from judicor.observability.metrics import AI_BATCH_SIZE
+from judicor.session import history_store, incident_store
+
+
+def test_split_batch_answer_maps_numbers_back_to_items():
+    text = '```json\n{"2": "second", "1": " first ", "9": "extra"}\n```'
+
+    assert split_batch_answer(text, 3) == ["first", "second", ""]
+    assert split_batch_answer("not json", 2) == ["", ""]
+
+
+class _Models:
+    def __init__(self, replies):
+        self.replies = list(replies)
+        self.prompts = []
+
+    def generate_content(self, model, contents):
+        self.prompts.append(contents)
+        return SimpleNamespace(text=self.replies.pop(0))
+
+
+def test_gemini_batch_is_one_request_and_fails_missing_items(monkeypatch):
+    monkeypatch.setenv("GOOGLE_API_KEY", "test-key")
+    models = _Models(['{"1": "disk full", "3": "dns"}'])
+    reasoner = gemini.GeminiAIReasoner(
+        role=AgentRole.ANALYZER, client=SimpleNamespace(models=models)
+    )
+    items = [
+        (Incident(id=n, title=f"t{n}", state=IncidentState.ACTIVE), "new")
+        for n in (7, 8, 9)
+    ]
+
+    results = reasoner.ask_batch(items)
+
+    assert [result.answer for result in results] == ["disk full", None, "dns"]
+    assert results[1].message == ITEM_MISSING
+    assert len(models.prompts) == 1
+    assert "Item 3:\n- ID: 9" in models.prompts[0]
+
+
+class _BatchingReasoner(AIReasoner):
+    def __init__(self):
+        self.batches = []
+
+    def ask(self, incident, question):
+        return AskResult(success=True, answer=f"analysis {incident.id}")
+
+    def ask_batch(self, items):
+        self.batches.append([incident.id for incident, _ in items])
+        return [
+            self.ask(incident, question)
+            if incident.id % 5
+            else AskResult(success=False, message="upstream error")
+            for incident, question in items
+        ]
+
+
+def test_triage_batches_analyzer_calls_and_records_analyses(
+    monkeypatch,
+    temp_incident_store,
+    temp_history_store,
+    temp_timeline_store,
+):
+    monkeypatch.setenv("JUDICOR_TRIAGE_BATCH_SIZE", "4")
+    incidents = [
+        incident_store.create_incident(
+            title=f"alert {n}", initial_state=IncidentState.ACTIVE
+        )
+        for n in range(6)
+    ]
+    inner = _BatchingReasoner()
+    pipeline = ReasoningPipeline(build_reasoners(inner))
+    before = AI_BATCH_SIZE.count(role="analyzer")
+
+    assert triage_candidates() == incidents
+    results = pipeline.triage(incidents)
+
+    assert inner.batches == [[1, 2, 3, 4], [5, 6]]
+    assert AI_BATCH_SIZE.count(role="analyzer") == before + 2
+    assert [result.success for result in results] == [
+        True, True, True, True, False, True
+    ]
+    assert history_store.load_summary(3) == "analysis 3"
+    # The failed incident is picked up by the next triage run
+    assert [incident.id for incident in triage_candidates()] == [5]
+    assert not needs_triage(incidents[0])
+
+
+def test_triage_reasks_items_the_batch_skipped(
+    temp_incident_store, temp_history_store, temp_timeline_store
+):
+    class _Skipping(_BatchingReasoner):
+        asked = []
+
+        def ask(self, incident, question):
+            self.asked.append(incident.id)
+            return super().ask(incident, question)
+
+        def ask_batch(self, items):
+            return [
+                AskResult(success=False, message=ITEM_MISSING)
+                if incident.id == 2
+                else AskResult(success=False, message="upstream error")
+                if incident.id == 3
+                else AskResult(success=True, answer="batched")
+                for incident, _ in items
+            ]
+
+    incidents = [
+        incident_store.create_incident(
+            title=f"alert {n}", initial_state=IncidentState.ACTIVE
+        )
+        for n in range(3)
+    ]
+    inner = _Skipping()
+
+    results = ReasoningPipeline(build_reasoners(inner)).triage(incidents)
+
+    # Only the skipped item is asked again, through the wrapped chain
+    assert inner.asked == [2]
+    assert [result.answer for result in results] == [
+        "batched", "analysis 2", None
+    ]
@@ -0,0 +1,126 @@
+from judicor.ai import cache
+from judicor.ai.cache import CachingAIReasoner, cache_from_env
+from judicor.ai.interface import AIReasoner
+from judicor.ai.roles import AgentRole
+from judicor.domain.models import Incident, IncidentState
+from judicor.domain.results import AskResult
+
+
+class _CountingReasoner(AIReasoner):
+    model = "m"
+
+    def __init__(self, success=True):
+        self.calls = 0
+        self.success = success
+
+    def ask(self, incident, question):
+        self.calls += 1
+        return AskResult(
+            success=self.success, answer=f"a{self.calls}", confidence=0.9
+        )
+
+
+def _incident():
+    return Incident(id=1, title="t", state=IncidentState.ACTIVE)
+
+
+def test_repeated_question_is_served_from_memory():
+    inner = _CountingReasoner()
+    reasoner = CachingAIReasoner(inner, AgentRole.INVESTIGATOR)
+    incident = _incident()
+
+    first = reasoner.ask(incident, "What changed in the last hour?")
+    second = reasoner.ask(incident, "  what changed in the LAST hour? ")
+
+    assert inner.calls == 1
+    assert second.answer == first.answer
+    assert reasoner.stats.hits == 1
+    assert reasoner.stats.hit_ratio == 0.5
+
+
+def test_incident_change_or_role_invalidates_key():
+    inner = _CountingReasoner()
+    investigator = CachingAIReasoner(inner, AgentRole.INVESTIGATOR)
+    summarizer = CachingAIReasoner(inner, AgentRole.SUMMARIZER)
+    incident = _incident()
+
+    investigator.ask(incident, "q")
+    summarizer.ask(incident, "q")
+    incident.set_state(IncidentState.INVESTIGATING)
+    investigator.ask(incident, "q")
+
+    assert inner.calls == 3
+
+
+def test_failures_are_not_cached_and_ttl_expires(monkeypatch):
+    failing = _CountingReasoner(success=False)
+    reasoner = CachingAIReasoner(failing, AgentRole.INVESTIGATOR)
+    reasoner.ask(_incident(), "q")
+    reasoner.ask(_incident(), "q")
+    assert failing.calls == 2
+
+    inner = _CountingReasoner()
+    reasoner = CachingAIReasoner(inner, AgentRole.INVESTIGATOR, ttl=10)
+    incident = _incident()
+    reasoner.ask(incident, "q")
+    later = cache.time.time() + 60
+    monkeypatch.setattr(cache.time, "time", lambda: later)
+    reasoner.ask(incident, "q")
+    assert inner.calls == 2
+
+
+def test_lru_is_size_bounded():
+    inner = _CountingReasoner()
+    reasoner = CachingAIReasoner(inner, AgentRole.INVESTIGATOR, max_entries=2)
+    incident = _incident()
+
+    for question in ("a", "b", "c", "a"):
+        reasoner.ask(incident, question)
+
+    assert inner.calls == 4
+
+
+def test_disk_tier_survives_new_process(monkeypatch, tmp_path):
+    monkeypatch.setattr(cache, "BASE_DIR", tmp_path / "ai")
+    incident = _incident()
+
+    first = CachingAIReasoner(
+        _CountingReasoner(), AgentRole.INVESTIGATOR, disk=True
+    )
+    first.ask(incident, "q")
+
+    inner = _CountingReasoner()
+    fresh = CachingAIReasoner(inner, AgentRole.INVESTIGATOR, disk=True)
+    result = fresh.ask(incident, "q")
+
+    assert inner.calls == 0
+    assert result.answer == "a1"
+    assert fresh.stats.disk_hits == 1
+
+
+def test_cache_can_be_disabled(monkeypatch):
+    inner = _CountingReasoner()
+    monkeypatch.setenv("JUDICOR_AI_CACHE", "0")
+    assert cache_from_env(inner, AgentRole.INVESTIGATOR) is inner
+
+
+def test_batch_only_sends_misses_to_the_inner_reasoner():
+    class _Batching(_CountingReasoner):
+        def ask_batch(self, items):
+            self.batches = getattr(self, "batches", []) + [len(items)]
+            return [self.ask(incident, q) for incident, q in items]
+
+    inner = _Batching()
+    reasoner = CachingAIReasoner(inner, AgentRole.ANALYZER)
+    first, second = _incident(), Incident(
+        id=2, title="t", state=IncidentState.ACTIVE
+    )
+    cached = reasoner.ask(first, "analyze")
+
+    results = reasoner.ask_batch(
+        [(first, "analyze"), (second, "analyze"), (first, "other")]
+    )
+
+    assert inner.batches == [2]
+    assert results[0].answer == cached.answer
+    assert [result.answer for result in results[1:]] == ["a2", "a3"]
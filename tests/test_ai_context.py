@@ -0,0 +1,110 @@
+from judicor.ai import context as context_module
+from judicor.ai.context import (
+    PROMPT_TOKENS,
+    ContextBuilder,
+    estimate_tokens,
+    truncate_to_tokens,
+)
+from judicor.ai.roles import AgentRole
+from judicor.domain.models import Incident, IncidentState
+from judicor.session import history_store, timeline_store
+
+
+def _incident(incident_id=1):
+    return Incident(id=incident_id, title="t", state=IncidentState.ACTIVE)
+
+
+def test_estimate_tokens_counts_words_punctuation_and_long_words():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("disk full.") == 3
+    # 12 characters -> 3 subword tokens
+    assert estimate_tokens("loadbalancer") == 3
+
+
+def test_truncate_keeps_the_most_recent_text():
+    text = " ".join(f"w{n}" for n in range(100))
+
+    kept = truncate_to_tokens(text, 10)
+
+    assert estimate_tokens(kept) <= 10
+    assert kept.endswith("w99")
+
+
+def test_context_without_stored_data_is_just_the_request(
+    temp_history_store, temp_timeline_store
+):
+    context = ContextBuilder().build(_incident(), "what changed?")
+
+    assert context.text == "what changed?"
+    assert context.sections == {"request": 4}
+
+
+def test_context_stays_within_budget_newest_first(
+    temp_history_store, temp_timeline_store
+):
+    history_store.set_summary(1, "db failover in progress")
+    for n in range(30):
+        history_store.append_entry(
+            1, AgentRole.INVESTIGATOR, f"finding number {n}"
+        )
+        timeline_store.append_event(1, "note", f"event number {n}")
+    builder = ContextBuilder(budget=60, history_entries=10)
+    before = PROMPT_TOKENS.count(role="investigator")
+
+    context = builder.build(
+        _incident(), "next step?", role=AgentRole.INVESTIGATOR
+    )
+
+    assert context.tokens <= 60
+    assert context.text.startswith("Summary:\ndb failover in progress")
+    assert context.text.endswith("Request:\nnext step?")
+    assert "finding number 29" in context.text
+    assert "finding number 19" not in context.text
+    assert context.dropped > 0
+    assert PROMPT_TOKENS.count(role="investigator") == before + 1
+
+
+def test_context_pieces_are_reused_until_the_store_changes(
+    monkeypatch, temp_history_store, temp_timeline_store
+):
+    history_store.append_entry(1, AgentRole.INVESTIGATOR, "first")
+    builder = ContextBuilder()
+    builder.build(_incident(), "q")
+
+    loads = []
+    original = history_store.load_history
+    monkeypatch.setattr(
+        history_store,
+        "load_history",
+        lambda incident_id: loads.append(incident_id) or original(incident_id),
+    )
+    builder.build(_incident(), "q")
+    assert loads == []
+
+    history_store.append_entry(1, AgentRole.INVESTIGATOR, "second")
+    loads.clear()
+    context = builder.build(_incident(), "q")
+    assert loads == [1]
+    assert "second" in context.text
+
+
+def test_explicit_zero_budget_is_kept(monkeypatch):
+    monkeypatch.setenv("JUDICOR_CONTEXT_TOKEN_BUDGET", "500")
+
+    assert ContextBuilder(budget=0).budget == 0
+    assert ContextBuilder().budget == 500
+
+
+def test_cached_sections_are_bounded(
+    monkeypatch, temp_history_store, temp_timeline_store
+):
+    monkeypatch.setattr(context_module, "MAX_CACHED_SECTIONS", 4)
+    builder = ContextBuilder()
+
+    for incident_id in (1, 2, 3):
+        builder.build(_incident(incident_id), "q")
+
+    # Three sections per incident; only the most recent four are kept
+    assert len(builder._pieces) == 4
+    assert (3, "timeline") in builder._pieces
+    assert (1, "summary") not in builder._pieces
@@ -13,3 +13,14 @@ def test_dummy_reasoner_returns_static_answer():
     assert str(incident.id) in result.answer
     assert result.confidence == 0.9
     assert result.reasoning == "Static dummy reasoning"
+
+
+def test_dummy_reasoner_streams_answer_in_chunks():
+    reasoner = DummyAIReasoner()
+    incident = Incident(id=1, title="t", state=IncidentState.ACTIVE)
+    chunks = []
+
+    result = reasoner.ask_stream(incident, "question", chunks.append)
+
+    assert len(chunks) > 1
+    assert "".join(chunks) == result.answer
@@ -27,7 +27,9 @@ def test_create_ai_reasoner_gemini(monkeypatch):
         def __init__(self, role):
             self.role = role
 
-    monkeypatch.setattr(factory, "GeminiAIReasoner", FakeReasoner)
+    from judicor.ai.implementations import gemini
+
+    monkeypatch.setattr(gemini, "GeminiAIReasoner", FakeReasoner)
 
     assert isinstance(
         factory.create_ai_reasoner(AgentRole.INVESTIGATOR), FakeReasoner
@@ -0,0 +1,164 @@
+import threading
+
+from judicor.ai.fallback import (
+    BREAKER_STATE,
+    FALLBACK_ANSWERS,
+    HALF_OPEN,
+    HEDGED_REQUESTS,
+    OPEN,
+    CircuitBreaker,
+    FallbackAIReasoner,
+    get_breaker,
+)
+from judicor.ai.roles import AgentRole
+from judicor.domain.models import Incident, IncidentState
+from judicor.domain.results import AskResult
+
+
+def _incident():
+    return Incident(id=1, title="t", state=IncidentState.ACTIVE)
+
+
+class _Provider:
+    def __init__(self, answer=None, gate=None):
+        self.answer = answer
+        self.gate = gate
+        self.calls = 0
+
+    def ask(self, incident, question):
+        self.calls += 1
+        if self.gate is not None:
+            self.gate.wait(timeout=5)
+        if self.answer is None:
+            return AskResult(success=False, message="upstream error")
+        return AskResult(success=True, answer=self.answer, confidence=1.0)
+
+    def ask_stream(self, incident, question, on_chunk):
+        on_chunk("partial")
+        return self.ask(incident, question)
+
+
+def test_breaker_opens_then_lets_one_trial_through():
+    now = [0.0]
+    breaker = CircuitBreaker(
+        "p", failure_threshold=2, reset_timeout=10, clock=lambda: now[0]
+    )
+
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert not breaker.allow()
+    assert BREAKER_STATE.value(provider="p") == 2
+
+    now[0] = 11
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+
+    now[0] = 22
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.allow() and breaker.failures == 0
+    assert BREAKER_STATE.value(provider="p") == 0
+
+
+def test_failures_fall_through_and_open_breakers_are_skipped(monkeypatch):
+    monkeypatch.setenv("JUDICOR_AI_BREAKER_FAILURES", "2")
+    broken, backup = _Provider(), _Provider("backup answer")
+    reasoner = FallbackAIReasoner(
+        [("broken", broken), ("backup", backup)], AgentRole.INVESTIGATOR
+    )
+    before = FALLBACK_ANSWERS.value(role="investigator", provider="backup")
+
+    for _ in range(3):
+        assert reasoner.ask(_incident(), "q").answer == "backup answer"
+
+    assert broken.calls == 2
+    assert get_breaker("broken").state == OPEN
+    assert reasoner.model == "backup"
+    assert (
+        FALLBACK_ANSWERS.value(role="investigator", provider="backup")
+        == before + 3
+    )
+
+
+def test_slow_primary_is_hedged_after_its_p95_latency():
+    gate = threading.Event()
+    slow, fast = _Provider("slow", gate=gate), _Provider("fast")
+    reasoner = FallbackAIReasoner(
+        [("slow", slow), ("fast", fast)],
+        AgentRole.INVESTIGATOR,
+        hedge=True,
+        hedge_min_samples=1,
+    )
+    reasoner.latencies["slow"].add(0.01)
+    before = HEDGED_REQUESTS.value(role="investigator", winner="backup")
+
+    try:
+        result = reasoner.ask(_incident(), "q")
+    finally:
+        gate.set()
+
+    assert result.answer == "fast"
+    assert (slow.calls, fast.calls) == (1, 1)
+    assert (
+        HEDGED_REQUESTS.value(role="investigator", winner="backup")
+        == before + 1
+    )
+
+
+def test_stream_does_not_fall_back_after_emitting_chunks():
+    chunks = []
+    reasoner = FallbackAIReasoner(
+        [("broken", _Provider()), ("backup", _Provider("backup"))],
+        AgentRole.INVESTIGATOR,
+    )
+
+    result = reasoner.ask_stream(_incident(), "q", chunks.append)
+
+    assert not result.success
+    assert chunks == ["partial"]
+
+
+def test_provider_chain_falls_back_to_dummy(monkeypatch):
+    monkeypatch.setenv("JUDICOR_AI_PROVIDER", "gemini, dummy")
+    monkeypatch.delenv("GOOGLE_API_KEY", raising=False)
+    from judicor.ai.factory import create_ai_reasoner
+
+    reasoner = create_ai_reasoner(AgentRole.INVESTIGATOR)
+    result = reasoner.ask(_incident(), "q")
+
+    names = [name for name, _ in reasoner.providers]
+    assert names == ["gemini", "dummy"]
+    assert result.success
+    assert "Dummy investigator response" in result.answer
+
+
+def test_batch_items_failed_by_a_provider_move_to_the_next():
+    class _Partial(_Provider):
+        def ask_batch(self, items):
+            self.calls += 1
+            return [
+                AskResult(success=True, answer="first", confidence=1.0)
+                if question == "easy"
+                else AskResult(success=False, message="skipped")
+                for _, question in items
+            ]
+
+    primary, backup = _Partial(), _Provider("backup answer")
+    reasoner = FallbackAIReasoner(
+        [("primary", primary), ("backup", backup)], AgentRole.ANALYZER
+    )
+
+    results = reasoner.ask_batch(
+        [(_incident(), "easy"), (_incident(), "hard")]
+    )
+
+    assert [result.answer for result in results] == [
+        "first",
+        "backup answer",
+    ]
+    assert (primary.calls, backup.calls) == (1, 1)
+    assert get_breaker("primary").failures == 0
@@ -22,6 +22,12 @@ class _StubModels:
             raise self.error
         return _Response(self.response_text or "")
 
+    def generate_content_stream(self, model: str, contents: str):
+        if self.error:
+            raise self.error
+        for word in (self.response_text or "").split(" "):
+            yield _Response(word + " ")
+
 
 class _StubClient:
     def __init__(
@@ -64,3 +70,44 @@ def test_gemini_reasoner_failure(monkeypatch):
 
     assert not result.success
     assert result.message == "fail"
+
+
+def test_gemini_reasoner_streams_chunks(monkeypatch):
+    monkeypatch.setenv("GOOGLE_API_KEY", "test-key")
+    monkeypatch.setattr(
+        gemini,
+        "genai",
+        SimpleNamespace(Client=lambda: _StubClient("streamed answer")),
+    )
+
+    reasoner = gemini.GeminiAIReasoner(role=AgentRole.INVESTIGATOR)
+    incident = Incident(id=1, title="title", state=IncidentState.ACTIVE)
+    chunks = []
+
+    result = reasoner.ask_stream(incident, "question", chunks.append)
+
+    assert chunks == ["streamed ", "answer "]
+    assert result.success
+    assert result.answer == "streamed answer"
+
+
+def test_gemini_reasoners_share_one_lazily_created_client(monkeypatch):
+    monkeypatch.setenv("GOOGLE_API_KEY", "test-key")
+    created = []
+
+    def make_client():
+        created.append(_StubClient("answer"))
+        return created[-1]
+
+    monkeypatch.setattr(gemini, "genai", SimpleNamespace(Client=make_client))
+
+    investigator = gemini.GeminiAIReasoner(role=AgentRole.INVESTIGATOR)
+    summarizer = gemini.GeminiAIReasoner(role=AgentRole.SUMMARIZER)
+    assert created == []
+
+    incident = Incident(id=1, title="title", state=IncidentState.ACTIVE)
+    investigator.ask(incident, "question")
+    summarizer.ask(incident, "question")
+
+    assert len(created) == 1
+    assert investigator.client is summarizer.client
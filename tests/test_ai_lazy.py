@@ -0,0 +1,42 @@
+from judicor.ai.cache import cache_stats
+from judicor.ai.implementations.dummy import DummyAIReasoner
+from judicor.ai.lazy import LazyAIReasoner
+from judicor.ai.pipeline import build_reasoners
+from judicor.ai.roles import AgentRole
+from judicor.domain.models import Incident, IncidentState
+
+
+def _incident():
+    return Incident(id=1, title="t", state=IncidentState.ACTIVE)
+
+
+def test_reasoner_is_created_on_first_use_only():
+    created = []
+
+    def factory():
+        created.append(DummyAIReasoner(role=AgentRole.INVESTIGATOR))
+        return created[-1]
+
+    reasoner = LazyAIReasoner(factory)
+    assert created == []
+
+    reasoner.ask(_incident(), "q")
+    reasoner.ask_stream(_incident(), "q", lambda text: None)
+
+    assert len(created) == 1
+    assert reasoner.created
+
+
+def test_build_reasoners_defers_provider_setup(monkeypatch):
+    monkeypatch.setenv("JUDICOR_AI_PROVIDER", "gemini")
+    monkeypatch.setenv("JUDICOR_AI_CACHE", "0")
+    monkeypatch.delenv("GOOGLE_API_KEY", raising=False)
+
+    reasoners = build_reasoners()
+
+    # Walking the decorators for stats must not force creation either
+    assert cache_stats(reasoners) == {}
+    result = reasoners[AgentRole.INVESTIGATOR].ask(_incident(), "q")
+
+    assert not result.success
+    assert result.message == "GOOGLE_API_KEY is not set"
@@ -0,0 +1,119 @@
+import threading
+import time
+
+from judicor.ai import limiter as limiter_module
+from judicor.ai.limiter import (
+    LIMITER_TIMEOUTS,
+    LIMITER_WAIT,
+    ProviderLimiter,
+    RateLimitedAIReasoner,
+)
+from judicor.ai.roles import AgentRole
+from judicor.domain.models import Incident, IncidentState
+from judicor.domain.results import AskResult
+
+
+class _Answer:
+    def ask(self, incident, question):
+        return AskResult(success=True, answer="ok", confidence=1.0)
+
+
+def test_in_flight_cap_is_shared_by_limiters_on_the_same_file(
+    temp_limits_store,
+):
+    # Two instances stand in for two processes: only the file is shared
+    first = ProviderLimiter("gemini", max_in_flight=1, max_wait=0.1)
+    second = ProviderLimiter("gemini", max_in_flight=1, max_wait=0.1)
+    before = LIMITER_TIMEOUTS.value(provider="gemini", role="investigator")
+
+    lease = first.acquire(AgentRole.INVESTIGATOR)
+    assert second.acquire(AgentRole.INVESTIGATOR) is None
+    first.release(lease)
+    assert second.acquire(AgentRole.INVESTIGATOR) is not None
+
+    after = LIMITER_TIMEOUTS.value(provider="gemini", role="investigator")
+    assert after == before + 1
+
+
+def test_token_bucket_spaces_calls(temp_limits_store):
+    limiter = ProviderLimiter("gemini", rate=20, burst=1)
+    before = LIMITER_WAIT.total(provider="gemini", role="summarizer")
+
+    for _ in range(3):
+        limiter.release(limiter.acquire(AgentRole.SUMMARIZER))
+
+    waited = LIMITER_WAIT.total(provider="gemini", role="summarizer") - before
+    assert waited >= 0.08
+
+
+def test_investigator_is_served_before_a_waiting_summarizer(
+    temp_limits_store,
+):
+    limiter = ProviderLimiter("gemini", max_in_flight=1, max_wait=5)
+    held = limiter.acquire(AgentRole.INVESTIGATOR)
+    order = []
+
+    def call(role):
+        with limiter.slot(role):
+            order.append(role)
+
+    threads = []
+    for role in (AgentRole.SUMMARIZER, AgentRole.INVESTIGATOR):
+        thread = threading.Thread(target=call, args=(role,))
+        thread.start()
+        threads.append(thread)
+        time.sleep(0.1)
+    limiter.release(held)
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert order == [AgentRole.INVESTIGATOR, AgentRole.SUMMARIZER]
+
+
+def test_limited_reasoner_fails_fast_without_a_slot(temp_limits_store):
+    limiter = ProviderLimiter("gemini", max_in_flight=1, max_wait=0.05)
+    reasoner = RateLimitedAIReasoner(
+        _Answer(), limiter, AgentRole.SUMMARIZER
+    )
+    incident = Incident(id=1, title="t", state=IncidentState.ACTIVE)
+
+    assert reasoner.ask(incident, "q").success
+    with limiter.slot(AgentRole.INVESTIGATOR):
+        result = reasoner.ask(incident, "q")
+
+    assert not result.success
+    assert "waited" in result.message
+
+
+def test_idle_polls_do_not_rewrite_state_and_back_of_queue_waits_longer(
+    monkeypatch, temp_limits_store
+):
+    limiter = ProviderLimiter("gemini", max_in_flight=1, max_wait=0.3)
+    held = limiter.acquire(AgentRole.INVESTIGATOR)
+    # A higher-priority call from another process is already waiting
+    with limiter_module.file_lock(limiter.path):
+        state, _ = limiter._load(time.time())
+        state["waiting"]["other"] = {
+            "priority": 0,
+            "since": time.time(),
+            "seen": time.time(),
+        }
+        limiter._save(state)
+    saves, sleeps = [], []
+    save, sleep = limiter._save, time.sleep
+    monkeypatch.setattr(
+        limiter, "_save", lambda state: (saves.append(1), save(state))
+    )
+    monkeypatch.setattr(
+        limiter_module.time,
+        "sleep",
+        lambda seconds: (sleeps.append(seconds), sleep(seconds)),
+    )
+
+    assert limiter.acquire(AgentRole.SUMMARIZER) is None
+
+    # Joining and leaving the queue; the polls in between wrote nothing
+    assert len(saves) == 2
+    assert len(sleeps) >= 2
+    assert min(sleeps[:-1]) >= 2 * limiter_module.POLL_INTERVAL
+    limiter.release(held)
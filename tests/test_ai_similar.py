@@ -0,0 +1,157 @@
+import threading
+import time
+
+from judicor.ai import similar
+from judicor.ai.context import RETRIEVAL_SECTIONS, ContextBuilder
+from judicor.ai.roles import AgentRole
+from judicor.domain.models import IncidentState
+from judicor.session import history_store, incident_store
+
+
+def _resolved(title, summary):
+    incident = incident_store.create_incident(
+        title=title, initial_state=IncidentState.RESOLVED
+    )
+    history_store.set_summary(incident.id, summary)
+    return incident
+
+
+def test_tokenize_drops_stopwords_and_short_words():
+    assert similar.tokenize("The DB-primary is a x failover!") == [
+        "db-primary",
+        "failover",
+    ]
+
+
+def test_index_ranks_by_shared_rare_terms():
+    index = similar.SimilarIndex()
+    index.add(1, "Disk full on db-primary", "postgres wal volume filled")
+    index.add(2, "Checkout latency", "redis timeouts under load")
+    index.add(3, "Disk alert", "logs volume filled on web nodes")
+
+    matches = index.query("postgres disk filled", k=2)
+
+    assert [match.incident_id for match in matches] == [1, 3]
+    assert index.query("postgres", k=2, exclude=(1,)) == []
+
+
+def test_index_replaces_a_reindexed_document():
+    index = similar.SimilarIndex()
+    index.add(1, "old", "redis")
+    index.add(1, "new", "kafka")
+
+    assert len(index) == 1
+    assert index.query("redis") == []
+    assert index.query("kafka")[0].title == "new"
+
+
+def test_index_backfills_and_picks_up_appends_incrementally(
+    temp_incident_store, temp_history_store
+):
+    first = _resolved("Disk full on db-primary", "postgres wal filled")
+    incident_store.create_incident(
+        title="Disk pressure", initial_state=IncidentState.ACTIVE
+    )
+
+    assert [m.incident_id for m in similar.find_similar("disk")] == [
+        first.id
+    ]
+
+    second = _resolved("Redis evictions", "cache memory exhausted")
+    similar.index_incident(second.id)
+    matches = similar.find_similar("redis memory")
+
+    assert matches[0].incident_id == second.id
+    assert matches[0].snippet == "cache memory exhausted"
+    # Another process would see both through the log alone
+    other = similar.SimilarIndex()
+    other.refresh()
+    assert len(other) == 2
+
+
+def test_top_k_zero_disables_retrieval(
+    monkeypatch, temp_incident_store, temp_history_store
+):
+    _resolved("Disk full", "postgres wal filled")
+    monkeypatch.setenv("JUDICOR_SIMILAR_TOP_K", "0")
+
+    assert similar.find_similar("disk") == []
+
+
+def test_context_includes_similar_incidents_before_the_request(
+    temp_incident_store, temp_history_store, temp_timeline_store
+):
+    past = _resolved("Disk full on db-primary", "rotated postgres wal")
+    current = incident_store.create_incident(
+        title="Disk full on db-replica", initial_state=IncidentState.ACTIVE
+    )
+
+    context = ContextBuilder().build(
+        current,
+        "why is the disk full?",
+        role=AgentRole.INVESTIGATOR,
+        sections=RETRIEVAL_SECTIONS,
+    )
+
+    assert context.text == (
+        "Similar past incidents:\n"
+        f"- #{past.id} Disk full on db-primary: rotated postgres wal\n\n"
+        "Request:\nwhy is the disk full?"
+    )
+    assert context.sections["similar"] > 0
+
+
+def test_common_terms_only_score_their_champions(monkeypatch):
+    monkeypatch.setattr(similar, "CHAMPIONS_PER_TERM", 2)
+    index = similar.SimilarIndex()
+    index.add(1, "latency", "latency")
+    index.add(2, "latency latency latency", "checkout")
+    index.add(3, "latency", "checkout")
+    index.add(4, "latency latency", "latency")
+
+    matches = index.query("latency", k=4)
+
+    assert [match.incident_id for match in matches] == [4, 2]
+
+
+def test_rebuild_keeps_appends_made_while_collecting(
+    monkeypatch, temp_incident_store, temp_history_store
+):
+    _resolved("Disk full on db-primary", "postgres wal filled")
+    similar.rebuild()
+    late = _resolved("Redis evictions", "cache memory exhausted")
+    appender = threading.Thread(target=similar.index_incident, args=(late.id,))
+    original = incident_store.list_incidents
+
+    def listed_before_the_late_resolve():
+        incidents = [i for i in original() if i.id != late.id]
+        appender.start()
+        time.sleep(0.05)
+        return incidents
+
+    monkeypatch.setattr(
+        incident_store, "list_incidents", listed_before_the_late_resolve
+    )
+    similar.rebuild()
+    appender.join()
+
+    other = similar.SimilarIndex()
+    other.refresh()
+    assert len(other) == 2
+
+
+def test_log_is_compacted_when_reresolves_dominate(
+    monkeypatch, temp_incident_store, temp_history_store
+):
+    monkeypatch.setattr(similar, "COMPACT_MIN_RECORDS", 4)
+    incident = _resolved("Disk full on db-primary", "postgres wal filled")
+    similar.rebuild()
+    for _ in range(4):
+        similar.index_incident(incident.id)
+
+    index = similar.get_index()
+
+    assert len(index) == 1
+    lines = similar._index_path().read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 1
+    assert index.query("postgres")[0].incident_id == incident.id
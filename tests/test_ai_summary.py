@@ -0,0 +1,145 @@
+import threading
+import time
+
+from judicor.ai.pipeline import ReasoningPipeline
+from judicor.ai.roles import AgentRole
+from judicor.ai import summary
+from judicor.ai.summary import SummaryScheduler
+from judicor.domain.models import Incident, IncidentState
+from judicor.domain.results import AskResult
+from judicor.session import history_store
+
+
+def _incident(incident_id=1):
+    return Incident(id=incident_id, title="t", state=IncidentState.ACTIVE)
+
+
+def test_asks_within_window_share_one_summarizer_call():
+    calls = []
+    scheduler = SummaryScheduler(
+        lambda incident: calls.append(incident.id), debounce=60
+    )
+
+    scheduler.schedule(_incident())
+    scheduler.schedule(_incident())
+    scheduler.schedule(_incident(2))
+    assert calls == []
+
+    assert scheduler.flush(timeout=5)
+    assert sorted(calls) == [1, 2]
+
+
+def test_summaries_for_an_incident_run_in_order():
+    order = []
+    gate = threading.Event()
+
+    def summarize(incident):
+        if not order:
+            gate.wait(timeout=5)
+        order.append(incident.title)
+
+    scheduler = SummaryScheduler(summarize, debounce=0)
+    scheduler.schedule(
+        Incident(id=1, title="first", state=IncidentState.ACTIVE)
+    )
+    while scheduler.pending():
+        time.sleep(0.001)
+    scheduler.schedule(
+        Incident(id=1, title="second", state=IncidentState.ACTIVE)
+    )
+    gate.set()
+
+    assert scheduler.flush(timeout=5)
+    assert order == ["first", "second"]
+
+
+class _Recorder:
+    def __init__(self):
+        self.questions = []
+
+    def ask(self, incident, question):
+        self.questions.append(question)
+        return AskResult(success=True, answer="summary", confidence=0.9)
+
+
+def test_pipeline_defers_summary_until_flush(
+    temp_timeline_store, temp_incident_store, temp_history_store
+):
+    recorder = _Recorder()
+    reasoners = {role: recorder for role in AgentRole}
+    pipeline = ReasoningPipeline(reasoners, summary_mode="background")
+    pipeline.summaries.debounce = 60
+
+    pipeline.ask(_incident(), "q1")
+    pipeline.ask(_incident(), "q2")
+    assert history_store.load_summary(1) is None
+
+    pipeline.flush()
+    assert history_store.load_summary(1) == "summary"
+    summarizer_prompts = [q for q in recorder.questions if "Update" in q]
+    assert len(summarizer_prompts) == 1
+
+
+def test_pipeline_sync_mode_summarizes_inline(
+    temp_timeline_store, temp_incident_store, temp_history_store
+):
+    reasoners = {role: _Recorder() for role in AgentRole}
+    pipeline = ReasoningPipeline(reasoners, summary_mode="sync")
+
+    pipeline.ask(_incident(), "q")
+
+    assert pipeline.summaries is None
+    assert history_store.load_summary(1) == "summary"
+
+
+class _FlakySummarizer:
+    def __init__(self, fail_on=()):
+        self.prompts = []
+        self.fail_on = set(fail_on)
+
+    def ask(self, incident, question):
+        self.prompts.append(question)
+        if len(self.prompts) in self.fail_on:
+            return AskResult(success=False, message="upstream error")
+        return AskResult(
+            success=True, answer=f"summary {len(self.prompts)}"
+        )
+
+
+def test_summarize_only_new_entries_in_bounded_chunks(
+    monkeypatch, temp_timeline_store, temp_incident_store, temp_history_store
+):
+    monkeypatch.setenv("JUDICOR_SUMMARY_CHUNK_ENTRIES", "2")
+    summarizer = _FlakySummarizer(fail_on={2})
+    reasoners = {role: summarizer for role in AgentRole}
+    pipeline = ReasoningPipeline(reasoners, summary_mode="sync")
+    for n in range(5):
+        history_store.append_entry(1, AgentRole.INVESTIGATOR, f"entry {n}")
+
+    # Second chunk fails: the checkpoint stays after the first one
+    pipeline.summarize(_incident())
+    assert history_store.load_checkpoint(1).covered == 2
+
+    pipeline.summarize(_incident())
+    checkpoint = history_store.load_checkpoint(1)
+    assert checkpoint.covered == 5
+    assert checkpoint.summary == "summary 4"
+    assert "entry 0" not in summarizer.prompts[2]
+    assert "entry 2" in summarizer.prompts[2]
+    assert "Summary:\nsummary 1" in summarizer.prompts[2]
+
+    summarizer.prompts.clear()
+    pipeline.summarize(_incident())
+    assert summarizer.prompts == []
+
+
+def test_flush_all_gives_up_after_its_timeout():
+    gate = threading.Event()
+    scheduler = SummaryScheduler(lambda incident: gate.wait(5), debounce=0)
+    scheduler.schedule(_incident())
+
+    start = time.monotonic()
+    assert not summary.flush_all(timeout=0.05)
+    assert time.monotonic() - start < 1
+    gate.set()
+    assert summary.flush_all(timeout=5)
@@ -0,0 +1,77 @@
+import asyncio
+
+import httpx
+import pytest
+
+from judicor.client.factory import create_judicor_client
+from judicor.client.implementations.async_http import AsyncHttpJudicorClient
+from judicor.control_plane.app import app
+
+
+def _client():
+    return AsyncHttpJudicorClient(
+        base_url="http://plane",
+        api_key="k",
+        transport=httpx.ASGITransport(app=app),
+    )
+
+
+def test_async_client_flow(monkeypatch, temp_control_plane_storage):
+    monkeypatch.setenv("JUDICOR_API_KEY", "k")
+
+    async def flow():
+        async with _client() as client:
+            created = await client.trigger()
+            assert created.success
+
+            incidents = await client.list_incidents()
+            assert any(i.id == created.incident_id for i in incidents)
+
+            assert (await client.attach_incident(created.incident_id)).success
+            assert (await client.status_incident()).success
+
+            answer = await client.ask_ai("what changed?")
+            assert answer.success
+            assert "investigator" in answer.answer
+
+            chunks = []
+            streamed = await client.ask_ai_stream("and now?", chunks.append)
+            assert "".join(chunks) == streamed.answer
+
+            assert (await client.resolve_incident()).success
+
+    asyncio.run(flow())
+
+
+def test_concurrent_calls_across_incidents(
+    monkeypatch, temp_control_plane_storage
+):
+    monkeypatch.setenv("JUDICOR_API_KEY", "k")
+
+    async def flow():
+        async with _client() as client:
+            created = await asyncio.gather(
+                *(client.trigger() for _ in range(10))
+            )
+            ids = [result.incident_id for result in created]
+            assert len(set(ids)) == 10
+
+            statuses = await asyncio.gather(
+                *(client.status_incident(incident_id=i) for i in ids)
+            )
+            assert all(status.state == "active" for status in statuses)
+            assert client.current_incident is None
+            assert client.stats.requests == 20
+
+    asyncio.run(flow())
+
+
+def test_factory_returns_async_client(monkeypatch):
+    monkeypatch.setenv("JUDICOR_CLIENT_TYPE", "http")
+    client = create_judicor_client(asynchronous=True)
+    assert isinstance(client, AsyncHttpJudicorClient)
+    asyncio.run(client.aclose())
+
+    monkeypatch.setenv("JUDICOR_CLIENT_TYPE", "dummy")
+    with pytest.raises(ValueError):
+        create_judicor_client(asynchronous=True)
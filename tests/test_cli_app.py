@@ -30,6 +30,11 @@ class _StubClient:
 
         return AskResult(success=True, answer="answer", confidence=0.9)
 
+    def ask_ai_stream(self, question: str, on_chunk):
+        from judicor.client.interface import JudicorClient
+
+        return JudicorClient.ask_ai_stream(self, question, on_chunk)
+
     def status_incident(self):
         self.calls.append("status")
         from judicor.domain.results import StatusResult
@@ -48,6 +53,16 @@ class _StubClient:
 
         return TriggerResult(success=True, incident_id=2)
 
+    def triage(self, incident_ids=None):
+        self.calls.append(f"triage:{incident_ids}")
+        from judicor.domain.results import TriageResult
+
+        return TriageResult(
+            success=False,
+            message="Analyzed 1 of 2 incidents",
+            analyses={3: "disk full", 4: None},
+        )
+
 
 def test_list_command_uses_client(monkeypatch):
     runner = CliRunner()
@@ -184,3 +199,110 @@ def test_trigger_command_exits_on_failure(monkeypatch):
 
     assert result.exit_code == 1
     assert "backend down" in result.stdout
+
+
+class _StreamingClient(_StubClient):
+    def ask_ai_stream(self, question: str, on_chunk):
+        self.calls.append(f"ask_stream:{question}")
+        from judicor.domain.results import AskResult
+
+        for chunk in ("streamed", " answer"):
+            on_chunk(chunk)
+        return AskResult(success=True, answer="streamed answer", confidence=1)
+
+
+def test_ask_command_prints_streamed_tokens(monkeypatch):
+    runner = CliRunner()
+    client = _StreamingClient()
+    monkeypatch.setattr(app, "get_client", lambda: client)
+
+    result = runner.invoke(app.app, ["ask", "why?"])
+
+    assert result.exit_code == 0
+    assert "Answer: streamed answer\n" in result.stdout
+    assert client.calls == ["ask_stream:why?"]
+
+
+class _RejectedStreamClient(_StubClient):
+    def ask_ai_stream(self, question: str, on_chunk):
+        from judicor.domain.results import AskResult
+
+        on_chunk("probably dns")
+        return AskResult(success=False, message="low confidence (0.30)")
+
+
+def test_ask_command_withdraws_a_streamed_answer_the_policy_rejected(
+    monkeypatch,
+):
+    runner = CliRunner()
+    monkeypatch.setattr(app, "get_client", lambda: _RejectedStreamClient())
+
+    result = runner.invoke(app.app, ["ask", "why?"])
+
+    assert result.exit_code == 1
+    assert result.stdout == (
+        "Answer: probably dns\n"
+        "Answer above withdrawn: low confidence (0.30)\n"
+    )
+
+
+class _OutboxClient(_StubClient):
+    def outbox_backlog(self):
+        from judicor.session import outbox_store
+
+        return outbox_store.size(outbox_store.target_id("http://p", "id"))
+
+    def flush_outbox(self):
+        from judicor.client.implementations.http import FlushReport
+
+        self.calls.append("flush")
+        return FlushReport(
+            sent=2,
+            failed=0,
+            remaining=1,
+            seconds=0.5,
+            asks=[("/incidents/1/ask", "why?", "j1")],
+        )
+
+
+def test_sync_command_reports_backlog_and_throughput(
+    monkeypatch, temp_outbox_store
+):
+    runner = CliRunner()
+    client = _OutboxClient()
+    # Never forwarded to a daemon: the outbox is local
+    monkeypatch.setattr(app, "get_client", lambda: _StubClient())
+    monkeypatch.setattr(app, "_create_client", lambda: client)
+    for n in range(3):
+        temp_outbox_store.enqueue(
+            "/incidents/1/resolve", {}, f"k{n}", "http://p", "id"
+        )
+    temp_outbox_store.enqueue("/x", {}, "other", "http://p", "rotated")
+
+    status = runner.invoke(app.app, ["sync", "--status"])
+    result = runner.invoke(app.app, ["sync"])
+
+    assert "Backlog: 3 queued" in status.stdout
+    assert "1 queued for another control plane or API key" in status.stdout
+    assert client.calls == ["flush"]
+    assert result.exit_code == 1
+    assert "Flushed 2 in 0.50s (4.0/s), 0 rejected, 1 remaining" in (
+        result.stdout
+    )
+    assert "Delivered ask 'why?' (/incidents/1/ask) as job j1" in (
+        result.stdout
+    )
+
+
+def test_triage_command_prints_analyses_and_exits_on_failures(monkeypatch):
+    runner = CliRunner()
+    client = _StubClient()
+    monkeypatch.setattr(app, "get_client", lambda: client)
+
+    result = runner.invoke(app.app, ["triage", "3", "4"])
+
+    assert client.calls == ["triage:[3, 4]"]
+    assert result.exit_code == 1
+    assert result.stdout == (
+        "#3: disk full\n#4: analysis failed\nAnalyzed 1 of 2 incidents\n"
+    )
@@ -0,0 +1,55 @@
+import os
+import subprocess
+import sys
+
+# Generous enough for slow CI machines; the eager google.genai import
+# alone used to cost ~700ms.
+DEFAULT_BUDGET_MS = 250
+HEAVY_MODULES = ("google.genai", "requests", "httpx", "fastapi")
+
+
+def _import_profile(statement: str) -> dict:
+    """Run ``statement`` under -X importtime; map module to (us, depth)."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    profile = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        profile[name.strip()] = (int(cumulative), depth)
+    return profile
+
+
+def test_cli_startup_skips_provider_sdks_and_transports():
+    # What `judicor list` loads with the default dummy client/provider
+    profile = _import_profile(
+        "import judicor.cli.app; import judicor.client.implementations.dummy"
+    )
+
+    for heavy in HEAVY_MODULES:
+        assert heavy not in profile, f"{heavy} imported at CLI startup"
+
+    budget_ms = float(
+        os.getenv("JUDICOR_IMPORT_BUDGET_MS", DEFAULT_BUDGET_MS)
+    )
+    total_us = sum(
+        cumulative
+        for name, (cumulative, depth) in profile.items()
+        if depth == 0 and name.startswith("judicor")
+    )
+    assert total_us / 1000 < budget_ms
+
+
+def test_async_client_does_not_load_requests():
+    profile = _import_profile(
+        "import judicor.client.implementations.async_http"
+    )
+
+    assert "httpx" in profile
+    assert "requests" not in profile
@@ -0,0 +1,101 @@
+import pytest
+from typer.testing import CliRunner
+
+from judicor.cli import app, shell
+from judicor.domain.results import AskResult, AttachResult, StatusResult
+
+
+class _StatefulClient:
+    """Keeps the attachment in memory, like HttpJudicorClient."""
+
+    def __init__(self):
+        self.current = None
+        self.calls = []
+
+    def attach_incident(self, incident_id: int):
+        self.current = incident_id
+        self.calls.append(f"attach:{incident_id}")
+        return AttachResult(success=True, incident_id=incident_id)
+
+    def ask_ai(self, question: str):
+        self.calls.append(f"ask:{question}")
+        return AskResult(success=True, answer=f"about {self.current}")
+
+    def ask_ai_stream(self, question: str, on_chunk):
+        result = self.ask_ai(question)
+        on_chunk(result.answer)
+        return result
+
+    def status_incident(self):
+        if self.current is None:
+            return StatusResult(success=False, message="none")
+        return StatusResult(
+            success=True, state="active", summary=f"incident {self.current}"
+        )
+
+
+def _use_counting_factory(monkeypatch):
+    created = []
+
+    def factory():
+        created.append(_StatefulClient())
+        return created[-1]
+
+    monkeypatch.setenv("JUDICOR_DAEMON", "0")
+    monkeypatch.setattr(app, "_client_instance", None)
+    monkeypatch.setattr(app, "create_judicor_client", factory)
+    return created
+
+
+def test_batch_commands_share_one_client_and_attachment(monkeypatch):
+    created = _use_counting_factory(monkeypatch)
+    script = "# triage\nattach 7\nask 'what broke?'\n\nstatus\n"
+
+    result = CliRunner().invoke(app.app, ["shell"], input=script)
+
+    assert result.exit_code == 0
+    assert len(created) == 1
+    assert created[0].calls == ["attach:7", "ask:what broke?"]
+    assert "Answer: about 7" in result.stdout
+    assert "Summary: incident 7" in result.stdout
+
+
+def test_batch_file_stops_on_first_failure(monkeypatch, tmp_path):
+    created = _use_counting_factory(monkeypatch)
+    script = tmp_path / "commands.txt"
+    script.write_text("status\nattach 1\n")
+
+    result = CliRunner().invoke(app.app, ["shell", "--file", str(script)])
+
+    assert result.exit_code == 1
+    assert created[0].calls == []
+
+    kept = CliRunner().invoke(
+        app.app, ["shell", "--file", str(script), "--keep-going"]
+    )
+    assert kept.exit_code == 1
+    assert created[0].calls == ["attach:1"]
+
+
+def test_usage_errors_and_nested_commands_do_not_end_session(monkeypatch):
+    _use_counting_factory(monkeypatch)
+    command = app.typer.main.get_command(app.app)
+
+    failures = shell.run_shell(
+        command, ["bogus", "attach x", "daemon", "attach 2", "exit", "ask q"]
+    )
+
+    assert failures == 3
+    assert app.get_client().calls == ["attach:2"]
+
+
+def test_history_is_persisted(monkeypatch, tmp_path):
+    readline = pytest.importorskip("readline")
+    monkeypatch.setattr(shell, "HISTORY_FILE", tmp_path / "history")
+    readline.clear_history()
+
+    save = shell._load_history()
+    readline.add_history("status")
+    save()
+
+    assert "status" in (tmp_path / "history").read_text()
@@ -1,5 +1,7 @@
 from dataclasses import dataclass
 
+from judicor.ai.cache import cache_stats
+from judicor.ai.interface import AIReasoner
 from judicor.client.implementations.dummy import DummyJudicorClient
 from judicor.domain.models import Incident
 from judicor.domain.messages import NO_INCIDENT_ATTACHED
@@ -7,7 +9,7 @@ from judicor.domain.results import AskResult
 
 
 @dataclass
-class _StubReasoner:
+class _StubReasoner(AIReasoner):
     answer: str = "ok"
     confidence: float = 0.9
 
@@ -21,7 +23,10 @@ class _StubReasoner:
 
 
 def test_list_and_attach_incident(
-    temp_session_store, temp_timeline_store, temp_incident_store
+    temp_session_store,
+    temp_timeline_store,
+    temp_incident_store,
+    temp_history_store,
 ):
     client = DummyJudicorClient(reasoner=_StubReasoner())
 
@@ -62,7 +67,10 @@ def test_ask_without_attachment(
 
 
 def test_status_and_detach(
-    temp_session_store, temp_timeline_store, temp_incident_store
+    temp_session_store,
+    temp_timeline_store,
+    temp_incident_store,
+    temp_history_store,
 ):
     client = DummyJudicorClient(reasoner=_StubReasoner())
     status = client.status_incident()
@@ -97,6 +105,44 @@ def test_resolve_and_trigger(
     assert created.incident_id == 3
 
 
+def test_resolve_writes_deferred_summaries_before_the_resolution(
+    temp_session_store,
+    temp_timeline_store,
+    temp_incident_store,
+    temp_history_store,
+):
+    from judicor.session import history_store
+
+    client = DummyJudicorClient(reasoner=_StubReasoner())
+    client.pipeline.summaries.debounce = 60
+    client.attach_incident(1)
+    client.ask_ai("what changed?")
+
+    assert client.resolve_incident().success
+    assert client.pipeline.summaries.pending() == 0
+    # The resolution is the last word, not a late background summary
+    assert history_store.load_summary(1) == "ok-1"
+    checkpoint = history_store.load_checkpoint(1)
+    assert checkpoint.covered == len(history_store.load_history(1))
+
+
+def test_triage_reports_analyses_per_incident(
+    temp_session_store,
+    temp_timeline_store,
+    temp_incident_store,
+    temp_history_store,
+):
+    client = DummyJudicorClient(reasoner=_StubReasoner())
+    client.list_incidents()
+
+    result = client.triage([2, 1, 2])
+
+    assert result.success
+    assert result.analyses == {2: "ok-2", 1: "ok-1"}
+    assert result.message == "Analyzed 2 of 2 incidents"
+    assert not client.triage([42]).success
+
+
 def test_session_recovery_on_init(
     temp_session_store,
     temp_timeline_store,
@@ -114,3 +160,91 @@ def test_session_recovery_on_init(
     restored = DummyJudicorClient(reasoner=_StubReasoner())
     assert restored.current_incident is not None
     assert restored.current_incident.id == target_id
+
+
+def test_reasoner_calls_are_timed_per_role(
+    temp_session_store,
+    temp_timeline_store,
+    temp_incident_store,
+    temp_history_store,
+):
+    from judicor.observability.metrics import AI_DURATION
+
+    before = AI_DURATION.count(role="investigator")
+    client = DummyJudicorClient(reasoner=_StubReasoner())
+    client.attach_incident(1)
+    client.ask_ai("q")
+
+    assert AI_DURATION.count(role="investigator") == before + 1
+
+
+def test_ask_stream_emits_chunks_and_records_ttft(
+    temp_session_store,
+    temp_timeline_store,
+    temp_incident_store,
+    temp_history_store,
+):
+    from judicor.ai.implementations.dummy import DummyAIReasoner
+    from judicor.observability.metrics import AI_TIME_TO_FIRST_TOKEN
+
+    before = AI_TIME_TO_FIRST_TOKEN.count(role="investigator")
+    client = DummyJudicorClient(reasoner=DummyAIReasoner())
+    client.attach_incident(1)
+    chunks = []
+
+    result = client.ask_ai_stream("q", chunks.append)
+
+    assert result.success
+    assert "".join(chunks) == result.answer
+    assert AI_TIME_TO_FIRST_TOKEN.count(role="investigator") == before + 1
+
+
+def test_construction_does_not_scan_or_seed(
+    monkeypatch,
+    temp_session_store,
+    temp_timeline_store,
+    temp_incident_store,
+    temp_history_store,
+):
+    from judicor.session import incident_store
+
+    DummyJudicorClient(reasoner=_StubReasoner()).list_incidents()
+    temp_session_store.save_attached_incident(2)
+
+    def fail():
+        raise AssertionError("list_incidents called during construction")
+
+    monkeypatch.setattr(incident_store, "list_incidents", fail)
+    client = DummyJudicorClient(reasoner=_StubReasoner())
+
+    assert client.current_incident.id == 2
+    assert client.status_incident().success
+
+
+def test_seeding_is_deferred_to_first_read(
+    temp_session_store,
+    temp_timeline_store,
+    temp_incident_store,
+    temp_history_store,
+):
+    client = DummyJudicorClient(reasoner=_StubReasoner())
+    assert not temp_incident_store.has_incidents()
+
+    assert len(client.incidents) == 2
+    assert temp_incident_store.has_incidents()
+
+
+def test_repeated_question_hits_the_investigator_cache(
+    temp_session_store,
+    temp_timeline_store,
+    temp_incident_store,
+    temp_history_store,
+):
+    client = DummyJudicorClient(reasoner=_StubReasoner())
+    client.attach_incident(1)
+
+    for _ in range(3):
+        assert client.ask_ai("What changed in the last hour?").success
+
+    stats = cache_stats(client.reasoners)["investigator"]
+    assert (stats["misses"], stats["hits"]) == (1, 2)
@@ -1,6 +1,7 @@
 from fastapi.testclient import TestClient
 
 from judicor.control_plane.app import app
+from judicor.observability.metrics import STORE_OPERATIONS
 
 
 def test_control_plane_incident_flow(monkeypatch, temp_control_plane_storage):
@@ -45,3 +46,129 @@ def test_control_plane_incident_flow(monkeypatch, temp_control_plane_storage):
     resp = client.get("/incidents", headers=headers)
     assert resp.status_code == 200
     assert any(item["id"] == incident_id for item in resp.json())
+
+
+def test_metrics_endpoint(monkeypatch, temp_control_plane_storage):
+    monkeypatch.setenv("JUDICOR_API_KEY", "k")
+    client = TestClient(app)
+    headers = {"X-API-Key": "k"}
+
+    created = client.post(
+        "/incidents", json={"title": "M"}, headers=headers
+    ).json()
+    client.get(f"/incidents/{created['id']}", headers=headers)
+    listed = STORE_OPERATIONS.value(
+        store="incident", operation="list_incidents", outcome="ok"
+    )
+
+    resp = client.get("/metrics")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain")
+
+    body = resp.text
+    assert (
+        'judicor_http_request_duration_seconds_count'
+        '{method="GET",route="/incidents/{incident_id}"}'
+    ) in body
+    assert 'judicor_incidents{state="active"} 1' in body
+    # Incident counts are maintained, not recomputed from a listing
+    assert STORE_OPERATIONS.value(
+        store="incident", operation="list_incidents", outcome="ok"
+    ) == listed
+    assert "judicor_store_operations_total{" in body
+    assert "judicor_timeline_events_bucket" in body
+
+
+def test_incident_detail_projection_and_head(
+    monkeypatch, temp_control_plane_storage
+):
+    monkeypatch.setenv("JUDICOR_API_KEY", "k")
+    client = TestClient(app)
+    headers = {"X-API-Key": "k"}
+    incident_id = client.post(
+        "/incidents", json={"title": "P"}, headers=headers
+    ).json()["id"]
+    client.post(
+        f"/incidents/{incident_id}/timeline",
+        json={"event_type": "note", "message": "m"},
+        headers=headers,
+    )
+
+    detail = client.get(f"/incidents/{incident_id}", headers=headers).json()
+    assert detail["title"] == "P"
+    assert "timeline" not in detail
+
+    projected = client.get(
+        f"/incidents/{incident_id}?fields=state,timeline", headers=headers
+    ).json()
+    assert set(projected) == {"state", "timeline"}
+    assert projected["timeline"][-1]["message"] == "m"
+
+    bad = client.get(
+        f"/incidents/{incident_id}?fields=secret", headers=headers
+    )
+    assert bad.status_code == 400
+
+    head = client.head(f"/incidents/{incident_id}", headers=headers)
+    assert head.status_code == 200 and head.content == b""
+    assert client.head("/incidents/999", headers=headers).status_code == 404
+
+
+def test_triage_analyzes_untriaged_incidents_in_one_call(
+    monkeypatch, temp_control_plane_storage
+):
+    monkeypatch.setenv("JUDICOR_API_KEY", "k")
+    client = TestClient(app)
+    headers = {"X-API-Key": "k"}
+    ids = [
+        client.post(
+            "/alerts", json={"alertname": name}, headers=headers
+        ).json()["id"]
+        for name in ("DiskFull", "HighLatency")
+    ]
+
+    resp = client.post("/incidents/triage", json={}, headers=headers)
+
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["analyses"] == {
+        str(n): f"Dummy analyzer response for incident {n}" for n in ids
+    }
+    assert (body["analyzed"], body["failed"]) == (2, 0)
+    # Analyzed incidents are not triaged again
+    resp = client.post("/incidents/triage", headers=headers)
+    assert resp.json()["analyses"] == {}
+
+    resp = client.post(
+        "/incidents/triage", json={"incident_ids": [999]}, headers=headers
+    )
+    assert resp.status_code == 404
+
+
+def test_resolve_flushes_deferred_summaries_before_the_resolution(
+    monkeypatch, temp_control_plane_storage
+):
+    from judicor.control_plane import app as app_module
+    from judicor.session import history_store
+
+    monkeypatch.setenv("JUDICOR_API_KEY", "k")
+    client = TestClient(app)
+    headers = {"X-API-Key": "k"}
+    incident_id = client.post(
+        "/incidents", json={"title": "x"}, headers=headers
+    ).json()["id"]
+    flushed = []
+    monkeypatch.setattr(
+        app_module.job_runner.pipeline,
+        "flush",
+        lambda: flushed.append(history_store.load_summary(incident_id)),
+    )
+
+    client.post(
+        f"/incidents/{incident_id}/resolve",
+        json={"resolution": "rolled back"},
+        headers=headers,
+    )
+
+    assert flushed == [None]
+    assert history_store.load_summary(incident_id) == "rolled back"
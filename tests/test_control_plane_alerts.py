@@ -0,0 +1,133 @@
+from datetime import datetime, timedelta, timezone
+
+from fastapi.testclient import TestClient
+
+from judicor.control_plane import alerts
+from judicor.control_plane.app import app, alert_index
+from judicor.domain.models import IncidentState
+from judicor.session import incident_store, timeline_store
+
+
+HEADERS = {"X-API-Key": "k"}
+
+
+def test_fingerprint_uses_only_configured_fields():
+    a = {"alertname": "HighCPU", "service": "api", "description": "x"}
+    b = {"alertname": "HighCPU", "service": "api", "description": "y"}
+    c = {"alertname": "HighCPU", "service": "db"}
+
+    fields = ["alertname", "service"]
+    assert alerts.compute_fingerprint(a, fields) == alerts.compute_fingerprint(
+        b, fields
+    )
+    assert alerts.compute_fingerprint(a, fields) != alerts.compute_fingerprint(
+        c, fields
+    )
+
+
+def test_fingerprint_supports_dotted_fields():
+    payload = {"labels": {"alertname": "Down"}}
+    other = {"labels": {"alertname": "Up"}}
+
+    fields = ["labels.alertname"]
+    assert alerts.compute_fingerprint(
+        payload, fields
+    ) != alerts.compute_fingerprint(other, fields)
+
+
+def test_alert_storm_is_deduplicated(monkeypatch, temp_control_plane_storage):
+    monkeypatch.setenv("JUDICOR_API_KEY", "k")
+    monkeypatch.setenv("JUDICOR_ALERT_FINGERPRINT_FIELDS", "alertname")
+    client = TestClient(app)
+
+    first = client.post(
+        "/alerts",
+        json={"alertname": "HighCPU", "summary": "cpu 95%"},
+        headers=HEADERS,
+    ).json()
+    assert not first["deduplicated"]
+
+    for _ in range(3):
+        resp = client.post(
+            "/alerts",
+            json={"alertname": "HighCPU", "summary": "cpu 97%"},
+            headers=HEADERS,
+        ).json()
+        assert resp["deduplicated"]
+        assert resp["id"] == first["id"]
+
+    assert len(incident_store.list_incidents()) == 1
+    alert_events = [
+        e
+        for e in timeline_store.load_timeline(first["id"])
+        if e.event_type == "alert"
+    ]
+    assert len(alert_events) == 4
+
+
+def test_resolved_incident_is_not_reused(
+    monkeypatch, temp_control_plane_storage
+):
+    monkeypatch.setenv("JUDICOR_API_KEY", "k")
+    monkeypatch.setenv("JUDICOR_ALERT_FINGERPRINT_FIELDS", "alertname")
+    client = TestClient(app)
+
+    first = client.post(
+        "/alerts", json={"alertname": "Disk"}, headers=HEADERS
+    ).json()
+    client.post(f"/incidents/{first['id']}/resolve", headers=HEADERS)
+
+    second = client.post(
+        "/alerts", json={"alertname": "Disk"}, headers=HEADERS
+    ).json()
+    assert not second["deduplicated"]
+    assert second["id"] != first["id"]
+
+
+def test_index_rebuilds_from_stores(monkeypatch, temp_control_plane_storage):
+    monkeypatch.setenv("JUDICOR_ALERT_FINGERPRINT_FIELDS", "alertname")
+    fingerprint = alerts.compute_fingerprint({"alertname": "Mem"})
+    incident = incident_store.create_incident(
+        "Mem", IncidentState.ACTIVE, fingerprint=fingerprint
+    )
+
+    alert_index.rebuild()
+
+    window = timedelta(minutes=5)
+    assert alert_index.match(fingerprint, window) == incident.id
+    later = datetime.now(timezone.utc) + timedelta(minutes=10)
+    assert alert_index.match(fingerprint, window, now=later) is None
+
+
+def test_index_is_shared_between_workers(temp_control_plane_storage):
+    window = timedelta(minutes=5)
+    alert_index.record("fp", 7)
+
+    # Another worker process has its own AlertIndex over the same file
+    other = alerts.AlertIndex()
+    assert other.match("fp", window) == 7
+
+    other.discard_incident(7)
+    assert alert_index.match("fp", window) is None
+
+
+def test_repeat_alerts_do_not_rewrite_the_index(temp_control_plane_storage):
+    alert_index.record("fp", 7)
+    version = alerts.file_version(alerts._index_path())
+
+    alert_index.record("fp", 7)
+
+    assert alerts.file_version(alerts._index_path()) == version
+
+
+def test_missing_index_file_is_not_rebuilt(
+    monkeypatch, temp_control_plane_storage
+):
+    alert_index.record("fp", 7)
+    alerts._index_path().unlink()
+
+    def fail():
+        raise AssertionError("index rebuilt on a lookup")
+
+    monkeypatch.setattr(alert_index, "rebuild", fail)
+    assert alert_index.match("fp", timedelta(minutes=5)) == 7
@@ -0,0 +1,72 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from judicor.control_plane import compression
+from judicor.control_plane.app import app
+from judicor.domain import encoding
+from judicor.session import timeline_store
+
+
+def _incident_with_timeline(client, headers, events=50):
+    resp = client.post("/incidents", json={"title": "Big"}, headers=headers)
+    incident_id = resp.json()["id"]
+    for n in range(events):
+        timeline_store.append_event(incident_id, "note", f"event {n} " * 8)
+    return incident_id
+
+
+def test_negotiate_falls_back_to_json(monkeypatch):
+    monkeypatch.setattr(encoding, "msgpack_available", lambda: False)
+
+    assert encoding.negotiate("application/msgpack") == "application/json"
+    assert encoding.accept_header("msgpack") == "application/json"
+
+
+def test_unknown_wire_format_is_rejected(monkeypatch):
+    monkeypatch.setenv("JUDICOR_WIRE_FORMAT", "xml")
+
+    with pytest.raises(ValueError):
+        encoding.get_wire_format()
+
+
+def test_large_responses_are_gzipped(monkeypatch, temp_control_plane_storage):
+    monkeypatch.setenv("JUDICOR_API_KEY", "k")
+    monkeypatch.setattr(compression, "zstd_available", lambda: False)
+    client = TestClient(app)
+    headers = {"X-API-Key": "k", "Accept-Encoding": "gzip"}
+    incident_id = _incident_with_timeline(client, headers)
+
+    resp = client.get(
+        f"/incidents/{incident_id}?fields=id,timeline",
+        headers=headers,
+    )
+    small = client.get("/health", headers=headers)
+    plain = client.get(
+        f"/incidents/{incident_id}?fields=id,timeline",
+        headers={"X-API-Key": "k", "Accept-Encoding": "identity"},
+    )
+
+    assert resp.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in resp.headers["vary"]
+    assert len(resp.json()["timeline"]) == 52
+    assert "content-encoding" not in small.headers
+    assert "content-encoding" not in plain.headers
+    assert plain.json() == resp.json()
+    assert int(resp.headers["content-length"]) < len(plain.content) / 2
+
+
+def test_msgpack_detail_round_trip(monkeypatch, temp_control_plane_storage):
+    msgpack = pytest.importorskip("msgpack")
+    monkeypatch.setenv("JUDICOR_API_KEY", "k")
+    client = TestClient(app)
+    headers = {"X-API-Key": "k"}
+    incident_id = _incident_with_timeline(client, headers, events=3)
+
+    resp = client.get(
+        f"/incidents/{incident_id}?fields=id,timeline",
+        headers={**headers, "Accept": encoding.accept_header("msgpack")},
+    )
+
+    assert resp.headers["content-type"] == "application/msgpack"
+    data = msgpack.unpackb(resp.content, raw=False)
+    assert data["id"] == incident_id and len(data["timeline"]) == 5
@@ -0,0 +1,137 @@
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from judicor.control_plane.app import app
+from judicor.session import idempotency_store, incident_store
+
+
+def _headers(key):
+    return {"X-API-Key": "k", "Idempotency-Key": key}
+
+
+def _create(client, title, key):
+    return client.post(
+        "/incidents", json={"title": title}, headers=_headers(key)
+    )
+
+
+def test_retried_create_returns_same_incident(
+    monkeypatch, temp_control_plane_storage
+):
+    monkeypatch.setenv("JUDICOR_API_KEY", "k")
+    client = TestClient(app)
+
+    first = _create(client, "A", "x")
+    retry = _create(client, "A", "x")
+
+    assert first.status_code == retry.status_code == 200
+    assert retry.json() == first.json()
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert len(incident_store.list_incidents()) == 1
+
+    other = _create(client, "A", "y")
+    assert other.json()["id"] != first.json()["id"]
+
+
+def test_key_reuse_with_different_payload_is_rejected(
+    monkeypatch, temp_control_plane_storage
+):
+    monkeypatch.setenv("JUDICOR_API_KEY", "k")
+    client = TestClient(app)
+
+    _create(client, "A", "x")
+    resp = _create(client, "B", "x")
+
+    assert resp.status_code == 422
+
+
+def test_replay_requires_a_valid_key(
+    monkeypatch, temp_control_plane_storage
+):
+    monkeypatch.setenv("JUDICOR_API_KEYS", "ci=c")
+    client = TestClient(app)
+    headers = {"X-API-Key": "c", "Idempotency-Key": "x"}
+
+    first = client.post("/incidents", json={"title": "A"}, headers=headers)
+    assert first.status_code == 200
+
+    # Revoked since: the stored response must not leak
+    monkeypatch.setenv("JUDICOR_API_KEYS", "")
+    retry = client.post("/incidents", json={"title": "A"}, headers=headers)
+    assert retry.status_code == 401
+
+
+def test_replay_is_rate_limited_once_per_request(
+    monkeypatch, temp_control_plane_storage
+):
+    monkeypatch.setenv("JUDICOR_API_KEYS", "ci=c:0.001:1")
+    client = TestClient(app)
+    headers = {"X-API-Key": "c", "Idempotency-Key": "x"}
+
+    # One token covers the first request through middleware and handler
+    first = client.post("/incidents", json={"title": "A"}, headers=headers)
+    assert first.status_code == 200
+
+    retry = client.post("/incidents", json={"title": "A"}, headers=headers)
+    assert retry.status_code == 429
+
+
+def test_errors_are_not_cached(monkeypatch, temp_control_plane_storage):
+    monkeypatch.setenv("JUDICOR_API_KEY", "k")
+    client = TestClient(app)
+    body = {"event_type": "note", "message": "m"}
+
+    missing = client.post(
+        "/incidents/1/timeline", json=body, headers=_headers("t")
+    )
+    assert missing.status_code == 404
+
+    _create(client, "A", "c")
+    ok = client.post(
+        "/incidents/1/timeline", json=body, headers=_headers("t")
+    )
+    assert ok.status_code == 200
+
+
+def test_cache_persists_and_expires(monkeypatch, temp_control_plane_storage):
+    key = idempotency_store.make_key("k", "POST", "/incidents", "x")
+    idempotency_store.save_response(key, "h", {"status": 200})
+
+    assert idempotency_store.load_response(key)["response"] == {"status": 200}
+
+    monkeypatch.setenv("JUDICOR_IDEMPOTENCY_TTL_SECONDS", "1")
+    later = time.time() + 10
+    monkeypatch.setattr(idempotency_store.time, "time", lambda: later)
+    assert idempotency_store.load_response(key) is None
+
+
+def test_prune_bounds_entry_count(monkeypatch, temp_control_plane_storage):
+    monkeypatch.setenv("JUDICOR_IDEMPOTENCY_MAX_ENTRIES", "3")
+    for i in range(5):
+        idempotency_store.save_response(str(i), "h", {})
+
+    assert idempotency_store.prune() == 2
+    assert len(list(idempotency_store.BASE_DIR.glob("*.json"))) == 3
+
+
+def test_prune_skips_keys_in_use(monkeypatch, temp_control_plane_storage):
+    idempotency_store.save_response("busy", "h", {})
+    monkeypatch.setenv("JUDICOR_IDEMPOTENCY_TTL_SECONDS", "1")
+    later = time.time() + 10
+    monkeypatch.setattr(idempotency_store.time, "time", lambda: later)
+
+    with idempotency_store.try_lock("busy"):
+        assert idempotency_store.prune() == 0
+    assert idempotency_store.prune() == 1
+
+
+def test_concurrent_request_with_same_key_conflicts(
+    temp_control_plane_storage,
+):
+    key = idempotency_store.make_key("a")
+    with idempotency_store.try_lock(key):
+        with pytest.raises(BlockingIOError):
+            with idempotency_store.try_lock(key):
+                pass
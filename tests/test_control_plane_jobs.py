@@ -0,0 +1,178 @@
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+
+from judicor.control_plane import app as app_module
+from judicor.control_plane.app import app, job_runner
+from judicor.control_plane.jobs import JobRunner, QueueFullError
+from judicor.domain.models import IncidentState
+from judicor.observability.metrics import REGISTRY
+from judicor.session import history_store, incident_store, job_store
+
+HEADERS = {"X-API-Key": "k"}
+
+
+def _wait(client, job_id, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        data = client.get(f"/jobs/{job_id}", headers=HEADERS).json()
+        if data["status"] in ("succeeded", "failed"):
+            return data
+        time.sleep(0.01)
+    raise AssertionError("job did not finish")
+
+
+def test_ask_job_runs_pipeline_server_side(
+    monkeypatch, temp_control_plane_storage
+):
+    monkeypatch.setenv("JUDICOR_API_KEY", "k")
+    client = TestClient(app)
+    incident_id = client.post(
+        "/incidents", json={"title": "slow db"}, headers=HEADERS
+    ).json()["id"]
+
+    resp = client.post(
+        f"/incidents/{incident_id}/ask",
+        json={"question": "why?"},
+        headers=HEADERS,
+    )
+    assert resp.status_code == 202
+    job = _wait(client, resp.json()["job_id"])
+
+    assert job["status"] == "succeeded"
+    assert job["result"]["success"]
+    assert history_store.load_history(incident_id)
+    incident = incident_store.load_incident(incident_id)
+    assert incident.state is IncidentState.INVESTIGATING
+
+    stream = client.get(f"/jobs/{job['id']}/stream", headers=HEADERS)
+    assert "event: token" in stream.text
+    assert "event: result" in stream.text
+
+    metrics = client.get("/metrics").text
+    assert "judicor_ask_job_duration_seconds_count" in metrics
+    assert "judicor_ask_queue_depth" in metrics
+
+
+def test_queue_depth_gauge_follows_the_app_runner(
+    temp_control_plane_storage,
+):
+    depth = REGISTRY.get("judicor_ask_queue_depth")
+    callback = depth.callback
+
+    JobRunner(workers=1, queue_size=1)
+
+    assert depth is app_module.ASK_QUEUE_DEPTH
+    assert depth.callback is callback
+    assert callback() == {(): float(job_runner.depth)}
+
+
+def test_ask_requires_question_and_incident(
+    monkeypatch, temp_control_plane_storage
+):
+    monkeypatch.setenv("JUDICOR_API_KEY", "k")
+    client = TestClient(app)
+
+    missing = client.post(
+        "/incidents/99/ask", json={"question": "q"}, headers=HEADERS
+    )
+    assert missing.status_code == 404
+
+    incident_id = client.post(
+        "/incidents", json={"title": "t"}, headers=HEADERS
+    ).json()["id"]
+    empty = client.post(
+        f"/incidents/{incident_id}/ask", json={}, headers=HEADERS
+    )
+    assert empty.status_code == 400
+
+    assert client.get("/jobs/nope", headers=HEADERS).status_code == 404
+
+
+def test_job_runner_rejects_when_queue_full(temp_control_plane_storage):
+    class _Blocking:
+        def ask(self, incident, question):
+            time.sleep(0.2)
+
+    runner = JobRunner(pipeline_factory=_Blocking, workers=1, queue_size=1)
+    incident = incident_store.create_incident("t", IncidentState.ACTIVE)
+
+    runner.submit(incident.id, "q")
+    with pytest.raises(QueueFullError):
+        runner.submit(incident.id, "q")
+    runner.shutdown()
+
+
+def test_rejected_streamed_answer_is_not_kept_as_partial(
+    temp_control_plane_storage
+):
+    from judicor.control_plane.jobs import job_store
+    from judicor.domain.results import AskResult
+
+    class _Rejecting:
+        def ask(self, incident, question, on_chunk=None):
+            on_chunk("guess")
+            return AskResult(success=False, message="low confidence")
+
+    runner = JobRunner(pipeline_factory=_Rejecting, workers=1)
+    incident = incident_store.create_incident("t", IncidentState.ACTIVE)
+
+    job = runner.submit(incident.id, "q")
+    runner.shutdown()
+
+    stored = job_store.load_job(job.id)
+    assert stored.result["message"] == "low confidence"
+    assert stored.partial == ""
+
+
+def _dead_pid() -> int:
+    proc = subprocess.Popen([sys.executable, "-c", "pass"])
+    proc.wait()
+    return proc.pid
+
+
+def _running_job(worker: int) -> job_store.Job:
+    job = job_store.Job(
+        id="orphan", incident_id=1, question="why?", worker=worker
+    )
+    job.status = job_store.RUNNING
+    job_store.save_job(job)
+    return job
+
+
+def test_jobs_of_a_dead_worker_are_failed_at_startup(
+    monkeypatch, temp_control_plane_storage
+):
+    monkeypatch.setenv("JUDICOR_API_KEY", "k")
+    _running_job(_dead_pid())
+
+    with TestClient(app):
+        pass
+
+    job = job_store.load_job("orphan")
+    assert job.status == job_store.FAILED
+    assert job.error == job_store.ABANDONED
+
+
+def test_stream_ends_when_the_worker_died(
+    monkeypatch, temp_control_plane_storage
+):
+    monkeypatch.setenv("JUDICOR_API_KEY", "k")
+    _running_job(_dead_pid())
+
+    stream = TestClient(app).get("/jobs/orphan/stream", headers=HEADERS)
+
+    assert "event: result" in stream.text
+    assert job_store.ABANDONED in stream.text
+
+
+def test_unsaved_jobs_expire_after_the_lease(temp_control_plane_storage):
+    job = _running_job(worker=None)
+    assert not job_store.is_abandoned(job, lease_seconds=60)
+
+    job.updated_at = datetime.now(timezone.utc) - timedelta(minutes=2)
+    assert job_store.is_abandoned(job, lease_seconds=60)
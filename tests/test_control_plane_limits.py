@@ -0,0 +1,141 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from judicor.control_plane import app as app_module
+from judicor.control_plane import limits
+from judicor.control_plane.app import app
+
+
+def test_parse_api_keys_with_quotas():
+    quotas = limits.parse_api_keys("ci=abc:5:10,pager=def", "legacy")
+
+    assert quotas["legacy"].name == "default"
+    assert quotas["abc"].name == "ci"
+    assert (quotas["abc"].rate, quotas["abc"].burst) == (5.0, 10.0)
+    # Keys without an explicit rate, the legacy one included, are unlimited
+    assert quotas["def"].rate == 0
+    assert quotas["legacy"].rate == 0
+
+
+def test_parse_api_keys_rejects_malformed_entry():
+    with pytest.raises(ValueError):
+        limits.parse_api_keys("no-equals-sign", None)
+
+
+def test_api_keys_are_parsed_once_and_checked_at_startup(monkeypatch):
+    calls = []
+
+    def parse(raw, legacy_key):
+        calls.append(raw)
+        return limits.parse_api_keys(raw, legacy_key)
+
+    monkeypatch.setattr(app_module, "parse_api_keys", parse)
+    monkeypatch.setenv("JUDICOR_API_KEYS", "ci=abc:5")
+    app_module._parse_api_keys.cache_clear()
+
+    for _ in range(3):
+        assert "abc" in app_module._get_api_keys()
+    assert calls == ["ci=abc:5"]
+
+    monkeypatch.setenv("JUDICOR_API_KEYS", "broken")
+    with pytest.raises(ValueError):
+        with TestClient(app):
+            pass
+    app_module._parse_api_keys.cache_clear()
+
+
+def test_token_bucket_refills_over_time(temp_rate_limit_store):
+    limiter = limits.RateLimiter()
+    quota = limits.ApiKeyQuota("ci", "abc", rate=1.0, burst=2.0)
+
+    assert limiter.check(quota, "/r", now=0.0) == 0.0
+    assert limiter.check(quota, "/r", now=0.0) == 0.0
+    assert limiter.check(quota, "/r", now=0.0) == pytest.approx(1.0)
+    # Other routes have their own bucket
+    assert limiter.check(quota, "/other", now=0.0) == 0.0
+    assert limiter.check(quota, "/r", now=1.0) == 0.0
+
+
+def test_buckets_are_shared_between_workers(temp_rate_limit_store):
+    quota = limits.ApiKeyQuota("ci", "abc", rate=1.0, burst=2.0)
+    first, second = limits.RateLimiter(), limits.RateLimiter()
+
+    assert first.check(quota, "/r", now=0.0) == 0.0
+    assert second.check(quota, "/r", now=0.0) == 0.0
+    for limiter in (first, second, first):
+        limiter.sync(now=0.0)
+
+    # Both workers now see the two tokens spent between them
+    assert first.check(quota, "/r", now=0.0) == pytest.approx(1.0)
+    assert second.check(quota, "/r", now=0.0) == pytest.approx(1.0)
+    assert list(second.snapshot()) == [("ci", "/r")]
+
+
+def test_check_does_no_file_io(monkeypatch, temp_rate_limit_store):
+    def fail(*args, **kwargs):
+        raise AssertionError("file access on the request path")
+
+    monkeypatch.setattr(limits, "file_lock", fail)
+    monkeypatch.setattr(limits, "secure_write_json", fail)
+    quota = limits.ApiKeyQuota("ci", "abc", rate=1.0, burst=2.0)
+
+    assert limits.RateLimiter().check(quota, "/r", now=0.0) == 0.0
+
+
+def test_rate_limited_key_gets_429_with_retry_after(
+    monkeypatch, temp_control_plane_storage
+):
+    monkeypatch.setenv("JUDICOR_API_KEY", "k")
+    monkeypatch.setenv("JUDICOR_API_KEYS", "noisy=n:0.001:2")
+    client = TestClient(app)
+
+    created = client.post(
+        "/incidents", json={"title": "x"}, headers={"X-API-Key": "k"}
+    ).json()
+    path = f"/incidents/{created['id']}/timeline"
+    body = {"event_type": "note", "message": "m"}
+
+    noisy = {"X-API-Key": "n"}
+    assert client.post(path, json=body, headers=noisy).status_code == 200
+    assert client.post(path, json=body, headers=noisy).status_code == 200
+    resp = client.post(path, json=body, headers=noisy)
+    assert resp.status_code == 429
+    assert int(resp.headers["Retry-After"]) >= 1
+
+    # Other keys are unaffected
+    ok = client.post(path, json=body, headers={"X-API-Key": "k"})
+    assert ok.status_code == 200
+
+    metrics = client.get("/metrics").text
+    assert (
+        'judicor_rate_limited_total{client="noisy",'
+        'route="/incidents/{incident_id}/timeline"} 1'
+    ) in metrics
+    assert "judicor_rate_limit_tokens{" in metrics
+
+
+def test_load_shedding_returns_503(monkeypatch):
+    monkeypatch.setenv("JUDICOR_MAX_IN_FLIGHT", "1")
+    sent = []
+
+    async def inner(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200})
+
+    async def send(message):
+        sent.append(message)
+
+    middleware = limits.LoadSheddingMiddleware(inner)
+    middleware.in_flight = 1
+    scope = {"type": "http", "path": "/incidents", "method": "GET"}
+    asyncio.run(middleware(scope, None, send))
+
+    start = sent[0]
+    assert start["status"] == 503
+    assert (b"retry-after", b"1") in start["headers"]
+
+    sent.clear()
+    health = {"type": "http", "path": "/health", "method": "GET"}
+    asyncio.run(middleware(health, None, send))
+    assert sent[0]["status"] == 200
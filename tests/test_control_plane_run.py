@@ -0,0 +1,62 @@
+import pytest
+
+from judicor.control_plane import run
+
+
+def test_dev_mode_is_default(monkeypatch):
+    monkeypatch.delenv("JUDICOR_PLANE_MODE", raising=False)
+    config = run.build_server_config()
+    assert config["reload"] is True
+    assert "workers" not in config
+
+
+def test_prod_mode_reads_tuning_env(monkeypatch):
+    monkeypatch.setenv("JUDICOR_PLANE_MODE", "prod")
+    monkeypatch.setenv("JUDICOR_PLANE_WORKERS", "4")
+    monkeypatch.setenv("JUDICOR_PLANE_KEEP_ALIVE", "30")
+    monkeypatch.setenv("JUDICOR_PLANE_BACKLOG", "4096")
+    monkeypatch.setenv("JUDICOR_PLANE_GRACEFUL_TIMEOUT", "10")
+
+    config = run.build_server_config()
+
+    assert config["reload"] is False
+    assert config["workers"] == 4
+    assert config["timeout_keep_alive"] == 30
+    assert config["backlog"] == 4096
+    assert config["timeout_graceful_shutdown"] == 10
+
+
+def test_unknown_mode_rejected(monkeypatch):
+    monkeypatch.setenv("JUDICOR_PLANE_MODE", "staging")
+    with pytest.raises(ValueError):
+        run.build_server_config()
+
+
+def test_main_preloads_app_in_prod(monkeypatch, tmp_path):
+    monkeypatch.setenv("JUDICOR_PLANE_MODE", "prod")
+    monkeypatch.setenv("JUDICOR_METRICS_DIR", str(tmp_path))
+    calls = []
+    monkeypatch.setattr(run, "preload_app", lambda: calls.append("preload"))
+    monkeypatch.setattr(
+        run.uvicorn, "run", lambda app, **kw: calls.append((app, kw))
+    )
+
+    run.main()
+
+    assert calls[0] == "preload"
+    assert calls[1][0] == run.APP_PATH
+
+
+def test_multi_worker_main_shares_metrics(monkeypatch, tmp_path):
+    monkeypatch.setenv("JUDICOR_PLANE_MODE", "prod")
+    monkeypatch.setenv("JUDICOR_PLANE_WORKERS", "2")
+    monkeypatch.delenv("JUDICOR_METRICS_DIR", raising=False)
+    monkeypatch.setattr(run, "DEFAULT_METRICS_DIR", tmp_path)
+    (tmp_path / "123.json").write_text("{}")
+    monkeypatch.setattr(run, "preload_app", lambda: None)
+    monkeypatch.setattr(run.uvicorn, "run", lambda app, **kw: None)
+
+    run.main()
+
+    assert run.os.environ["JUDICOR_METRICS_DIR"] == str(tmp_path)
+    assert not (tmp_path / "123.json").exists()
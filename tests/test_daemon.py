@@ -0,0 +1,209 @@
+import socket
+import threading
+import time
+
+import pytest
+from typer.testing import CliRunner
+
+from judicor.ai.interface import AIReasoner
+from judicor.cli import app
+from judicor.client.implementations.dummy import DummyJudicorClient
+from judicor.daemon import client as daemon_client
+from judicor.daemon.protocol import decode, encode, from_wire, to_wire
+from judicor.daemon.server import DAEMON_REQUESTS, JudicorDaemon, is_running
+from judicor.domain.models import Incident, IncidentState
+from judicor.domain.results import (
+    AskResult,
+    TriageResult,
+    TriggerResult,
+)
+
+
+class _StubReasoner(AIReasoner):
+    def ask(self, incident, question):
+        return AskResult(
+            success=True, answer="warm answer", confidence=0.9, reasoning="r"
+        )
+
+
+@pytest.fixture
+def running_daemon(
+    tmp_path,
+    temp_session_store,
+    temp_timeline_store,
+    temp_incident_store,
+    temp_history_store,
+):
+    path = tmp_path / "d.sock"
+    server = JudicorDaemon(
+        DummyJudicorClient(reasoner=_StubReasoner()), path=path
+    )
+    server.start()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    thread.join(timeout=5)
+
+
+def test_results_and_incidents_round_trip():
+    incident = Incident(id=3, title="t", state=IncidentState.ACTIVE)
+    result = AskResult(success=True, answer="a", confidence=0.5)
+
+    assert from_wire(to_wire([incident])) == [incident]
+    assert from_wire(to_wire(result)) == result
+    triage = TriageResult(success=True, analyses={3: "a", 4: None})
+    assert from_wire(decode(encode(to_wire(triage)))) == triage
+
+
+def test_client_calls_are_served_by_daemon(running_daemon):
+    client = daemon_client.connect(running_daemon.path)
+    assert client is not None and client.ping()
+
+    incidents = client.list_incidents()
+    assert [i.id for i in incidents] == [1, 2]
+    assert client.attach_incident(1).success
+    assert client.status_incident().state == "active"
+
+    chunks = []
+    result = client.ask_ai_stream("why?", chunks.append)
+    assert result.success
+    assert "".join(chunks) == "warm answer"
+
+    with pytest.raises(daemon_client.DaemonError):
+        client._call("drop_tables")
+    client.close()
+
+
+def test_daemon_follows_session_changes_from_other_processes(
+    running_daemon, temp_session_store
+):
+    client = daemon_client.connect(running_daemon.path)
+    client.list_incidents()
+    temp_session_store.save_attached_incident(2)
+
+    assert client.status_incident().state == "resolved"
+    client.close()
+
+
+def test_socket_is_removed_on_stop_and_stale_socket_replaced(
+    running_daemon,
+):
+    path = running_daemon.path
+    assert is_running(path)
+
+    daemon_client.connect(path).stop_daemon()
+    deadline = time.monotonic() + 5
+    while path.exists() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert not path.exists()
+    assert daemon_client.connect(path) is None
+
+    # A socket file left behind by a crashed daemon does not block restart
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(str(path))
+    stale.close()
+    assert path.exists() and not is_running(path)
+
+    restarted = JudicorDaemon(running_daemon.client, path=path)
+    restarted.start()
+    assert is_running(path)
+    restarted._server.server_close()
+
+
+def test_cli_forwards_to_daemon_and_falls_back(
+    monkeypatch, running_daemon, tmp_path
+):
+    runner = CliRunner()
+    monkeypatch.setenv("JUDICOR_DAEMON_SOCKET", str(running_daemon.path))
+    monkeypatch.setattr(app, "_client_instance", None)
+    before = DAEMON_REQUESTS.value(method="list_incidents", outcome="ok")
+
+    result = runner.invoke(app.app, ["list"])
+
+    assert result.exit_code == 0
+    assert "Dummy Incident 1" in result.stdout
+    assert (
+        DAEMON_REQUESTS.value(method="list_incidents", outcome="ok")
+        == before + 1
+    )
+
+    # No daemon at the configured path: run in-process
+    monkeypatch.setenv("JUDICOR_DAEMON_SOCKET", str(tmp_path / "none.sock"))
+    monkeypatch.setattr(app, "_client_instance", None)
+    local = object()
+    monkeypatch.setattr(app, "create_judicor_client", lambda: local)
+
+    assert app.get_client() is local
+
+
+def test_daemon_started_with_other_settings_is_not_used(
+    monkeypatch, running_daemon
+):
+    monkeypatch.setenv("JUDICOR_DAEMON_SOCKET", str(running_daemon.path))
+    monkeypatch.setenv("JUDICOR_CLIENT_TYPE", "http")
+    monkeypatch.setattr(app, "_client_instance", None)
+    local = object()
+    monkeypatch.setattr(app, "create_judicor_client", lambda: local)
+
+    assert app.get_client() is local
+    with pytest.raises(daemon_client.DaemonConfigMismatch):
+        daemon_client.connect(running_daemon.path, config="other")
+    client = daemon_client.connect(
+        running_daemon.path, config=running_daemon.config
+    )
+    assert client._sock.gettimeout() == (
+        daemon_client.DEFAULT_CALL_TIMEOUT_SECONDS
+    )
+    client.close()
+
+
+def test_cli_falls_back_when_the_daemon_is_gone(monkeypatch):
+    class _DyingDaemon:
+        def trigger(self):
+            raise daemon_client.DaemonUnavailable("Broken pipe")
+
+    class _Local:
+        def trigger(self):
+            return TriggerResult(success=True, incident_id=7)
+
+    monkeypatch.setattr(app, "_client_instance", _DyingDaemon())
+    monkeypatch.setattr(app, "create_judicor_client", _Local)
+
+    result = CliRunner().invoke(app.app, ["trigger"])
+
+    assert result.exit_code == 0
+    assert "New incident created: 7" in result.stdout
+    assert isinstance(app._client_instance, _Local)
+
+
+def test_cli_does_not_rerun_a_call_the_daemon_received(monkeypatch):
+    calls = []
+
+    class _FailingDaemon:
+        def trigger(self):
+            calls.append("daemon")
+            raise daemon_client.DaemonError("RuntimeError: boom")
+
+    def _local():
+        calls.append("local")
+
+    monkeypatch.setattr(app, "_client_instance", _FailingDaemon())
+    monkeypatch.setattr(app, "create_judicor_client", _local)
+
+    result = CliRunner().invoke(app.app, ["trigger"])
+
+    assert result.exit_code == 1
+    assert "Daemon error: RuntimeError: boom" in result.stderr
+    assert calls == ["daemon"]
+
+
+def test_call_to_a_vanished_daemon_is_unavailable():
+    ours, theirs = socket.socketpair()
+    theirs.close()
+    client = daemon_client.DaemonJudicorClient(ours)
+
+    with pytest.raises(daemon_client.DaemonUnavailable):
+        client.trigger()
+    client.close()
@@ -12,3 +12,36 @@ def test_append_and_load_history(temp_history_store):
 def test_summary_roundtrip(temp_history_store):
     history_store.set_summary(1, "summary text")
     assert history_store.load_summary(1) == "summary text"
+
+
+def test_summary_checkpoint_tracks_covered_entries(temp_history_store):
+    for n in range(3):
+        covered = history_store.append_entry(
+            1, AgentRole.INVESTIGATOR, f"finding {n}"
+        )
+    history_store.set_summary(1, "first two", covered=2)
+    history_store.set_summary(1, "rewritten")
+
+    checkpoint = history_store.load_checkpoint(1)
+    assert covered == 3
+    assert (checkpoint.summary, checkpoint.covered) == ("rewritten", 2)
+    pending = history_store.entries_since(1, checkpoint.covered)
+    assert [e.content for e in pending] == ["finding 2"]
+
+
+def test_summary_without_checkpoint_covers_nothing(temp_history_store):
+    path = temp_history_store.BASE_DIR / "1" / "summary.json"
+    path.parent.mkdir(parents=True)
+    path.write_text('{"summary": "legacy"}')
+
+    assert history_store.load_checkpoint(1).covered == 0
+    assert history_store.load_summary(1) == "legacy"
+
+
+def test_summary_checkpoint_never_moves_backwards(temp_history_store):
+    assert history_store.set_summary(1, "resolution", covered=5)
+
+    # A summarizer run that started earlier finishes late
+    assert not history_store.set_summary(1, "stale", covered=3)
+    checkpoint = history_store.load_checkpoint(1)
+    assert (checkpoint.summary, checkpoint.covered) == ("resolution", 5)
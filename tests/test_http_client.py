@@ -1,7 +1,14 @@
+import socket
+import time
+
+import pytest
+import requests
 from fastapi.testclient import TestClient
 
+from judicor.client.implementations import http, http_base
 from judicor.client.implementations.http import HttpJudicorClient
 from judicor.control_plane.app import app
+from judicor.session import outbox_store
 
 
 def test_http_client_flow(monkeypatch, temp_control_plane_storage):
@@ -13,12 +20,12 @@ def test_http_client_flow(monkeypatch, temp_control_plane_storage):
         def __init__(self, tc):
             self.tc = tc
 
-        def get(self, url, headers=None):
+        def get(self, url, headers=None, stream=False, timeout=None):
             return self.tc.get(
                 url.replace(str(self.tc.base_url), ""), headers=headers
             )
 
-        def post(self, url, json=None, headers=None):
+        def post(self, url, json=None, headers=None, timeout=None):
             return self.tc.post(
                 url.replace(str(self.tc.base_url), ""),
                 json=json,
@@ -37,11 +44,253 @@ def test_http_client_flow(monkeypatch, temp_control_plane_storage):
     incidents = client.list_incidents()
     assert any(i.id == incident_id for i in incidents)
 
+    # Triage batch-analyzes it server-side
+    triage = client.triage([incident_id])
+    assert triage.success
+    assert "analyzer" in triage.analyses[incident_id]
+
     # Attach + status
     assert client.attach_incident(incident_id).success
     status = client.status_incident()
     assert status.success
 
+    # Ask runs server-side as a background job
+    answer = client.ask_ai("what changed?")
+    assert answer.success
+    assert "investigator" in answer.answer
+
+    chunks = []
+    streamed = client.ask_ai_stream("and now?", chunks.append)
+    assert streamed.success
+    assert "".join(chunks) == streamed.answer
+
     # Resolve
     result = client.resolve_incident()
     assert result.success
+
+
+class _Reply:
+    def __init__(self, status_code, body=None, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self._body = body or {}
+
+    def json(self):
+        return self._body
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code}", response=self)
+
+
+class _ScriptedSession:
+    def __init__(self, replies):
+        self.replies = list(replies)
+        self.keys = []
+
+    def post(self, url, json=None, headers=None):
+        self.keys.append(headers["Idempotency-Key"])
+        reply = self.replies.pop(0)
+        if isinstance(reply, Exception):
+            raise reply
+        return reply
+
+
+def test_transient_failures_are_retried_with_the_same_key(
+    monkeypatch, capsys, temp_outbox_store
+):
+    monkeypatch.setenv("JUDICOR_DEBUG", "1")
+    sleeps = []
+    monkeypatch.setattr(http.time, "sleep", sleeps.append)
+    client = HttpJudicorClient(base_url="http://plane", api_key="k")
+    client.session = _ScriptedSession(
+        [
+            requests.ConnectionError("refused"),
+            _Reply(503, headers={"Retry-After": "1"}),
+            _Reply(200, {"id": 5}),
+        ]
+    )
+
+    result = client.trigger()
+
+    assert result.success and result.incident_id == 5
+    assert len(set(client.session.keys)) == 1
+    assert client.stats.retries == 2
+    assert sleeps[1] >= 1.0
+    assert "POST /incidents -> 200" in capsys.readouterr().err
+
+
+def test_retries_are_bounded(monkeypatch, temp_outbox_store):
+    monkeypatch.setenv("JUDICOR_HTTP_RETRIES", "2")
+    monkeypatch.setattr(http.time, "sleep", lambda _: None)
+    client = HttpJudicorClient(base_url="http://plane", api_key="k")
+    client.session = _ScriptedSession([_Reply(503)] * 3)
+
+    result = client.trigger()
+
+    assert not result.success
+    assert client.session.replies == []
+    assert client.stats.failures == 1
+
+
+def test_retry_after_is_honoured_within_the_retry_budget(
+    monkeypatch, temp_outbox_store
+):
+    monkeypatch.setenv("JUDICOR_HTTP_RETRY_BUDGET", "20")
+    sleeps = []
+    monkeypatch.setattr(http.time, "sleep", sleeps.append)
+    client = HttpJudicorClient(base_url="http://plane", api_key="k")
+    client.session = _ScriptedSession(
+        [_Reply(429, headers={"Retry-After": "12"}), _Reply(200, {"id": 5})]
+    )
+
+    assert client.trigger().success
+    # Above JUDICOR_HTTP_BACKOFF_MAX, but the server asked for it
+    assert sleeps == [12.0]
+
+    # Waiting 60s would overrun the budget: give up at once
+    client.session = _ScriptedSession(
+        [_Reply(503, headers={"Retry-After": "60"}), _Reply(200, {"id": 6})]
+    )
+
+    result = client.trigger()
+
+    assert not result.success and "503" in result.message
+    assert sleeps == [12.0]
+    assert len(client.session.replies) == 1
+
+
+def test_hung_control_plane_times_out(monkeypatch):
+    monkeypatch.setenv("JUDICOR_HTTP_READ_TIMEOUT", "0.2")
+    monkeypatch.setenv("JUDICOR_HTTP_RETRIES", "0")
+    # Accepts connections (via the backlog) but never answers
+    with socket.socket() as server:
+        server.bind(("127.0.0.1", 0))
+        server.listen(1)
+        port = server.getsockname()[1]
+        client = HttpJudicorClient(
+            base_url=f"http://127.0.0.1:{port}", api_key="k"
+        )
+
+        start = time.monotonic()
+        with pytest.raises(requests.Timeout):
+            client.list_incidents()
+
+    assert time.monotonic() - start < 5
+
+
+def test_malformed_timeouts_fall_back_to_defaults(monkeypatch):
+    monkeypatch.setenv("JUDICOR_ASK_TIMEOUT", "2m")
+    monkeypatch.setenv("JUDICOR_HTTP_READ_TIMEOUT", "soon")
+
+    client = HttpJudicorClient(base_url="http://plane", api_key="k")
+
+    assert client.ask_timeout == http_base.DEFAULT_ASK_TIMEOUT
+    assert client.timeout[1] == http_base.DEFAULT_READ_TIMEOUT
+
+
+KEY_ID = outbox_store.key_id("k")
+PLANE_TARGET = ("http://plane", KEY_ID)
+
+
+def _offline_client(replies):
+    client = HttpJudicorClient(base_url="http://plane", api_key="k")
+    client.session = _ScriptedSession(replies)
+    client.current_incident = 7
+    return client
+
+
+def test_mutations_are_queued_while_the_control_plane_is_down(
+    monkeypatch, temp_outbox_store
+):
+    monkeypatch.setenv("JUDICOR_HTTP_RETRIES", "0")
+    client = _offline_client(
+        [
+            requests.ConnectionError("refused"),
+            requests.ConnectionError("refused"),
+            requests.ConnectionError("refused"),
+        ]
+    )
+
+    first = client.append_timeline_event("note", "checked dashboards")
+    second = client.resolve_incident()
+
+    assert not first.success and "1 pending" in first.message
+    assert not second.success and "2 pending" in second.message
+    queued = temp_outbox_store.pending()
+    assert [e.path for e in queued] == [
+        "/incidents/7/timeline",
+        "/incidents/7/resolve",
+    ]
+    assert queued[0].attempts == 1
+
+    # Once the plane is back the backlog is replayed in order with the
+    # keys it was queued under.
+    client.session = _ScriptedSession([_Reply(200)] * 2)
+    report = client.flush_outbox(batch_size=1)
+
+    assert (report.sent, report.failed, report.remaining) == (2, 0, 0)
+    assert client.session.keys == [e.idempotency_key for e in queued]
+
+
+def test_flush_dead_letters_rejected_entries_and_keeps_order(
+    monkeypatch, temp_outbox_store
+):
+    monkeypatch.setenv("JUDICOR_HTTP_RETRIES", "0")
+    for n in range(3):
+        temp_outbox_store.enqueue(
+            f"/incidents/{n}/resolve", {}, f"k{n}", *PLANE_TARGET
+        )
+    client = _offline_client([_Reply(404), _Reply(200), _Reply(503)])
+
+    report = client.flush_outbox()
+
+    assert (report.sent, report.failed, report.remaining) == (1, 1, 1)
+    assert [e.idempotency_key for e in temp_outbox_store.pending()] == ["k2"]
+    failed = list((temp_outbox_store.BASE_DIR / "failed").glob("*.json"))
+    assert len(failed) == 1
+
+
+def test_flush_reports_the_jobs_of_queued_asks(
+    monkeypatch, temp_outbox_store
+):
+    monkeypatch.setenv("JUDICOR_HTTP_RETRIES", "0")
+    client = _offline_client([requests.ConnectionError("refused")])
+    assert "1 pending" in client.ask_ai("why?").message
+
+    client.session = _ScriptedSession([_Reply(202, {"job_id": "j1"})])
+    report = client.flush_outbox()
+
+    assert report.asks == [("/incidents/7/ask", "why?", "j1")]
+
+
+def test_new_mutations_queue_behind_an_undelivered_backlog(
+    monkeypatch, temp_outbox_store
+):
+    monkeypatch.setenv("JUDICOR_HTTP_RETRIES", "0")
+    temp_outbox_store.enqueue(
+        "/incidents/7/timeline", {}, "older", *PLANE_TARGET
+    )
+    client = _offline_client([requests.ConnectionError("refused")])
+
+    result = client.resolve_incident()
+
+    assert "2 pending" in result.message
+    assert client.session.keys == ["older"]
+
+
+def test_flush_leaves_entries_queued_for_another_key_or_plane(
+    monkeypatch, temp_outbox_store
+):
+    monkeypatch.setenv("JUDICOR_HTTP_RETRIES", "0")
+    other_key = temp_outbox_store.key_id("rotated")
+    temp_outbox_store.enqueue("/a", {}, "old-key", "http://plane", other_key)
+    temp_outbox_store.enqueue("/b", {}, "old-plane", "http://old", KEY_ID)
+    temp_outbox_store.enqueue("/c", {}, "mine", *PLANE_TARGET)
+    client = _offline_client([_Reply(200)])
+
+    report = client.flush_outbox()
+
+    assert client.session.keys == ["mine"]
+    assert (report.sent, report.remaining) == (1, 0)
+    assert temp_outbox_store.size() == 2
@@ -1,3 +1,5 @@
+import pytest
+
 from judicor.domain.models import IncidentState
 from judicor.session import incident_store
 
@@ -21,3 +23,55 @@ def test_load_and_update_state(temp_incident_store):
     incident_store.update_state(loaded, IncidentState.ACTIVE)
     reloaded = incident_store.load_incident(inc.id)
     assert reloaded.state is IncidentState.ACTIVE
+
+
+def test_concurrent_creates_allocate_unique_ids(temp_incident_store):
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        created = list(
+            pool.map(
+                lambda i: incident_store.create_incident(
+                    f"I{i}", IncidentState.CREATED
+                ),
+                range(32),
+            )
+        )
+
+    ids = [inc.id for inc in created]
+    assert len(set(ids)) == 32
+
+
+def test_update_state_validates_against_stored_record(temp_incident_store):
+    inc = incident_store.create_incident("Four", IncidentState.ACTIVE)
+    stale = incident_store.load_incident(inc.id)
+    incident_store.update_state(inc, IncidentState.RESOLVED)
+
+    # A worker still holding the active copy cannot re-open it
+    with pytest.raises(ValueError):
+        incident_store.update_state(stale, IncidentState.INVESTIGATING)
+    assert (
+        incident_store.load_incident(inc.id).state is IncidentState.RESOLVED
+    )
+
+
+def test_state_counts_are_backfilled_then_maintained(temp_incident_store):
+    first = temp_incident_store.create_incident(
+        title="A", initial_state=IncidentState.ACTIVE
+    )
+    temp_incident_store.create_incident(
+        title="B", initial_state=IncidentState.ACTIVE
+    )
+
+    assert temp_incident_store.count_by_state() == {"active": 2}
+
+    temp_incident_store.update_state(first, IncidentState.RESOLVED)
+    temp_incident_store.create_incident(
+        title="C", initial_state=IncidentState.CREATED
+    )
+
+    assert temp_incident_store.count_by_state() == {
+        "active": 1,
+        "resolved": 1,
+        "created": 1,
+    }
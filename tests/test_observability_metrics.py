@@ -0,0 +1,80 @@
+import json
+
+import pytest
+
+from judicor.observability.metrics import Registry
+
+
+def test_counter_and_gauge_render():
+    registry = Registry()
+    counter = registry.counter("c_total", "help", ["kind"])
+    gauge = registry.gauge("g", "help")
+
+    counter.inc(kind="a")
+    counter.inc(2, kind="a")
+    gauge.set(5)
+
+    text = registry.render()
+    assert "# TYPE c_total counter" in text
+    assert 'c_total{kind="a"} 3' in text
+    assert "g 5" in text
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = Registry()
+    hist = registry.histogram("h_seconds", "help", buckets=(0.1, 1.0))
+
+    hist.observe(0.05)
+    hist.observe(0.5)
+    hist.observe(5)
+
+    text = registry.render()
+    assert 'h_seconds_bucket{le="0.1"} 1' in text
+    assert 'h_seconds_bucket{le="1"} 2' in text
+    assert 'h_seconds_bucket{le="+Inf"} 3' in text
+    assert "h_seconds_count 3" in text
+
+
+def test_gauge_callback_evaluated_at_render():
+    registry = Registry()
+    registry.gauge("items", "help", ["state"], callback=lambda: {("x",): 2})
+    assert 'items{state="x"} 2' in registry.render()
+
+
+def test_registry_is_get_or_create_and_validates_labels():
+    registry = Registry()
+    first = registry.counter("c_total", "help", ["kind"])
+    assert registry.counter("c_total", "help", ["kind"]) is first
+
+    with pytest.raises(ValueError):
+        first.inc(other="x")
+
+
+def test_scrape_sums_counters_across_worker_snapshots(monkeypatch, tmp_path):
+    monkeypatch.setenv("JUDICOR_METRICS_DIR", str(tmp_path))
+    registry = Registry()
+    counter = registry.counter("c_total", "help", ["kind"])
+    hist = registry.histogram("h_seconds", "help", buckets=(1.0,))
+    gauge = registry.gauge("g", "help")
+    counter.inc(kind="a")
+    hist.observe(0.5)
+    gauge.set(1)
+    # Another worker's last snapshot
+    (tmp_path / "99999.json").write_text(
+        json.dumps(
+            {
+                "c_total": [[["a"], 2.0], [["b"], 1.0]],
+                "h_seconds": [[[], [1.0, 0.25, 1.0]]],
+                "g": [[[], 10.0]],
+            }
+        )
+    )
+
+    text = registry.render()
+
+    assert 'c_total{kind="a"} 3' in text
+    assert 'c_total{kind="b"} 1' in text
+    assert 'h_seconds_bucket{le="1"} 2' in text
+    assert "h_seconds_count 2" in text
+    # Gauges describe this process only
+    assert "g 1" in text
@@ -1,3 +1,5 @@
+import os
+
 from judicor.session import timeline_store
 
 
@@ -27,3 +29,44 @@ def test_append_creates_directories_and_sets_timestamp(temp_timeline_store):
     assert len(events) == 1
     assert events[0].event_type == "note"
     assert events[0].timestamp.tzinfo is not None
+
+
+def _append_many(base, count):
+    timeline_store.BASE_DIR = base
+    for i in range(count):
+        timeline_store.append_event(7, "note", f"event {i}")
+
+
+def test_concurrent_appends_from_processes_are_not_lost(temp_timeline_store):
+    import multiprocessing
+
+    ctx = multiprocessing.get_context("fork")
+    procs = [
+        ctx.Process(
+            target=_append_many, args=(temp_timeline_store.BASE_DIR, 20)
+        )
+        for _ in range(4)
+    ]
+    for proc in procs:
+        proc.start()
+    for proc in procs:
+        proc.join()
+
+    assert len(timeline_store.load_timeline(7)) == 80
+
+
+def test_version_changes_on_same_size_rewrite_within_one_tick(
+    temp_timeline_store,
+):
+    timeline_store.append_event(1, "note", "aaaa")
+    path = timeline_store._timeline_path(1)
+    stat = path.stat()
+    before = timeline_store.timeline_version(1)
+
+    # Same size and mtime, new file: only the inode tells them apart
+    replacement = path.with_suffix(".tmp")
+    replacement.write_bytes(path.read_bytes().replace(b"aaaa", b"bbbb"))
+    os.utime(replacement, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    os.replace(replacement, path)
+
+    assert timeline_store.timeline_version(1) != before